@@ -19,6 +19,7 @@ from chainer import initializers  # NOQA
 from chainer import iterators  # NOQA
 from chainer import link  # NOQA
 from chainer import links  # NOQA
+from chainer import memory_pool  # NOQA
 from chainer import optimizer  # NOQA
 from chainer import optimizers  # NOQA
 from chainer import reporter  # NOQA
@@ -46,6 +47,7 @@ from chainer.initializer import Initializer  # NOQA
 from chainer.link import Chain  # NOQA
 from chainer.link import ChainList  # NOQA
 from chainer.link import Link  # NOQA
+from chainer.memory_pool import cpu_memory_pool  # NOQA
 from chainer.optimizer import GradientMethod  # NOQA
 from chainer.optimizer import Optimizer  # NOQA
 from chainer.optimizer import UpdateRule  # NOQA
@@ -53,6 +55,7 @@ from chainer.reporter import DictSummary  # NOQA
 from chainer.reporter import get_current_reporter  # NOQA
 from chainer.reporter import report  # NOQA
 from chainer.reporter import report_scope  # NOQA
+from chainer.reporter import report_time  # NOQA
 from chainer.reporter import Reporter  # NOQA
 from chainer.reporter import Summary  # NOQA
 from chainer.serializer import AbstractSerializer  # NOQA
@@ -81,13 +84,18 @@ def get_function_hooks():
     return thread_local.function_hooks
 
 
+global_config.cpu_threads = int(os.environ.get('CHAINER_CPU_THREADS', '1'))
 global_config.debug = bool(int(os.environ.get('CHAINER_DEBUG', '0')))
 global_config.cudnn_deterministic = False
 global_config.enable_backprop = True
+global_config.inference = False
 global_config.keep_graph_on_report = bool(int(
     os.environ.get('CHAINER_KEEP_GRAPH_ON_REPORT', '0')))
+global_config.report_time = False
 global_config.train = True
 global_config.type_check = bool(int(os.environ.get('CHAINER_TYPE_CHECK', '1')))
+global_config.use_cpu_memory_pool = bool(int(
+    os.environ.get('CHAINER_USE_CPU_MEMORY_POOL', '0')))
 global_config.use_cudnn = os.environ.get('CHAINER_USE_CUDNN', 'auto')
 global_config.use_cudnn_tensor_core = 'auto'
 
@@ -1,7 +1,12 @@
+import sys
+import threading
+
 import numpy
 import six
 
 from chainer import cuda
+from chainer.dataset import iterator as iterator_module
+from chainer import serializer as serializer_module
 
 
 def to_device(device, x):
@@ -139,3 +144,407 @@ def _concat_arrays_with_padding(arrays, padding):
             result[(i,) + slices] = src
 
     return result
+
+
+class ConcatWithBufferPool(object):
+
+    """Converter that concatenates examples into reusable buffers.
+
+    This converter behaves like :func:`~chainer.dataset.concat_examples`, but
+    instead of allocating new arrays for every batch, it copies the examples
+    directly into host buffers kept in a small pool. The pool holds
+    ``n_buffers`` buffers for each array of the batch layout (i.e., for each
+    element of tuple examples or each key of dict examples), which are used
+    in the round-robin order. A buffer is reallocated only when the data type
+    changes or the batch does not fit into it, e.g. when the padded shape
+    grows, so long-running training with fixed or bounded shapes does not
+    allocate any batch arrays after the first ``n_buffers`` iterations.
+
+    .. warning::
+       Arrays returned to the host memory are views of the pooled buffers.
+       They are overwritten by the ``n_buffers``-th subsequent call, so they
+       must not be kept across iterations. Use ``n_buffers`` of at least two
+       when the converter is wrapped by
+       :class:`~chainer.dataset.PrefetchConverter`, because the next batch is
+       converted while the current one is still in use.
+
+    The converter can be called from multiple threads; each call takes the
+    next buffers of the round-robin order atomically. However, the batches
+    in use and those being converted share ``n_buffers`` buffers, so no more
+    than ``n_buffers`` of them may exist at the same time, e.g. a pool shared
+    by ``k`` threads each of which keeps one batch requires ``n_buffers`` of
+    at least ``k``. Use a separate pool for each consumer otherwise.
+
+    Examples consisting of CuPy arrays are concatenated on the device by
+    :func:`~chainer.dataset.concat_examples` without using the pool.
+
+    Args:
+        n_buffers (int): Number of buffers kept for each array.
+
+    """
+
+    def __init__(self, n_buffers=2):
+        if n_buffers < 1:
+            raise ValueError('n_buffers must be positive')
+        self.n_buffers = n_buffers
+        self._buffers = {}
+        self._index = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __call__(self, batch, device=None, padding=None):
+        """Concatenates a list of examples into pooled array(s).
+
+        The arguments and the return value are same as those of
+        :func:`~chainer.dataset.concat_examples`.
+
+        """
+        if len(batch) == 0:
+            raise ValueError('batch is empty')
+
+        with self._lock:
+            index = self._index
+            self._index = (index + 1) % self.n_buffers
+
+        first_elem = batch[0]
+
+        if isinstance(first_elem, tuple):
+            result = []
+            if not isinstance(padding, tuple):
+                padding = [padding] * len(first_elem)
+
+            for i in six.moves.range(len(first_elem)):
+                result.append(to_device(device, self._concat_arrays(
+                    i, index, [example[i] for example in batch],
+                    padding[i])))
+
+            return tuple(result)
+
+        elif isinstance(first_elem, dict):
+            result = {}
+            if not isinstance(padding, dict):
+                padding = {key: padding for key in first_elem}
+
+            for key in first_elem:
+                result[key] = to_device(device, self._concat_arrays(
+                    key, index, [example[key] for example in batch],
+                    padding[key]))
+
+            return result
+
+        else:
+            return to_device(
+                device, self._concat_arrays(None, index, batch, padding))
+
+    def _concat_arrays(self, slot, index, arrays, padding):
+        if isinstance(arrays[0], numpy.generic):
+            # e.g. labels given as NumPy scalars
+            shape = ()
+        elif not isinstance(arrays[0], numpy.ndarray):
+            return _concat_arrays(arrays, padding)
+        else:
+            shape = self._get_shape(arrays, padding)
+        shape = (len(arrays),) + shape
+
+        dtype = arrays[0].dtype
+        size = 1
+        for dim in shape:
+            size *= dim
+        buffers = self._buffers.get(slot)
+        if buffers is None:
+            buffers = [None] * self.n_buffers
+            self._buffers[slot] = buffers
+        buf = buffers[index]
+        if buf is None or buf.dtype != dtype or buf.size < size:
+            buf = numpy.empty(size, dtype=dtype)
+            buffers[index] = buf
+        result = buf[:size].reshape(shape)
+
+        if padding is None or len(shape) == 1:
+            for i in six.moves.range(len(arrays)):
+                result[i] = arrays[i]
+        else:
+            result.fill(padding)
+            for i in six.moves.range(len(arrays)):
+                src = arrays[i]
+                slices = tuple(slice(dim) for dim in src.shape)
+                result[(i,) + slices] = src
+
+        return result
+
+    @staticmethod
+    def _get_shape(arrays, padding):
+        shape = arrays[0].shape
+        if padding is not None:
+            envelope = numpy.array(shape, dtype=int)
+            for array in arrays[1:]:
+                if numpy.any(envelope != array.shape):
+                    numpy.maximum(envelope, array.shape, envelope)
+            return tuple(envelope.tolist())
+        for array in arrays[1:]:
+            if array.shape != shape:
+                raise ValueError(
+                    'all the input array dimensions must match exactly '
+                    'unless padding is given')
+        return shape
+
+
+class PrefetchConverter(object):
+
+    """Converter that prepares the next batch in a background thread.
+
+    This converter wraps another converter (e.g.
+    :func:`~chainer.dataset.concat_examples`) so that the conversion of the
+    next batch overlaps with the computation on the current one. Since a
+    converter only sees the batch it is called with, the iterator that feeds
+    the converter has to be wrapped by :meth:`prefetch`. The wrapped iterator
+    fetches and converts the batch ``k + 1`` in a background thread while the
+    batch ``k`` is in use, and the converter returns the prepared arrays when
+    it is called with the prefetched batch.
+
+    .. admonition:: Example
+
+       The converter and the wrapped iterator are passed to the updater
+       together::
+
+          converter = chainer.dataset.PrefetchConverter()
+          iterator = converter.prefetch(
+              chainer.iterators.SerialIterator(dataset, 32))
+          updater = chainer.training.StandardUpdater(
+              iterator, optimizer, converter=converter)
+
+    Any other batch (e.g. a batch given by a plain iterator in
+    :class:`~chainer.training.extensions.Evaluator`) is converted
+    synchronously by the wrapped converter, so this converter can be used
+    wherever the wrapped one is used.
+
+    When the destination is a GPU, the converted host arrays are staged in
+    page-locked (pinned) buffers, which are reused across iterations, and are
+    transferred on a separate CUDA stream so that the transfer does not wait
+    for the kernels running on the default stream.
+
+    .. note::
+       The device to which the batches are sent is learned from the first call
+       of the converter; the first batch is converted synchronously.
+
+    Args:
+        converter: Converter function to wrap. It is called as
+            ``converter(batch, device)``.
+
+    Attributes:
+        converter: The wrapped converter function.
+
+    """
+
+    def __init__(self, converter=concat_examples):
+        self.converter = converter
+        self._has_device = False
+        self._device = None
+        self._stream = None
+        self._pinned_buffers = {}
+        self._prefetched = None
+
+    def __call__(self, batch, device=None):
+        prefetched = self._prefetched
+        self._prefetched = None
+        if not self._has_device:
+            self._device = device
+            self._has_device = True
+        if prefetched is not None and prefetched[0] is batch and \
+                prefetched[1] == device:
+            return prefetched[2]
+        return self.converter(batch, device)
+
+    def prefetch(self, iterator):
+        """Wraps an iterator so that its batches are converted in advance.
+
+        Args:
+            iterator (~chainer.dataset.Iterator): Dataset iterator to wrap.
+
+        Returns:
+            ~chainer.dataset.Iterator: Iterator that yields the same batches as
+            ``iterator``. It fetches and converts the next batch in a
+            background thread.
+
+        """
+        return _PrefetchIterator(iterator, self)
+
+    def _convert(self, batch):
+        # Called by the background thread of the prefetching iterator.
+        if not self._has_device:
+            return None
+        device = self._device
+        if device is None or device < 0 or not cuda.available:
+            return batch, device, self.converter(batch, device)
+        arrays = self.converter(batch, None)
+        if self._stream is None:
+            with cuda.get_device_from_id(device):
+                self._stream = cuda.cupy.cuda.Stream(non_blocking=True)
+        with cuda.get_device_from_id(device):
+            arrays = self._transfer(arrays, device)
+            self._stream.synchronize()
+        return batch, device, arrays
+
+    def _transfer(self, arrays, device):
+        if isinstance(arrays, tuple):
+            return tuple([self._transfer_array(i, x, device)
+                          for i, x in enumerate(arrays)])
+        elif isinstance(arrays, dict):
+            return {key: self._transfer_array(key, x, device)
+                    for key, x in six.iteritems(arrays)}
+        else:
+            return self._transfer_array(None, arrays, device)
+
+    def _transfer_array(self, slot, x, device):
+        if not isinstance(x, numpy.ndarray):
+            return to_device(device, x)
+        mem = self._pinned_buffers.get(slot)
+        if mem is None or mem.size() < x.nbytes:
+            mem = cuda.cupy.cuda.alloc_pinned_memory(x.nbytes)
+            self._pinned_buffers[slot] = mem
+        src = numpy.frombuffer(mem, x.dtype, x.size).reshape(x.shape)
+        src[...] = x
+        y = cuda.cupy.empty(x.shape, x.dtype)
+        y.set(src, self._stream)
+        return y
+
+
+class _StateRecorder(serializer_module.Serializer):
+
+    """Serializer that records a copy of the serialized values in memory."""
+
+    def __init__(self, entries=None, path=()):
+        self.entries = [] if entries is None else entries
+        self.path = path
+
+    def __getitem__(self, key):
+        return _StateRecorder(self.entries, self.path + (key,))
+
+    def __call__(self, key, value):
+        if isinstance(value, (numpy.ndarray, cuda.ndarray)):
+            self.entries.append((self.path, key, value.copy()))
+        else:
+            self.entries.append((self.path, key, value))
+        return value
+
+    def replay(self, serializer):
+        for path, key, value in self.entries:
+            s = serializer
+            for name in path:
+                s = s[name]
+            s(key, value)
+
+
+class _PrefetchIterator(iterator_module.Iterator):
+
+    """Iterator that fetches and converts the next batch in a thread.
+
+    The epoch counters of the wrapped iterator advance by one batch ahead, so
+    the values corresponding to the last returned batch are kept separately.
+    The state of the wrapped iterator is recorded before each prefetch, which
+    makes the serialized state identical to that of the wrapped iterator
+    without prefetching.
+
+    """
+
+    def __init__(self, iterator, converter):
+        self._iterator = iterator
+        self._converter = converter
+        self._thread = None
+        self._result = None
+        self._state = None
+        self._copy_epoch(iterator)
+
+    def __getattr__(self, name):
+        # delegates e.g. ``dataset`` and ``batch_size``
+        if name.startswith('__') or name == '_iterator':
+            raise AttributeError(name)
+        return getattr(self._iterator, name)
+
+    def __next__(self):
+        if self._thread is None and self._result is None:
+            batch = self._iterator.next()
+            self._copy_epoch(self._iterator)
+        else:
+            self._join()
+            result, self._result = self._result, None
+            if result[0] is not None:
+                six.reraise(*result[0])
+            batch, epoch, converted = result[1:]
+            self._copy_epoch(epoch)
+            self._converter._prefetched = converted
+
+        self._thread = threading.Thread(target=self._prefetch)
+        self._thread.daemon = True
+        self._thread.start()
+        return batch
+
+    next = __next__
+
+    def _prefetch(self):
+        try:
+            state = _StateRecorder()
+            self._iterator.serialize(state)
+            self._state = state
+            batch = self._iterator.next()
+            epoch = _EpochState(self._iterator)
+            converted = self._converter._convert(batch)
+            self._result = None, batch, epoch, converted
+        except Exception:
+            self._result = sys.exc_info(), None, None, None
+
+    def _join(self):
+        # Waits for the prefetch; its result is kept for the next call.
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _discard(self):
+        self._join()
+        self._result = None
+        self._state = None
+        self._converter._prefetched = None
+
+    def _copy_epoch(self, src):
+        self.epoch = src.epoch
+        self.epoch_detail = src.epoch_detail
+        self.previous_epoch_detail = src.previous_epoch_detail
+        self.is_new_epoch = src.is_new_epoch
+
+    def reset(self):
+        self._discard()
+        self._iterator.reset()
+        self._copy_epoch(self._iterator)
+
+    def finalize(self):
+        self._discard()
+        self._iterator.finalize()
+
+    def serialize(self, serializer):
+        if isinstance(serializer, serializer_module.Serializer):
+            self._join()
+            if self._state is not None:
+                self._state.replay(serializer)
+            else:
+                self._iterator.serialize(serializer)
+        else:
+            self._discard()
+            self._iterator.serialize(serializer)
+            self._copy_epoch(self._iterator)
+
+
+class _EpochState(object):
+
+    def __init__(self, iterator):
+        self.epoch = iterator.epoch
+        self.epoch_detail = iterator.epoch_detail
+        self.previous_epoch_detail = iterator.previous_epoch_detail
+        self.is_new_epoch = iterator.is_new_epoch
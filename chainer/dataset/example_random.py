@@ -0,0 +1,112 @@
+import contextlib
+import threading
+
+import numpy
+
+
+_local = threading.local()
+
+# Philox is a counter-based generator whose state is cheap to create for each
+# example. It is not available in NumPy < 1.17.
+_Philox = getattr(numpy.random, 'Philox', None)
+
+
+def generate_seed():
+    """Draws a seed of the example random states from :mod:`numpy.random`.
+
+    Returns:
+        int: A 32-bit unsigned integer seed.
+
+    """
+    # To support 32-bit platform and numpy < 1.11, the seed is taken in a
+    # verbose manner.
+    return int(numpy.random.randint(
+        -(1 << 31), 1 << 31, 1).astype(numpy.uint32)[0])
+
+
+def make_random_state(seed, epoch, index):
+    """Makes the random state of an example.
+
+    The random state is determined only by its arguments, and the states of
+    different examples or epochs give independent streams of random numbers.
+
+    Args:
+        seed (int): 32-bit unsigned integer seed.
+        epoch (int): Epoch in which the example is loaded.
+        index (int): Index of the example in the dataset.
+
+    Returns:
+        numpy.random.RandomState: A random state that uses the Philox
+        generator keyed by the arguments, or the Mersenne Twister seeded by
+        them if Philox is not available.
+
+    """
+    seed = int(seed) & 0xffffffff
+    epoch = int(epoch) & 0xffffffff
+    index = int(index) & 0xffffffff
+    if _Philox is not None:
+        return numpy.random.RandomState(
+            _Philox(key=(seed << 64) | (epoch << 32) | index))
+    return numpy.random.RandomState([seed, epoch, index])
+
+
+@contextlib.contextmanager
+def example_random_scope(seed, epoch, index):
+    """Makes the random state of an example available while it is loaded.
+
+    Inside of this context, :func:`get_example_random_state` returns the
+    random state of the example given by :func:`make_random_state`. The random
+    state is created when it is requested for the first time. Parallel
+    iterators such as :class:`~chainer.iterators.MultiprocessIterator` load
+    each example in this context.
+
+    Args:
+        seed (int): 32-bit unsigned integer seed.
+        epoch (int): Epoch in which the example is loaded.
+        index (int): Index of the example in the dataset.
+
+    """
+    old = getattr(_local, 'example', None)
+    _local.example = [(seed, epoch, index), None]
+    try:
+        yield
+    finally:
+        _local.example = old
+
+
+def get_example_random_state():
+    """Returns the random state of the example being loaded.
+
+    Datasets and transform functions (e.g. of
+    :class:`~chainer.datasets.TransformDataset`) should use this random state
+    for data augmentation. When an example is loaded by
+    :class:`~chainer.iterators.MultiprocessIterator` or
+    :class:`~chainer.iterators.MultithreadIterator`, the random state is
+    determined by the seed of the iterator, the epoch and the index of the
+    example, so the augmentation does not depend on the number of workers nor
+    on which worker loads the example, and it is reproduced after the iterator
+    is resumed from a snapshot.
+
+    Outside of :func:`example_random_scope`, it returns the global random
+    state of :mod:`numpy.random`.
+
+    .. admonition:: Example
+
+       >>> def transform(in_data):
+       ...     img, label = in_data
+       ...     random_state = chainer.dataset.get_example_random_state()
+       ...     if random_state.randint(2):
+       ...         img = img[:, :, ::-1]
+       ...     return img, label
+
+    Returns:
+        numpy.random.RandomState or module: The random state of the current
+        example, or :mod:`numpy.random`.
+
+    """
+    example = getattr(_local, 'example', None)
+    if example is None:
+        return numpy.random
+    if example[1] is None:
+        example[1] = make_random_state(*example[0])
+    return example[1]
@@ -1,6 +1,9 @@
 from chainer.datasets import cifar  # NOQA
+from chainer.datasets import corpus  # NOQA
 from chainer.datasets import dict_dataset  # NOQA
 from chainer.datasets import image_dataset  # NOQA
+from chainer.datasets import image_shard_dataset  # NOQA
+from chainer.datasets import memmap_dataset  # NOQA
 from chainer.datasets import mnist  # NOQA
 from chainer.datasets import ptb  # NOQA
 from chainer.datasets import sub_dataset  # NOQA
@@ -13,9 +16,17 @@ from chainer.datasets import tuple_dataset  # NOQA
 from chainer.datasets.cifar import get_cifar10  # NOQA
 from chainer.datasets.cifar import get_cifar100  # NOQA
 from chainer.datasets.concatenated_dataset import ConcatenatedDataset  # NOQA
+from chainer.datasets.corpus import build_vocabulary  # NOQA
+from chainer.datasets.corpus import convert_corpus  # NOQA
+from chainer.datasets.corpus import CorpusDataset  # NOQA
 from chainer.datasets.dict_dataset import DictDataset  # NOQA
 from chainer.datasets.image_dataset import ImageDataset  # NOQA
 from chainer.datasets.image_dataset import LabeledImageDataset  # NOQA
+from chainer.datasets.image_shard_dataset import create_image_shards  # NOQA
+from chainer.datasets.image_shard_dataset import ImageShardDataset  # NOQA
+from chainer.datasets.image_shard_dataset import ImageShardWriter  # NOQA
+from chainer.datasets.memmap_dataset import NpyDataset  # NOQA
+from chainer.datasets.memmap_dataset import NpzDataset  # NOQA
 from chainer.datasets.mnist import get_mnist  # NOQA
 from chainer.datasets.ptb import get_ptb_words  # NOQA
 from chainer.datasets.ptb import get_ptb_words_vocabulary  # NOQA
@@ -0,0 +1,197 @@
+import collections
+import io
+import os
+
+import numpy
+import six
+
+from chainer.dataset import dataset_mixin
+
+
+_token_dtype = numpy.dtype('<i4')
+_offset_dtype = numpy.dtype('<i8')
+
+
+def _open_paths(paths):
+    if isinstance(paths, six.string_types):
+        paths = [paths]
+    return paths
+
+
+def build_vocabulary(paths, min_count=1, max_size=None, special_tokens=(),
+                     encoding='utf-8'):
+    """Builds a word vocabulary from text files in a single pass.
+
+    Each line of the text files is split by white spaces, and the occurrences
+    of each word are counted. Words are sorted in the descending order of
+    their frequencies (ties are broken by the lexicographical order) and
+    numbered from zero after the special tokens.
+
+    Args:
+        paths (str or list of strs): Path(s) to the text files.
+        min_count (int): Words that appear less than this number of times are
+            omitted from the vocabulary.
+        max_size (int): Maximum number of words in the vocabulary including
+            the special tokens. If it is ``None``, the size is not limited.
+        special_tokens (list of strs): Words that take the first IDs
+            regardless of their frequencies, e.g. ``['<UNK>', '<EOS>']``.
+        encoding (str): Encoding of the text files.
+
+    Returns:
+        dict: Dictionary that maps words to their IDs.
+
+    """
+    counts = collections.Counter()
+    for path in _open_paths(paths):
+        with io.open(path, encoding=encoding) as f:
+            for line in f:
+                counts.update(line.split())
+
+    vocab = {}
+    for token in special_tokens:
+        vocab.setdefault(token, len(vocab))
+    words = sorted(six.iteritems(counts), key=lambda x: (-x[1], x[0]))
+    for word, count in words:
+        if count < min_count or \
+                (max_size is not None and len(vocab) >= max_size):
+            break
+        vocab.setdefault(word, len(vocab))
+    return vocab
+
+
+def convert_corpus(paths, vocabulary, prefix, unknown=None, eos=None,
+                   encoding='utf-8', chunk_size=1 << 20):
+    """Converts text files to a memory-mappable corpus of word IDs.
+
+    This function streams over the text files and converts each line into a
+    sentence of word IDs. The word IDs of all sentences are written to a flat
+    ``int32`` file named ``prefix + '.tokens'``, and the positions at which
+    sentences start are written to an ``int64`` file named
+    ``prefix + '.offsets'``. The ``i``-th sentence is ``tokens[offsets[i]:
+    offsets[i + 1]]``. Only a chunk of word IDs is kept in memory, so corpora
+    larger than the host memory can be converted.
+
+    The converted corpus can be read by :class:`CorpusDataset`.
+
+    Args:
+        paths (str or list of strs): Path(s) to the text files. Each line is a
+            sentence of words separated by white spaces. Lines of the files
+            are concatenated in the given order.
+        vocabulary (dict): Dictionary that maps words to their IDs, e.g. one
+            built by :func:`build_vocabulary`.
+        prefix (str): Path prefix of the output files.
+        unknown (str): Word used for the words not in the vocabulary. If it
+            is ``None``, unknown words raise :class:`KeyError`.
+        eos (str): Word appended to the end of each sentence. If it is
+            ``None``, nothing is appended.
+        encoding (str): Encoding of the text files.
+        chunk_size (int): Number of word IDs buffered before being written.
+
+    Returns:
+        CorpusDataset: Dataset of the converted corpus.
+
+    """
+    unknown_id = None if unknown is None else vocabulary[unknown]
+    eos_ids = [] if eos is None else [vocabulary[eos]]
+    if unknown_id is None:
+        lookup = vocabulary.__getitem__
+    else:
+        def lookup(word):
+            return vocabulary.get(word, unknown_id)
+
+    n_tokens = 0
+    offsets = [0]
+    ids = []
+    with open(prefix + '.tokens', 'wb') as tokens_file, \
+            open(prefix + '.offsets', 'wb') as offsets_file:
+        for path in _open_paths(paths):
+            with io.open(path, encoding=encoding) as f:
+                for line in f:
+                    sentence = [lookup(word) for word in line.split()]
+                    ids += sentence
+                    ids += eos_ids
+                    n_tokens += len(sentence) + len(eos_ids)
+                    offsets.append(n_tokens)
+                    if len(ids) >= chunk_size:
+                        numpy.asarray(ids, _token_dtype).tofile(tokens_file)
+                        numpy.asarray(offsets, _offset_dtype).tofile(
+                            offsets_file)
+                        ids = []
+                        offsets = []
+        numpy.asarray(ids, _token_dtype).tofile(tokens_file)
+        numpy.asarray(offsets, _offset_dtype).tofile(offsets_file)
+
+    return CorpusDataset(prefix)
+
+
+class CorpusDataset(dataset_mixin.DatasetMixin):
+
+    """Dataset of sentences stored in a memory-mapped corpus.
+
+    This dataset reads a corpus written by :func:`convert_corpus`. The word
+    IDs are memory-mapped, and each example is a view of the ``int32`` array
+    of the word IDs of a sentence, so no Python objects are created per word
+    and the pages of the corpus are loaded on demand and shared among
+    processes.
+
+    The memory maps are not pickled; they are reopened when the dataset is
+    unpickled, e.g. in the worker processes of
+    :class:`~chainer.iterators.MultiprocessIterator`.
+
+    Args:
+        prefix (str): Path prefix of the corpus files given to
+            :func:`convert_corpus`.
+
+    """
+
+    def __init__(self, prefix):
+        self._prefix = prefix
+        self._open()
+
+    def _open(self):
+        prefix = self._prefix
+        self._tokens = _memmap(prefix + '.tokens', _token_dtype)
+        self._offsets = _memmap(prefix + '.offsets', _offset_dtype)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_tokens']
+        del state['_offsets']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    @property
+    def tokens(self):
+        """Read-only array of the word IDs of all sentences concatenated."""
+        return self._tokens
+
+    @property
+    def offsets(self):
+        """Read-only array of the start positions of the sentences.
+
+        Its length is the number of sentences plus one, and the last element
+        is the total number of words.
+
+        """
+        return self._offsets
+
+    def get_example(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('index out of range')
+        return numpy.asarray(
+            self._tokens[self._offsets[i]:self._offsets[i + 1]])
+
+
+def _memmap(path, dtype):
+    # numpy.memmap cannot map an empty file
+    if os.path.getsize(path) == 0:
+        return numpy.empty(0, dtype=dtype)
+    return numpy.memmap(path, dtype=dtype, mode='r')
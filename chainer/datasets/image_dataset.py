@@ -126,16 +126,7 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
                  label_dtype=numpy.int32):
         _check_pillow_availability()
         if isinstance(pairs, six.string_types):
-            pairs_path = pairs
-            with open(pairs_path) as pairs_file:
-                pairs = []
-                for i, line in enumerate(pairs_file):
-                    pair = line.strip().split()
-                    if len(pair) != 2:
-                        raise ValueError(
-                            'invalid format at line {} in file {}'.format(
-                                i, pairs_path))
-                    pairs.append((pair[0], int(pair[1])))
+            pairs = _read_pairs(pairs)
         self._pairs = pairs
         self._root = root
         self._dtype = dtype
@@ -156,6 +147,19 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
         return image.transpose(2, 0, 1), label
 
 
+def _read_pairs(pairs_path):
+    with open(pairs_path) as pairs_file:
+        pairs = []
+        for i, line in enumerate(pairs_file):
+            pair = line.strip().split()
+            if len(pair) != 2:
+                raise ValueError(
+                    'invalid format at line {} in file {}'.format(
+                        i, pairs_path))
+            pairs.append((pair[0], int(pair[1])))
+    return pairs
+
+
 def _check_pillow_availability():
     if not available:
         raise ImportError('PIL cannot be loaded. Install Pillow!\n'
@@ -0,0 +1,312 @@
+import io
+import os
+import struct
+import threading
+
+import numpy
+import six
+
+from chainer.dataset import dataset_mixin
+from chainer.dataset import example_random
+from chainer.datasets import image_dataset
+
+
+# A shard file consists of the magic, the encoded images, the index of the
+# records and the footer.
+_MAGIC = b'CHIMGSH1'
+_FOOTER = struct.Struct('<QQ8s')
+_INDEX_DTYPE = numpy.dtype(
+    [('offset', '<u8'), ('size', '<u8'), ('label', '<i8')])
+
+
+class ImageShardWriter(object):
+
+    """Writer of a shard file of encoded images.
+
+    A shard file packs many images encoded in formats such as JPEG and PNG
+    into one file, followed by an index of the offsets, the sizes and the
+    labels of the images. The images are stored as they are given without
+    being decoded nor re-encoded. Shard files are read by
+    :class:`ImageShardDataset`.
+
+    The index is written when the writer is closed. The writer can be used
+    as a context manager, which closes it on exit.
+
+    .. admonition:: Example
+
+       Given ``pairs``, a list of the paths to image files and their labels,
+       the images are packed into a shard as follows::
+
+          with ImageShardWriter('train-00000.shard') as writer:
+              for path, label in pairs:
+                  with open(path, 'rb') as f:
+                      writer.write(f.read(), label)
+
+    Args:
+        path (str): Path to the shard file to write.
+
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'wb')
+        self._file.write(_MAGIC)
+        self._offset = len(_MAGIC)
+        self._records = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._records)
+
+    def write(self, data, label=0):
+        """Appends an encoded image to the shard.
+
+        Args:
+            data (bytes): Encoded image, e.g. the content of a JPEG file.
+            label (int): Label of the image.
+
+        """
+        if self._file is None:
+            raise RuntimeError('the writer is already closed')
+        self._file.write(data)
+        self._records.append((self._offset, len(data), int(label)))
+        self._offset += len(data)
+
+    def close(self):
+        """Writes the index and closes the file."""
+        if self._file is None:
+            return
+        index = numpy.array(self._records, dtype=_INDEX_DTYPE)
+        self._file.write(index.tobytes())
+        self._file.write(_FOOTER.pack(len(index), self._offset, _MAGIC))
+        self._file.close()
+        self._file = None
+
+
+def create_image_shards(pairs, prefix, root='.', shard_size=1024):
+    """Packs labeled image files into shard files.
+
+    The images are read as they are from the files without being decoded,
+    and written to shard files by :class:`ImageShardWriter`. The ``i``-th
+    shard is named ``'{prefix}-{i:05d}.shard'``.
+
+    Args:
+        pairs (str or list of tuples): Paths to images and their labels in
+            the same form as the argument of
+            :class:`~chainer.datasets.LabeledImageDataset`.
+        prefix (str): Prefix of the paths to the shard files.
+        root (str): Root directory to retrieve images from.
+        shard_size (int): Number of images in each shard.
+
+    Returns:
+        list of strs: Paths to the shard files.
+
+    """
+    if isinstance(pairs, six.string_types):
+        pairs = image_dataset._read_pairs(pairs)
+
+    paths = []
+    for start in six.moves.range(0, len(pairs), shard_size):
+        path = '{}-{:05d}.shard'.format(prefix, len(paths))
+        with ImageShardWriter(path) as writer:
+            for image_path, label in pairs[start:start + shard_size]:
+                with open(os.path.join(root, image_path), 'rb') as f:
+                    writer.write(f.read(), label)
+        paths.append(path)
+    return paths
+
+
+def _read_index(f, path):
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    if file_size < len(_MAGIC) + _FOOTER.size:
+        raise ValueError('{} is not a valid shard file'.format(path))
+    f.seek(file_size - _FOOTER.size)
+    n, index_offset, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+    if magic != _MAGIC:
+        raise ValueError('{} is not a valid shard file'.format(path))
+    f.seek(index_offset)
+    data = f.read(n * _INDEX_DTYPE.itemsize)
+    return numpy.frombuffer(data, dtype=_INDEX_DTYPE)
+
+
+def _pair(x):
+    if hasattr(x, '__getitem__'):
+        return x
+    return x, x
+
+
+class ImageShardDataset(dataset_mixin.DatasetMixin):
+
+    """Dataset of labeled images packed in shard files.
+
+    This dataset reads images written by :class:`ImageShardWriter` or
+    :func:`create_image_shards`. Unlike :class:`LabeledImageDataset`, which
+    opens a file for each example, it keeps the shard files open and reads
+    each encoded image by one positioned read at the offset given by the
+    index, so that the overhead of looking up and opening many small files
+    is avoided. The positioned reads do not share a file position, so the
+    dataset can be used from multiple threads and forked processes.
+
+    Each image is decoded to an ``uint8`` array, and the preprocessing is
+    applied in the following order to avoid converting pixels that are
+    thrown away:
+
+    1. Cropping a region of ``crop_size`` (the center one, or a random one
+       with a random horizontal flip if ``random`` is ``True``).
+    2. Converting the cropped region to ``dtype`` of the shape
+       ``channels, height, width``.
+    3. Subtracting ``mean`` and multiplying by ``scale``.
+
+    The random crops and flips use the random state given by
+    :func:`chainer.dataset.get_example_random_state`.
+
+    If ``min_size`` is given, JPEG images are decoded at a reduced scale
+    (1/2, 1/4 or 1/8) as long as they are not smaller than ``min_size``,
+    which saves most of the decoding time of large images. Note that the
+    image is not resized further, so the size of the decoded image may vary.
+
+    .. note::
+       **This dataset requires the Pillow package being installed.**
+
+    Args:
+        paths (str or list of strs): Paths to the shard files. The examples
+            of the shards are concatenated in the given order.
+        crop_size (int or pair of ints): Height and width of the cropped
+            region. If it is ``None``, the images are not cropped.
+        random (bool): If ``True``, a random region is cropped and flipped
+            horizontally at random. Otherwise, the center is cropped.
+        mean (numpy.ndarray): Array to subtract from the converted images.
+            It should be broadcastable to the cropped images, or be a mean
+            image of the same size as the decoded images, in which case the
+            same region as the image is cropped from it.
+        scale (float): Factor multiplied to the images after subtracting
+            ``mean``.
+        min_size (int or pair of ints): Lower bound of the height and width
+            of reduced-size decoding.
+        dtype: Data type of resulting image arrays.
+        label_dtype: Data type of the labels.
+
+    """
+
+    def __init__(self, paths, crop_size=None, random=False, mean=None,
+                 scale=None, min_size=None, dtype=numpy.float32,
+                 label_dtype=numpy.int32):
+        image_dataset._check_pillow_availability()
+        if isinstance(paths, six.string_types):
+            paths = paths,
+        self._paths = list(paths)
+        self._crop_size = None if crop_size is None else _pair(crop_size)
+        self._random = random
+        self._mean = mean
+        self._scale = scale
+        self._min_size = None if min_size is None else _pair(min_size)
+        self._dtype = numpy.dtype(dtype)
+        self._label_dtype = label_dtype
+        self._open()
+        self._starts = numpy.cumsum(
+            [0] + [len(index) for index in self._indices])
+
+    def _open(self):
+        self._files = [open(path, 'rb') for path in self._paths]
+        self._indices = [_read_index(f, path)
+                         for f, path in six.moves.zip(self._files,
+                                                      self._paths)]
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_files']
+        del state['_indices']
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        return int(self._starts[-1])
+
+    def read_raw(self, i):
+        """Reads an encoded image and its label without decoding it.
+
+        Args:
+            i (int): Index of the example.
+
+        Returns:
+            tuple: A pair of the encoded image as :class:`bytes` and the label
+            as an integer.
+
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('index {} is out of range'.format(i))
+        shard = int(numpy.searchsorted(self._starts, i, side='right')) - 1
+        offset, size, label = self._indices[shard][i - self._starts[shard]]
+        f = self._files[shard]
+        if hasattr(os, 'pread'):
+            data = os.pread(f.fileno(), int(size), int(offset))
+        else:
+            with self._lock:
+                f.seek(int(offset))
+                data = f.read(int(size))
+        return data, int(label)
+
+    def _decode(self, data):
+        f = image_dataset.Image.open(io.BytesIO(data))
+        try:
+            if self._min_size is not None:
+                min_h, min_w = self._min_size
+                f.draft(f.mode, (min_w, min_h))
+            image = numpy.asarray(f, dtype=numpy.uint8)
+        finally:
+            f.close()
+        if image.ndim == 2:
+            # image is greyscale
+            image = image[:, :, numpy.newaxis]
+        return image
+
+    def get_example(self, i):
+        data, label = self.read_raw(i)
+        image = self._decode(data)
+        h, w = image.shape[:2]
+
+        top, left, flip = 0, 0, False
+        if self._crop_size is not None:
+            crop_h, crop_w = self._crop_size
+            if h < crop_h or w < crop_w:
+                raise ValueError(
+                    'image {} of size {}x{} is smaller than the crop '
+                    'size {}x{}'.format(i, h, w, crop_h, crop_w))
+            if self._random:
+                random_state = example_random.get_example_random_state()
+                top = random_state.randint(0, h - crop_h + 1)
+                left = random_state.randint(0, w - crop_w + 1)
+                flip = bool(random_state.randint(0, 2))
+            else:
+                top = (h - crop_h) // 2
+                left = (w - crop_w) // 2
+            image = image[top:top + crop_h, left:left + crop_w]
+        if flip:
+            image = image[:, ::-1]
+
+        # The conversion copies only the cropped region
+        image = image.transpose(2, 0, 1).astype(self._dtype)
+        if self._mean is not None:
+            mean = self._mean
+            if mean.ndim == 3 and mean.shape[1:] == (h, w) and \
+                    image.shape[1:] != (h, w):
+                mean = mean[:, top:top + image.shape[1],
+                            left:left + image.shape[2]]
+            if flip and mean.ndim == 3:
+                mean = mean[:, :, ::-1]
+            image -= mean
+        if self._scale is not None:
+            image *= self._scale
+        return image, numpy.array(label, dtype=self._label_dtype)
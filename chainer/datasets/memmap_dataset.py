@@ -0,0 +1,186 @@
+import struct
+import zipfile
+
+import numpy
+import six
+
+
+def _load_npy(path):
+    return numpy.load(path, mmap_mode='r')
+
+
+def _load_npz_member(path, key):
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(key + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(
+            'member {} of {} is compressed and cannot be memory-mapped. '
+            'Save the file by numpy.savez instead of '
+            'numpy.savez_compressed.'.format(key, path))
+
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        if local_header[:4] != b'PK\x03\x04':
+            raise ValueError('{} is not a valid NPZ file'.format(path))
+        name_length, extra_length = struct.unpack('<HH', local_header[26:])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = numpy.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = \
+                numpy.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = \
+                numpy.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        raise ValueError(
+            'member {} of {} is an object array and cannot be '
+            'memory-mapped'.format(key, path))
+    order = 'F' if fortran_order else 'C'
+    if numpy.prod(shape, dtype=numpy.int64) == 0:
+        return numpy.empty(shape, dtype=dtype, order=order)
+    return numpy.memmap(path, dtype=dtype, mode='r', offset=offset,
+                        shape=shape, order=order)
+
+
+def _list_npz_keys(path):
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+    return [name[:-4] for name in names if name.endswith('.npy')]
+
+
+def _is_batch_index(index):
+    return isinstance(index, (slice, list, numpy.ndarray))
+
+
+class NpyDataset(object):
+
+    """Dataset of the rows of a memory-mapped NPY file.
+
+    This dataset opens an array saved by :func:`numpy.save` with
+    ``mmap_mode='r'``, and the ``i``-th example is the ``i``-th element of the
+    array along the first axis. Examples are read from the file on demand, so
+    arrays larger than the host memory can be used, and forked processes
+    share the pages of the file instead of copying them.
+
+    Indexing by a slice, a list or an integer array reads all the examples by
+    one fancy-indexing operation on the mapped array, and returns them as a
+    list.
+
+    The memory map is not pickled; the file is reopened when the dataset is
+    unpickled, e.g. in the worker processes of
+    :class:`~chainer.iterators.MultiprocessIterator`.
+
+    Args:
+        path (str): Path to the NPY file.
+
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._open()
+
+    def _open(self):
+        self._array = _load_npy(self._path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_array']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        return len(self._array)
+
+    def __getitem__(self, index):
+        examples = numpy.asarray(self._array[index])
+        if _is_batch_index(index):
+            return list(examples)
+        return examples
+
+    @property
+    def array(self):
+        """Read-only memory-mapped array of all examples."""
+        return self._array
+
+
+class NpzDataset(object):
+
+    """Dataset of tuples of rows of memory-mapped NPZ members.
+
+    This dataset memory-maps arrays stored in an NPZ file and combines them
+    like :class:`~chainer.datasets.TupleDataset`: the ``i``-th example is a
+    tuple of the ``i``-th elements of the arrays. The members must be stored
+    without compression, i.e. the file must be saved by :func:`numpy.savez`
+    instead of :func:`numpy.savez_compressed`.
+
+    Indexing by a slice, a list or an integer array reads the examples from
+    each member by one fancy-indexing operation, and returns them as a list
+    of tuples.
+
+    As :class:`NpyDataset`, the memory maps are reopened on unpickling instead
+    of pickling the data.
+
+    Args:
+        path (str): Path to the NPZ file.
+        keys (list of strs): Names of the members to use in the order of the
+            elements of each tuple. If it is ``None``, all members are used in
+            the order stored in the file. If it is a string, the examples
+            are the elements of the member instead of tuples.
+
+    """
+
+    def __init__(self, path, keys=None):
+        if keys is None:
+            keys = _list_npz_keys(path)
+        if not keys:
+            raise ValueError('no arrays are given')
+        self._path = path
+        self._keys = keys
+        self._open()
+
+    def _open(self):
+        keys = self._keys
+        if isinstance(keys, six.string_types):
+            keys = keys,
+        arrays = [_load_npz_member(self._path, key) for key in keys]
+        length = len(arrays[0])
+        for key, array in six.moves.zip(keys, arrays):
+            if len(array) != length:
+                raise ValueError(
+                    'member {} has a wrong length'.format(key))
+        self._arrays = arrays
+        self._length = length
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_arrays']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        batches = [numpy.asarray(array[index]) for array in self._arrays]
+        if isinstance(self._keys, six.string_types):
+            batch, = batches
+            if _is_batch_index(index):
+                return list(batch)
+            return batch
+        if _is_batch_index(index):
+            return list(six.moves.zip(*batches))
+        return tuple(batches)
+
+    @property
+    def keys(self):
+        """Names of the members used in the examples."""
+        return self._keys
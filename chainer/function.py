@@ -126,6 +126,13 @@ class FunctionAdapter(function_node.FunctionNode):
     def _impl_name(self):
         return self._function.__class__.__name__
 
+    def _get_type_check_attributes(self):
+        function = self.function
+        attributes = dict(function.__dict__)
+        attributes.pop('_node', None)
+        attributes.pop('_owned_node', None)
+        return type(function), attributes
+
     def check_type_forward(self, in_types):
         self._function.check_type_forward(in_types)
 
@@ -14,6 +14,36 @@ from chainer.utils import type_check
 from chainer import variable
 
 
+# Maximum number of valid input signatures cached for each function class.
+_TYPE_CHECK_CACHE_SIZE = 256
+
+_type_check_caches = {}
+
+_HASHABLE_TYPES = (bool, float, type(None), type, numpy.dtype,
+                   numpy.generic) + six.integer_types + six.string_types
+# Exact types are looked up first, which is faster than isinstance.
+_hashable_type_set = frozenset(_HASHABLE_TYPES)
+
+
+def _is_cacheable(attributes):
+    # Tells whether the attributes of a function can be kept in the cache of
+    # the type check. Only scalars, strings and flat tuples of them are kept;
+    # other hashable objects are compared by identity, so keeping them would
+    # only hold the objects alive.
+    if _hashable_type_set.issuperset(map(type, attributes.values())):
+        return True
+    for value in six.itervalues(attributes):
+        value_type = type(value)
+        if value_type in _hashable_type_set:
+            continue
+        if value_type is tuple:
+            if not _hashable_type_set.issuperset(map(type, value)):
+                return False
+        elif not isinstance(value, _HASHABLE_TYPES):
+            return False
+    return True
+
+
 class FunctionNode(object):
 
     """Function node of the computational graph.
@@ -196,9 +226,14 @@ class FunctionNode(object):
                 automatically wrapped with :class:`~chainer.Variable`.
 
         Returns:
-            A tuple of output :class:`~chainer.Variable` objects.
+            A tuple of output :class:`~chainer.Variable` objects. In the
+            inference mode (i.e., ``chainer.config.inference`` is ``True``),
+            a tuple of the output arrays is returned instead.
 
         """
+        if configuration.config.inference:
+            return self._forward_inference(inputs)
+
         input_vars = [chainer.as_variable(x) for x in inputs]
         in_data = tuple([x.data for x in input_vars])
         requires_grad = any([x.requires_grad for x in input_vars])
@@ -263,11 +298,58 @@ class FunctionNode(object):
 
         return ret
 
+    def _forward_inference(self, inputs):
+        # Calls forward on the raw arrays, skipping the construction of the
+        # graph, the function hooks and the selection of the device.
+        in_data = tuple([x.data if isinstance(x, variable.Variable) else x
+                         for x in inputs])
+        if configuration.config.type_check:
+            self._check_data_type_forward(in_data)
+        self._input_indexes_to_retain = None
+        self._output_indexes_to_retain = None
+        outputs = self.forward(in_data)
+        assert type(outputs) is tuple
+        return outputs
+
+    def _get_type_check_attributes(self):
+        # Returns the class and the attributes by which the result of the type
+        # check is cached.
+        return type(self), self.__dict__
+
     def _check_data_type_forward(self, in_data):
+        # The result of the type check only depends on the shapes and dtypes
+        # of the inputs and the attributes of the function, so input
+        # signatures that have been validated are not checked again. The key
+        # is made without inspecting the attributes, which are usually the
+        # arguments given to the constructor and enumerated in the same
+        # order. Once a function has attributes that cannot be kept in the
+        # cache, e.g. arrays, the cache of its class is disabled, so that the
+        # functions of the class do not pay for keys that never hit.
+        cls, attributes = self._get_type_check_attributes()
+        cache = _type_check_caches.get(cls, False)
+        if cache is False:
+            cache = _type_check_caches.setdefault(cls, set())
+        key = None
+        if cache is not None:
+            key = tuple(attributes.items()), tuple([
+                None if x is None else (x.shape, x.dtype) for x in in_data])
+            try:
+                if key in cache:
+                    return
+            except TypeError:
+                _type_check_caches[cls] = key = None
+
         in_type = type_check.get_light_types(in_data)
         try:
             with type_check.light_mode:
                 self.check_type_forward(in_type)
+            if key is not None:
+                if not _is_cacheable(attributes):
+                    _type_check_caches[cls] = None
+                else:
+                    if len(cache) >= _TYPE_CHECK_CACHE_SIZE:
+                        cache.clear()
+                    cache.add(key)
             return
         except type_check.InvalidType:
             # Ignore errors on first run
@@ -603,7 +685,7 @@ class FunctionNode(object):
                 # Variable object.
                 output_var = variable.Variable(data)
                 output_var.creator_node = self
-                new_outputs[index] = weakref.ref(output_var)
+                new_outputs[index] = weakref.ref(output_var.node)
                 outputs_modified = True
             else:
                 output_var = output.get_variable()
@@ -2,6 +2,7 @@ import numpy
 
 from chainer import cuda
 from chainer import function_node
+from chainer.utils import inplace as inplace_module
 from chainer.utils import type_check
 
 
@@ -9,8 +10,11 @@ class ELU(function_node.FunctionNode):
 
     """Exponential Linear Unit."""
 
-    def __init__(self, alpha=1.0):
+    def __init__(self, alpha=1.0, inplace=False):
         self.alpha = float(alpha)
+        # The gradient can be computed from the output only if alpha is
+        # positive, in which case the input is not needed.
+        self.inplace = inplace and self.alpha > 0
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 1)
@@ -19,24 +23,35 @@ class ELU(function_node.FunctionNode):
         type_check.expect(x_type.dtype.kind == 'f')
 
     def forward_cpu(self, x):
-        self.retain_inputs((0,))
-        y = x[0].copy()
+        if self.inplace:
+            self.retain_outputs((0,))
+            y = x[0]
+        else:
+            self.retain_inputs((0,))
+            y = x[0].copy()
         neg_indices = x[0] < 0
         y[neg_indices] = self.alpha * (numpy.exp(y[neg_indices]) - 1)
         return y,
 
     def forward_gpu(self, x):
-        self.retain_inputs((0,))
-        y = cuda.elementwise(
+        kern = cuda.elementwise(
             'T x, T alpha', 'T y',
             'y = x >= 0 ? x : (T)(alpha * (exp(x) - 1))',
-            'elu_fwd')(
-                x[0], self.alpha)
+            'elu_fwd')
+        if self.inplace:
+            self.retain_outputs((0,))
+            y = kern(x[0], self.alpha, x[0])
+        else:
+            self.retain_inputs((0,))
+            y = kern(x[0], self.alpha)
         return y,
 
     def backward(self, indexes, grad_outputs):
-        x, = self.get_retained_inputs()
         gy, = grad_outputs
+        if self.inplace:
+            y, = self.get_retained_outputs()
+            return ELUGradFromOutput(self.alpha).apply((y, gy))
+        x, = self.get_retained_inputs()
         return ELUGrad(self.alpha).apply((x, gy))
 
 
@@ -87,7 +102,53 @@ class ELUGrad(function_node.FunctionNode):
         return ret
 
 
-def elu(x, alpha=1.0):
+class ELUGradFromOutput(function_node.FunctionNode):
+
+    """Exponential Linear Unit gradient function computed from the output.
+
+    For a positive :math:`\\alpha`, the derivative of ELU at a negative input
+    is :math:`\\alpha \\exp(x) = y + \\alpha`.
+
+    """
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+
+    def check_type_forward(self, in_types):
+        type_check.expect(in_types.size() == 2)
+        type_check.expect(in_types[0].dtype.kind == 'f')
+        type_check.expect(in_types[1].dtype.kind == 'f')
+
+    def forward_cpu(self, inputs):
+        self.retain_inputs((0, 1))
+        y, gy = inputs
+        gx = gy.copy()
+        neg_indices = y < 0
+        gx[neg_indices] *= y[neg_indices] + self.alpha
+        return gx,
+
+    def forward_gpu(self, inputs):
+        self.retain_inputs((0, 1))
+        y, gy = inputs
+        gx = cuda.elementwise(
+            'T y, T gy, T alpha', 'T gx',
+            'gx = y >= 0 ? gy : (T)(gy * (y + alpha))',
+            'elu_bwd_from_output')(
+                y, gy, self.alpha)
+        return gx,
+
+    def backward(self, indexes, grad_outputs):
+        y, gy = self.get_retained_inputs()
+        ggx, = grad_outputs
+        ret = []
+        if 0 in indexes:
+            ret.append(ggx * gy * (y.data < 0))
+        if 1 in indexes:
+            ret.append(ELUGradFromOutput(self.alpha).apply((y, ggx))[0])
+        return ret
+
+
+def elu(x, alpha=1.0, inplace=False):
     """Exponential Linear Unit function.
 
     For a parameter :math:`\\alpha`, it is expressed as
@@ -105,6 +166,10 @@ def elu(x, alpha=1.0):
         :class:`cupy.ndarray`):
             Input variable. A :math:`(s_1, s_2, ..., s_N)`-shaped float array.
         alpha (float): Parameter :math:`\\alpha`. Default is 1.0.
+        inplace (bool): If ``True``, the output is written to the data array
+            of ``x`` when no one else uses the array. See
+            :func:`~chainer.functions.relu` for the details.
+            It is ignored if ``alpha`` is not positive.
 
     Returns:
         ~chainer.Variable: Output variable. A
@@ -122,4 +187,5 @@ def elu(x, alpha=1.0):
                [ 2.        , -0.95021296]], dtype=float32)
 
     """
-    return ELU(alpha=alpha).apply((x,))[0]
+    inplace = inplace and inplace_module.can_overwrite(x)
+    return ELU(alpha=alpha, inplace=inplace).apply((x,))[0]
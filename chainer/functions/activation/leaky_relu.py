@@ -1,5 +1,6 @@
 from chainer import cuda
 from chainer import function_node
+from chainer.utils import inplace as inplace_module
 from chainer.utils import type_check
 
 
@@ -19,8 +20,11 @@ class LeakyReLU(function_node.FunctionNode):
 
     """Leaky rectifier unit."""
 
-    def __init__(self, slope=0.2):
+    def __init__(self, slope=0.2, inplace=False):
         self.slope = slope
+        # The output overwrites the input only if the input is not needed
+        # for the backward computation.
+        self.inplace = inplace and slope >= 0
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 1)
@@ -29,7 +33,7 @@ class LeakyReLU(function_node.FunctionNode):
 
     def forward_cpu(self, inputs):
         x, = inputs
-        y = x.copy()
+        y = x if self.inplace else x.copy()
         y[x < 0] *= self.slope
         if self.slope >= 0:
             self.retain_outputs((0,))
@@ -39,7 +43,10 @@ class LeakyReLU(function_node.FunctionNode):
 
     def forward_gpu(self, inputs):
         x, = inputs
-        y = _get_kern()(x, x, self.slope)
+        if self.inplace:
+            y = _get_kern()(x, x, self.slope, x)
+        else:
+            y = _get_kern()(x, x, self.slope)
         if self.slope >= 0:
             self.retain_outputs((0,))
         else:
@@ -84,7 +91,7 @@ class _LeakyReLUGrad(function_node.FunctionNode):
         return _LeakyReLUGrad(self.x, self.y, self.slope).apply(grad_outputs)
 
 
-def leaky_relu(x, slope=0.2):
+def leaky_relu(x, slope=0.2, inplace=False):
     """Leaky Rectified Linear Unit function.
 
     This function is expressed as
@@ -103,6 +110,10 @@ def leaky_relu(x, slope=0.2):
         :class:`cupy.ndarray`):
             Input variable. A :math:`(s_1, s_2, ..., s_N)`-shaped float array.
         slope (float): Slope value :math:`a`.
+        inplace (bool): If ``True``, the output is written to the data array
+            of ``x`` when no one else uses the array. See
+            :func:`~chainer.functions.relu` for the details.
+            It is ignored if ``slope`` is negative.
 
     Returns:
         ~chainer.Variable: Output variable. A
@@ -121,4 +132,5 @@ def leaky_relu(x, slope=0.2):
                [-0.40000001,  1.        ]], dtype=float32)
 
     """
-    return LeakyReLU(slope).apply((x,))[0]
+    inplace = inplace and inplace_module.can_overwrite(x)
+    return LeakyReLU(slope, inplace).apply((x,))[0]
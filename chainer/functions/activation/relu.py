@@ -4,6 +4,7 @@ import chainer
 from chainer import cuda
 from chainer import function_node
 from chainer import utils
+from chainer.utils import inplace as inplace_module
 from chainer.utils import type_check
 from chainer import ia
 
@@ -19,6 +20,9 @@ class ReLU(function_node.FunctionNode):
 
     _use_cudnn = False
 
+    def __init__(self, inplace=False):
+        self.inplace = inplace
+
     def check_type_forward(self, in_types):
         type_check.expect(
             in_types.size() == 1,
@@ -26,6 +30,8 @@ class ReLU(function_node.FunctionNode):
         )
 
     def forward_ia(self, x):
+        if self.inplace:
+            return self.forward_cpu(x)
         self.retain_inputs((0,))
         self.retain_outputs((0,))
         y = ia.relu.Forward(ia.array(x[0]))
@@ -33,10 +39,15 @@ class ReLU(function_node.FunctionNode):
 
     def forward_cpu(self, x):
         self.retain_outputs((0,))
+        if self.inplace:
+            return numpy.maximum(x[0], 0, out=x[0]),
         return utils.force_array(numpy.maximum(x[0], 0, dtype=x[0].dtype)),
 
     def forward_gpu(self, x):
-        if chainer.should_use_cudnn('==always') and x[0].flags.c_contiguous:
+        if self.inplace:
+            y = cuda.cupy.maximum(x[0], 0, out=x[0])
+        elif chainer.should_use_cudnn('==always') and \
+                x[0].flags.c_contiguous:
             # cupy.activation_backward requires the input.
             # So, we retain it for backward computation.
             self.retain_inputs((0,))
@@ -49,8 +60,8 @@ class ReLU(function_node.FunctionNode):
 
     def backward(self, indexes, gy):
         y = self.get_retained_outputs()[0]
-        if (ia.all_ready(gy)) or \
-                (chainer.should_use_cudnn('==always') and self._use_cudnn):
+        if not self.inplace and (ia.all_ready(gy) or (
+                chainer.should_use_cudnn('==always') and self._use_cudnn)):
             x = self.get_retained_inputs()[0]
             return ReLUGrad3(x, y).apply((gy[0],))
         else:
@@ -127,7 +138,7 @@ class ReLUGrad3(function_node.FunctionNode):
         return gy[0] * _heaviside(self.b),
 
 
-def relu(x):
+def relu(x, inplace=False):
     """Rectified Linear Unit function.
 
     .. math:: f(x)=\\max(0, x).
@@ -136,6 +147,12 @@ def relu(x):
         x (:class:`~chainer.Variable` or :class:`numpy.ndarray` or \
         :class:`cupy.ndarray`):
             Input variable. A :math:`(s_1, s_2, ..., s_N)`-shaped float array.
+        inplace (bool): If ``True``, the output is written to the data array
+            of ``x`` when no one else uses the array, i.e., when ``x`` is the
+            output of a function node, its data is not retained for the
+            backward computation of any function and the array is not
+            referenced from elsewhere. Otherwise, a new array is allocated.
+            ``x`` must not be used after calling this function in place.
 
     Returns:
         ~chainer.Variable: Output variable. A
@@ -153,5 +170,5 @@ def relu(x):
         (3, 2)
 
     """
-    y, = ReLU().apply((x,))
+    y, = ReLU(inplace and inplace_module.can_overwrite(x)).apply((x,))
     return y
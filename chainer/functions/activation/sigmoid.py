@@ -4,6 +4,7 @@ import chainer
 from chainer import cuda
 from chainer import function_node
 from chainer import utils
+from chainer.utils import inplace as inplace_module
 from chainer.utils import type_check
 
 if cuda.cudnn_enabled:
@@ -16,6 +17,9 @@ class Sigmoid(function_node.FunctionNode):
 
     """Logistic sigmoid function."""
 
+    def __init__(self, inplace=False):
+        self.inplace = inplace
+
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 1)
         type_check.expect(in_types[0].dtype.kind == 'f')
@@ -23,21 +27,29 @@ class Sigmoid(function_node.FunctionNode):
     def forward_cpu(self, inputs):
         x = inputs[0]
         half = x.dtype.type(0.5)
-        y = utils.force_array(numpy.tanh(x * half) * half + half)
+        if self.inplace:
+            x *= half
+            y = numpy.tanh(x, out=x)
+            y *= half
+            y += half
+        else:
+            y = utils.force_array(numpy.tanh(x * half) * half + half)
         self.retain_outputs((0,))
         self._use_cudnn = False
         return y,
 
     def forward_gpu(self, inputs):
         x = inputs[0]
-        if chainer.should_use_cudnn('==always') and x.flags.c_contiguous:
+        if not self.inplace and chainer.should_use_cudnn('==always') and \
+                x.flags.c_contiguous:
             y = cudnn.activation_forward(x, _mode)
             self.retain_inputs((0,))
             self._use_cudnn = True
         else:
-            y = cuda.elementwise(
+            kern = cuda.elementwise(
                 'T x', 'T y', 'y = tanh(x * 0.5) * 0.5 + 0.5',
-                'sigmoid_fwd')(x)
+                'sigmoid_fwd')
+            y = kern(x, x) if self.inplace else kern(x)
             self._use_cudnn = False
 
         self.retain_outputs((0,))
@@ -91,7 +103,7 @@ class SigmoidGrad(function_node.FunctionNode):
         return g * gy * (1 - 2 * y), g * y * (1 - y)
 
 
-def sigmoid(x):
+def sigmoid(x, inplace=False):
     """Element-wise sigmoid logistic function.
 
      .. math:: f(x)=(1 + \\exp(-x))^{-1}.
@@ -100,6 +112,9 @@ def sigmoid(x):
         x (:class:`~chainer.Variable` or :class:`numpy.ndarray` or \
         :class:`cupy.ndarray`):
             Input variable. A :math:`(s_1, s_2, ..., s_N)`-shaped float array.
+        inplace (bool): If ``True``, the output is written to the data array
+            of ``x`` when no one else uses the array. See
+            :func:`~chainer.functions.relu` for the details.
 
     Returns:
         ~chainer.Variable: Output variable. A
@@ -116,5 +131,5 @@ def sigmoid(x):
         variable([ 0.11920291,  0.5       ,  0.88079709])
 
     """
-    y, = Sigmoid().apply((x,))
+    y, = Sigmoid(inplace and inplace_module.can_overwrite(x)).apply((x,))
     return y
@@ -60,23 +60,16 @@ class SpatialTransformerSampler(function.Function):
             y_desc.value, y.data.ptr)
         return y,
 
-    def _forward(self, inputs):
-        x, grid = inputs
+    def _sample_points(self, x, grid):
         xp = cuda.get_array_module(x)
         B, C, H, W = x.shape
-        _, _, out_H, out_W = grid.shape
-
         grid = grid.reshape(grid.shape[:2] + (-1,))
 
         u = grid[:, 0]
         v = grid[:, 1]
 
-        # Pad the image so that pixels locating outside of the original
-        # image's size can be sampled.
-        x_pad = xp.pad(x, ((0, 0), (0, 0), (1, 1), (1, 1)), mode='constant')
-
         # Rescale coordinates from [-1, 1] to [0, width or height - 1],
-        # and adjust them to the padded image.
+        # and adjust them to the image padded by one pixel.
         u = (u + 1) * (W - 1) / 2 + 1
         v = (v + 1) * (H - 1) / 2 + 1
 
@@ -91,24 +84,45 @@ class SpatialTransformerSampler(function.Function):
         v0 = v0.clip(0, H)
         v1 = v0 + 1
 
+        # Flat indices of the four corners in the padded image of shape
+        # (B, H + 2, W + 2), ordered as (v0, u0), (v0, u1), (v1, u0) and
+        # (v1, u1).
+        batch = xp.arange(B, dtype=numpy.int32)[:, None] * (H + 2)
+        i00 = (batch + v0) * (W + 2) + u0
+        i10 = (batch + v1) * (W + 2) + u0
+        indices = (i00, i00 + 1, i10, i10 + 1)
+        return u, v, u_clipped, v_clipped, u0, u1, v0, v1, indices
+
+    def _gather(self, x, indices):
+        # Gathers pixels of all channels at once from the padded image laid
+        # out as (B * (H + 2) * (W + 2), C). Each result is of shape (B, P, C)
+        # where P is the number of sampling points per image.
+        xp = cuda.get_array_module(x)
+        C = x.shape[1]
+        x_pad = xp.pad(x, ((0, 0), (0, 0), (1, 1), (1, 1)), mode='constant')
+        x_flat = x_pad.transpose(0, 2, 3, 1).reshape(-1, C)
+        return [x_flat[index] for index in indices]
+
+    def _forward(self, inputs):
+        x, grid = inputs
+        B, C, H, W = x.shape
+        _, _, out_H, out_W = grid.shape
+
+        _, _, u_clipped, v_clipped, u0, u1, v0, v1, indices = \
+            self._sample_points(x, grid)
+
         # weights
         w1 = (u1 - u_clipped) * (v1 - v_clipped)
         w2 = (u_clipped - u0) * (v1 - v_clipped)
         w3 = (u1 - u_clipped) * (v_clipped - v0)
         w4 = (u_clipped - u0) * (v_clipped - v0)
-        w1 = w1.astype(x_pad.dtype)
-        w2 = w2.astype(x_pad.dtype)
-        w3 = w3.astype(x_pad.dtype)
-        w4 = w4.astype(x_pad.dtype)
-
-        x_indexed_1 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v0[b], u0[b]], axis=0) for b in range(B)], axis=0)
-        x_indexed_2 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v0[b], u1[b]], axis=0) for b in range(B)], axis=0)
-        x_indexed_3 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v1[b], u0[b]], axis=0) for b in range(B)], axis=0)
-        x_indexed_4 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v1[b], u1[b]], axis=0) for b in range(B)], axis=0)
+        w1 = w1.astype(x.dtype)
+        w2 = w2.astype(x.dtype)
+        w3 = w3.astype(x.dtype)
+        w4 = w4.astype(x.dtype)
+
+        x_indexed_1, x_indexed_2, x_indexed_3, x_indexed_4 = \
+            self._gather(x, indices)
         y = w1[:, :, None] * x_indexed_1
         y += w2[:, :, None] * x_indexed_2
         y += w3[:, :, None] * x_indexed_3
@@ -159,30 +173,9 @@ class SpatialTransformerSampler(function.Function):
 
         B, C, H, W = x.shape
         _, _, out_H, out_W = grid.shape
-        grid = grid.reshape(grid.shape[:2] + (-1,))
-
-        u = grid[:, 0]
-        v = grid[:, 1]
 
-        # Pad the image so that points locating outside of the original
-        # image's size can be sampled.
-        x_pad = xp.pad(x, ((0, 0), (0, 0), (1, 1), (1, 1)), mode='constant')
-
-        # Rescale coordinates from [-1, 1] to [0, width or height - 1],
-        # and adjust them to the padded image.
-        u = (u + 1) * (W - 1) / 2 + 1
-        v = (v + 1) * (H - 1) / 2 + 1
-
-        u_clipped = u.clip(0, W + 1)
-        v_clipped = v.clip(0, H + 1)
-
-        # indices of the 2x2 pixel neighborhood surrounding the coordinates
-        u0 = xp.floor(u_clipped).astype(numpy.int32)
-        u0 = u0.clip(0, W)
-        u1 = u0 + 1
-        v0 = xp.floor(v_clipped).astype(numpy.int32)
-        v0 = v0.clip(0, H)
-        v1 = v0 + 1
+        u, v, u_clipped, v_clipped, u0, u1, v0, v1, indices = \
+            self._sample_points(x, grid)
 
         # weights
         wu0 = u_clipped - u0
@@ -195,57 +188,47 @@ class SpatialTransformerSampler(function.Function):
         wv1 = wv1.astype(gy.dtype)
 
         # --- gu, gv
-        x_indexed_1 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v0[b], u0[b]], axis=0) for b in range(B)], axis=0)
-        x_indexed_2 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v0[b], u1[b]], axis=0) for b in range(B)], axis=0)
-        x_indexed_3 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v1[b], u0[b]], axis=0) for b in range(B)], axis=0)
-        x_indexed_4 = xp.concatenate([xp.expand_dims(
-            x_pad[b, :, v1[b], u1[b]], axis=0) for b in range(B)], axis=0)
-
-        gu = -wv1[:, :, None] * x_indexed_1
-        gu += wv1[:, :, None] * x_indexed_2
-        gu -= wv0[:, :, None] * x_indexed_3
-        gu += wv0[:, :, None] * x_indexed_4
-
-        gv = -wu1[:, :, None] * x_indexed_1
-        gv -= wu0[:, :, None] * x_indexed_2
-        gv += wu1[:, :, None] * x_indexed_3
-        gv += wu0[:, :, None] * x_indexed_4
-
-        gu = gu.reshape(B, out_H, out_W, C).transpose(0, 3, 1, 2)
-        gv = gv.reshape(B, out_H, out_W, C).transpose(0, 3, 1, 2)
-
-        gu *= gy
-        gv *= gy
-        gu = xp.sum(gu, axis=1)
-        gv = xp.sum(gv, axis=1)
+        # Both are reduced over channels directly from the corners gathered
+        # in the same layout as the forward computation.
+        x_indexed_1, x_indexed_2, x_indexed_3, x_indexed_4 = \
+            self._gather(x, indices)
+        gy = gy.reshape(B, C, -1)
+        gy_t = gy.transpose(0, 2, 1)
+
+        gu = wv1 * ((x_indexed_2 - x_indexed_1) * gy_t).sum(axis=2)
+        gu += wv0 * ((x_indexed_4 - x_indexed_3) * gy_t).sum(axis=2)
+        gv = wu1 * ((x_indexed_3 - x_indexed_1) * gy_t).sum(axis=2)
+        gv += wu0 * ((x_indexed_4 - x_indexed_2) * gy_t).sum(axis=2)
+
         # Offsets scaling of the coordinates and clip gradients.
-        u_reshaped = u.reshape(gu.shape)
-        v_reshaped = v.reshape(gv.shape)
-        gu = gu / 2. * (W - 1) * (u_reshaped > 0) * (u_reshaped < (W + 1))
-        gv = gv / 2. * (H - 1) * (v_reshaped > 0) * (v_reshaped < (H + 1))
+        gu = gu / 2. * (W - 1) * (u > 0) * (u < (W + 1))
+        gv = gv / 2. * (H - 1) * (v > 0) * (v < (H + 1))
 
         ggrid = xp.concatenate((gu[:, None], gv[:, None]), axis=1)
+        ggrid = ggrid.reshape(B, 2, out_H, out_W).astype(grid.dtype)
 
         # --- gx
+        # The four corners of all sampling points are scattered to the padded
+        # image at once.
+        weights = (wu1 * wv1, wu0 * wv1, wu1 * wv0, wu0 * wv0)
+        size = B * (H + 2) * (W + 2)
         if xp is numpy:
-            scatter_add = numpy.add.at
+            # bincount over the flat indices of (B, C, H + 2, W + 2)
+            channel = numpy.arange(C)[:, None] * size
+            index = numpy.concatenate(
+                [(channel + i[:, None]) for i in indices], axis=2)
+            value = numpy.concatenate(
+                [gy * w[:, None] for w in weights], axis=2)
+            gx = numpy.bincount(
+                index.ravel(), value.ravel(), minlength=C * size)
+            gx = gx.reshape(C, B, H + 2, W + 2).transpose(1, 0, 2, 3)
         else:
-            scatter_add = xp.scatter_add
-        gx = xp.zeros_like(x_pad)
-        gy = gy.reshape(B, C, -1)
-        for b in range(B):
-            scatter_add(gx[b], (slice(None), v0[b], u0[b]),
-                        gy[b] * wu1[b] * wv1[b])
-            scatter_add(gx[b], (slice(None), v0[b], u1[b]),
-                        gy[b] * wu0[b] * wv1[b])
-            scatter_add(gx[b], (slice(None), v1[b], u0[b]),
-                        gy[b] * wu1[b] * wv0[b])
-            scatter_add(gx[b], (slice(None), v1[b], u1[b]),
-                        gy[b] * wu0[b] * wv0[b])
-        gx = gx[:, :, 1:-1, 1:-1]
+            gx = xp.zeros((size, C), dtype=x.dtype)
+            for i, w in zip(indices, weights):
+                xp.scatter_add(
+                    gx, i.ravel(), (gy_t * w[:, :, None]).reshape(-1, C))
+            gx = gx.reshape(B, H + 2, W + 2, C).transpose(0, 3, 1, 2)
+        gx = gx[:, :, 1:-1, 1:-1].astype(x.dtype)
         return gx, ggrid
 
 
@@ -1,12 +1,152 @@
-from chainer.functions.array import broadcast
+import numpy
+import six
+
+from chainer import cuda
+from chainer import function_node
 from chainer.functions.array import concat
-from chainer.functions.array import reshape
-from chainer.functions.array import select_item
-from chainer.functions.array import split_axis
-from chainer.functions.connection import embed_id
-from chainer.functions.math import logsumexp
-from chainer.functions.math import minmax
-from chainer.functions.math import sum as _sum
+from chainer.functions.array import get_item
+from chainer.utils import type_check
+from chainer import variable
+
+
+def _logsumexp(xp, x, axis):
+    m = x.max(axis=axis, keepdims=True)
+    y = xp.log(xp.exp(x - m).sum(axis=axis, keepdims=True))
+    y += m
+    return y.squeeze(axis)
+
+
+def _as_array(x):
+    if isinstance(x, variable.Variable):
+        return x.data
+    return x
+
+
+class CRF1d(function_node.FunctionNode):
+
+    """Negative log-likelihood of linear-chain CRF.
+
+    It runs the recursion of the forward variables over the whole sequence in
+    the forward computation, and the recursion of the backward variables to
+    compute the gradients from the marginal probabilities in the backward
+    computation, instead of building a computational graph of each step.
+
+    """
+
+    def __init__(self, ys, reduce='mean'):
+        self.ys = ys
+        self.reduce = reduce
+
+    def check_type_forward(self, in_types):
+        type_check.expect(in_types.size() == len(self.ys) + 1)
+        cost_type = in_types[0]
+        type_check.expect(
+            cost_type.dtype.kind == 'f',
+            cost_type.ndim == 2,
+            cost_type.shape[0] == cost_type.shape[1],
+        )
+        for i, (x_type, y) in enumerate(zip(in_types[1:], self.ys)):
+            type_check.expect(
+                x_type.dtype == cost_type.dtype,
+                x_type.ndim == 2,
+                x_type.shape[1] == cost_type.shape[0],
+            )
+            # The labels are not inputs of the function, so their types are
+            # checked as constants.
+            type_check.expect(
+                type_check.make_variable(
+                    y.dtype.kind, 'ys[%d].dtype.kind' % i) == 'i',
+                type_check.make_variable(y.ndim, 'ys[%d].ndim' % i) == 1,
+            )
+            type_check.expect(
+                type_check.make_variable(
+                    len(y), 'ys[%d].shape[0]' % i) == x_type.shape[0])
+
+    def forward(self, inputs):
+        self.retain_inputs(tuple(six.moves.range(len(inputs))))
+        xp = cuda.get_array_module(*inputs)
+        cost, xs = inputs[0], inputs[1:]
+        ys = self.ys
+        n_batch = len(xs[0])
+
+        # alphas[t][b, k] is the log of the sum of the exponentiated scores
+        # of the label sequences of the first t + 1 steps ending with k.
+        alpha = xs[0]
+        alphas = [alpha]
+        logz = xp.empty(n_batch, dtype=cost.dtype)
+        score = xs[0][xp.arange(n_batch), ys[0]]
+        for t in six.moves.range(1, len(xs)):
+            x, y = xs[t], ys[t]
+            batch = len(x)
+            if len(alpha) > batch:
+                # The rest of the sequences end at the previous step
+                logz[batch:len(alpha)] = _logsumexp(xp, alpha[batch:], 1)
+            alpha = _logsumexp(xp, alpha[:batch, :, None] + cost, 1) + x
+            alphas.append(alpha)
+            score[:batch] += x[xp.arange(batch), y] + \
+                cost[ys[t - 1][:batch], y]
+        logz[:len(alpha)] = _logsumexp(xp, alpha, 1)
+
+        self._alphas = alphas
+        self._logz = logz
+        loss = logz - score
+        if self.reduce == 'mean':
+            return xp.asarray(loss.sum() / n_batch, dtype=cost.dtype),
+        return loss,
+
+    def backward(self, indexes, grad_outputs):
+        inputs = self.get_retained_inputs()
+        gy, = grad_outputs
+        xp = cuda.get_array_module(gy.data)
+        cost, xs = inputs[0].data, [x.data for x in inputs[1:]]
+        ys = self.ys
+        alphas = self._alphas
+        logz = self._logz
+        n_batch = len(xs[0])
+        n_label = len(cost)
+
+        if self.reduce == 'mean':
+            g = xp.broadcast_to(gy.data, (n_batch,)) / n_batch
+        else:
+            g = gy.data
+        eye = xp.eye(n_label, dtype=cost.dtype)
+
+        gcost = xp.zeros_like(cost)
+        gxs = [None] * len(xs)
+        # betas[b, k] is the log of the sum of the exponentiated scores of
+        # the label sequences of the steps after t starting from k.
+        beta = xp.zeros_like(alphas[-1])
+        for t in six.moves.range(len(xs) - 1, -1, -1):
+            batch = len(xs[t])
+            if len(beta) < batch:
+                # The rest of the sequences end at this step
+                beta = xp.concatenate(
+                    (beta, xp.zeros((batch - len(beta), n_label),
+                                    dtype=beta.dtype)))
+            g_t = g[:batch, None]
+            logz_t = logz[:batch, None]
+            marginal = xp.exp(alphas[t] + beta - logz_t)
+            gxs[t] = g_t * (marginal - eye[ys[t]])
+            if t == 0:
+                break
+
+            # s[b, j, k] is the log score of the transition from j to k
+            # followed by the rest of the sequence.
+            s = cost + (xs[t] + beta)[:, None, :]
+            pair = xp.exp(alphas[t - 1][:batch, :, None] + s -
+                          logz_t[:, :, None])
+            gcost += xp.tensordot(g[:batch], pair, axes=1)
+            gcost -= (eye[ys[t - 1][:batch]] * g_t).T.dot(eye[ys[t]])
+            beta = _logsumexp(xp, s, 2)
+
+        ret = []
+        for i in indexes:
+            if i == 0:
+                # The transition cost is not used by sequences of length one
+                ret.append(variable.Variable(gcost) if len(xs) > 1 else None)
+            else:
+                ret.append(variable.Variable(gxs[i - 1]))
+        return ret
 
 
 def crf1d(cost, xs, ys, reduce='mean'):
@@ -106,46 +246,8 @@ def crf1d(cost, xs, ys, reduce='mean'):
 
     assert xs[0].shape[1] == cost.shape[0]
 
-    n_label = cost.shape[0]
-    n_batch = xs[0].shape[0]
-
-    alpha = xs[0]
-    alphas = []
-    for x in xs[1:]:
-        batch = x.shape[0]
-        if alpha.shape[0] > batch:
-            alpha, alpha_rest = split_axis.split_axis(alpha, [batch], axis=0)
-            alphas.append(alpha_rest)
-        b_alpha, b_cost = broadcast.broadcast(alpha[..., None], cost)
-        alpha = logsumexp.logsumexp(b_alpha + b_cost, axis=1) + x
-
-    if len(alphas) > 0:
-        alphas.append(alpha)
-        alpha = concat.concat(alphas[::-1], axis=0)
-
-    logz = logsumexp.logsumexp(alpha, axis=1)
-
-    cost = reshape.reshape(cost, (cost.size, 1))
-    score = select_item.select_item(xs[0], ys[0])
-    scores = []
-    for x, y, y_prev in zip(xs[1:], ys[1:], ys[:-1]):
-        batch = x.shape[0]
-        if score.shape[0] > batch:
-            y_prev, _ = split_axis.split_axis(y_prev, [batch], axis=0)
-            score, score_rest = split_axis.split_axis(score, [batch], axis=0)
-            scores.append(score_rest)
-        score += (select_item.select_item(x, y) + reshape.reshape(
-            embed_id.embed_id(y_prev * n_label + y, cost), (batch,)))
-
-    if len(scores) > 0:
-        scores.append(score)
-        score = concat.concat(scores[::-1], axis=0)
-
-    loss = logz - score
-    if reduce == 'mean':
-        return _sum.sum(loss) / n_batch
-    else:
-        return loss
+    ys = [_as_array(y) for y in ys]
+    return CRF1d(ys, reduce).apply([cost] + list(xs))[0]
 
 
 def argmax_crf1d(cost, xs):
@@ -176,35 +278,46 @@ def argmax_crf1d(cost, xs):
         the mini-batch size of the corresponding ``xs[i]``. That means,
         ``ps[i].shape == xs[i].shape[0:1]``.
     """
-    alpha = xs[0]
+    # The best path is decoded on the raw arrays, as it is piecewise constant
+    # with respect to the inputs, and then the score is gathered along the
+    # path from the inputs so that it can be backpropagated.
+    cost_data = _as_array(cost)
+    xs_data = [_as_array(x) for x in xs]
+    xp = cuda.get_array_module(cost_data, *xs_data)
+
+    alpha = xs_data[0]
     alphas = []
     max_inds = []
-    for x in xs[1:]:
+    for x in xs_data[1:]:
         batch = x.shape[0]
         if alpha.shape[0] > batch:
-            alpha, alpha_rest = split_axis.split_axis(alpha, [batch], axis=0)
-            alphas.append(alpha_rest)
+            alphas.append(alpha[batch:])
+            alpha = alpha[:batch]
         else:
             alphas.append(None)
-        b_alpha, b_cost = broadcast.broadcast(alpha[..., None], cost)
-        scores = b_alpha + b_cost
-        max_ind = minmax.argmax(scores, axis=1)
+        scores = alpha[..., None] + cost_data
+        max_ind = scores.argmax(axis=1)
         max_inds.append(max_ind)
-        alpha = minmax.max(scores, axis=1) + x
+        alpha = scores.max(axis=1) + x
 
-    inds = minmax.argmax(alpha, axis=1)
-    path = [inds.data]
+    inds = alpha.argmax(axis=1).astype(numpy.int32)
+    path = [inds]
     for m, a in zip(max_inds[::-1], alphas[::-1]):
-        inds = select_item.select_item(m, inds)
+        inds = m[xp.arange(len(inds)), inds].astype(numpy.int32)
         if a is not None:
-            inds = concat.concat([inds, minmax.argmax(a, axis=1)], axis=0)
-        path.append(inds.data)
+            inds = xp.concatenate(
+                [inds, a.argmax(axis=1).astype(numpy.int32)])
+        path.append(inds)
     path.reverse()
 
-    score = minmax.max(alpha, axis=1)
-    for a in alphas[::-1]:
-        if a is None:
-            continue
-        score = concat.concat([score, minmax.max(a, axis=1)], axis=0)
+    score = get_item.get_item(xs[0], (xp.arange(len(path[0])), path[0]))
+    for t in six.moves.range(1, len(xs)):
+        y, batch = path[t], len(path[t])
+        step = get_item.get_item(xs[t], (xp.arange(batch), y)) + \
+            get_item.get_item(cost, (path[t - 1][:batch], y))
+        if batch < len(score):
+            score = concat.concat((score[:batch] + step, score[batch:]), 0)
+        else:
+            score += step
 
     return score, path
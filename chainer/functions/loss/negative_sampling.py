@@ -1,5 +1,4 @@
 import numpy
-import six
 
 from chainer import cuda
 from chainer import function
@@ -49,9 +48,11 @@ class NegativeSamplingFunction(function.Function):
         self.ignore_mask = (t != self.ignore_label)
         self._make_samples(t)
 
-        w = W[self.samples]
-        wx = numpy.einsum(
-            'ij,ikj->ik', x[self.ignore_mask], w[self.ignore_mask])
+        # wx is kept only for the rows not ignored, and is reused in backward
+        self.wx = numpy.einsum(
+            'ij,ikj->ik', x[self.ignore_mask],
+            W[self.samples[self.ignore_mask]])
+        wx = self.wx.copy()
         wx[:, 0] *= -1
         y = numpy.sum(numpy.logaddexp(wx, 0), axis=1)
 
@@ -114,27 +115,35 @@ class NegativeSamplingFunction(function.Function):
         x, t, W = inputs
         gloss, = grads
 
+        mask = self.ignore_mask
+        samples = self.samples[mask]
+        if self.reduce == 'sum':
+            gy = gloss
+        else:
+            gy = gloss[mask][:, None]
+
+        # g == -y * gloss / (1 + exp(yf)) for all rows and samples at once
+        f = self.wx.copy()
+        f[:, 0] *= -1
+        g = gy / (1 + numpy.exp(-f))
+        g[:, 0] *= -1
+
         gx = numpy.zeros_like(x)
+        gx[mask] = numpy.einsum('ik,ikj->ij', g, W[samples])
+
+        # Scatter g * x to the sampled rows of W. Contributions are sorted by
+        # the row index and summed by a segmented reduction, which is much
+        # faster than accumulating them one by one.
         gW = numpy.zeros_like(W)
-        for i in numpy.arange(len(self.ignore_mask))[self.ignore_mask]:
-            ix = x[i]
-            k = self.samples[i]
-            if self.reduce == 'sum':
-                igy = gloss
-            else:
-                igy = gloss[i]
-
-            w = W[k]
-            f = w.dot(ix)
-
-            # g == -y * gloss / (1 + exp(yf))
-            f[0] *= -1
-            g = igy / (1 + numpy.exp(-f))
-            g[0] *= -1
-
-            gx[i] = g.dot(w)
-            for ik, ig in six.moves.zip(k, g):
-                gW[ik] += ig * ix
+        k = samples.ravel()
+        if len(k) > 0:
+            order = numpy.argsort(k, kind='mergesort')
+            k = k[order]
+            rows = order // samples.shape[1]
+            contrib = g.ravel()[order][:, None] * x[mask][rows]
+            starts = numpy.flatnonzero(numpy.concatenate(
+                ([True], k[1:] != k[:-1])))
+            gW[k[starts]] = numpy.add.reduceat(contrib, starts, axis=0)
         return gx, None, gW
 
     def backward_gpu(self, inputs, grads):
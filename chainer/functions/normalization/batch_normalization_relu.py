@@ -0,0 +1,350 @@
+import numpy
+
+import chainer
+from chainer import cuda
+from chainer import function_node
+from chainer.utils import argument
+from chainer.utils import inplace as inplace_module
+from chainer.utils import type_check
+
+
+def _activation_mask(z, slope):
+    # Positions where the activation passes the pre-activation as it is.
+    return z > 0 if slope == 0 else z >= 0
+
+
+def _normalized_input(a, mean, inv_std, gamma, beta, expander, slope,
+                      recompute):
+    # Returns the normalized input and the mask of the activation computed
+    # from the input, or from the output if ``recompute`` is True.
+    xp = cuda.get_array_module(a)
+    if recompute:
+        mask = _activation_mask(a, slope)
+        z = xp.where(mask, a, a / a.dtype.type(slope))
+        x_hat = z - beta[expander]
+        x_hat /= gamma[expander]
+    else:
+        x_hat = a - mean[expander]
+        x_hat *= inv_std[expander]
+        z = gamma[expander] * x_hat
+        z += beta[expander]
+        mask = _activation_mask(z, slope)
+    return x_hat, mask
+
+
+class _Expander(object):
+
+    # Helper to broadcast per-channel variables to the shape of the input and
+    # to sum variables of the shape of the input per channel.
+
+    def __init__(self, x_shape, gamma_shape, axis):
+        self.x_shape = x_shape
+        self.param_shape = tuple(
+            gamma_shape[i - 1] if 0 < i <= len(gamma_shape) else 1
+            for i in range(len(x_shape)))
+        self.axis = axis
+
+    def expand(self, v):
+        v = chainer.functions.reshape(v, self.param_shape)
+        return chainer.functions.broadcast_to(v, self.x_shape)
+
+    def sum(self, v):
+        return chainer.functions.sum(v, axis=self.axis)
+
+
+def _normalized_input_variable(a, mean, inv_std, gamma, beta, mask,
+                               expander, slope, recompute):
+    # Differentiable version of _normalized_input.
+    if recompute:
+        xp = cuda.get_array_module(a)
+        scale = xp.where(mask, 1, 1. / slope).astype(a.dtype)
+        return (a * scale - expander.expand(beta)) / expander.expand(gamma)
+    return (a - expander.expand(mean)) * expander.expand(inv_std)
+
+
+class BatchNormalizationReLU(function_node.FunctionNode):
+
+    """Batch normalization followed by leaky ReLU in one node.
+
+    If ``inplace`` is ``True``, the output overwrites the input and only the
+    output is retained. In the backward computation, the input of the
+    activation is recovered by inverting the leaky ReLU, and the normalized
+    input is recovered by inverting the affine transformation by ``gamma``
+    and ``beta``. This requires a positive slope and nonzero ``gamma``; the
+    input is retained instead of the output if the requirements are not met.
+
+    Besides the output, the node outputs the mean and the inverse of the
+    standard deviation of the mini-batch, through which the gradients w.r.t.
+    the input depend on the input in the double backpropagation.
+
+    """
+
+    def __init__(self, eps=2e-5, mean=None, var=None, decay=0.9, slope=0.0,
+                 inplace=False):
+        self.running_mean = mean
+        self.running_var = var
+        self.eps = eps
+        self.decay = decay
+        self.slope = slope
+        self.inplace = inplace
+
+    def check_type_forward(self, in_types):
+        type_check.expect(in_types.size() == 3)
+        x_type, gamma_type, beta_type = in_types
+        M = type_check.eval(gamma_type.ndim)
+        type_check.expect(
+            x_type.dtype.kind == 'f',
+            x_type.ndim >= gamma_type.ndim + 1,
+            x_type.shape[1:1 + M] == gamma_type.shape,
+            gamma_type.dtype == x_type.dtype,
+            beta_type.dtype == x_type.dtype,
+            gamma_type.shape == beta_type.shape,
+        )
+
+    def forward(self, inputs):
+        x, gamma, beta = inputs
+        xp = cuda.get_array_module(x)
+        if self.running_mean is None:
+            self.running_mean = xp.zeros_like(gamma)
+            self.running_var = xp.zeros_like(gamma)
+
+        # expander inserts singleton dimensions to gamma and beta so that they
+        # can be broadcasted with x.
+        head_ndim = gamma.ndim + 1
+        expander = (None, Ellipsis) + (None,) * (x.ndim - head_ndim)
+        self.expander = expander
+        self.axis = (0,) + tuple(range(head_ndim, x.ndim))
+
+        mean = x.mean(axis=self.axis)
+        var = x.var(axis=self.axis)
+        var += self.eps
+        inv_std = var ** (-0.5)
+
+        # Update running statistics
+        m = x.size // gamma.size
+        adjust = m / max(m - 1., 1.)  # unbiased estimation
+        self.running_mean *= self.decay
+        self.running_mean += (1 - self.decay) * mean
+        self.running_var *= self.decay
+        self.running_var += (1 - self.decay) * adjust * var
+
+        self.recompute = (self.inplace and self.slope > 0 and
+                          bool((gamma != 0).all()))
+        if self.recompute:
+            self.retain_inputs((1, 2))
+            self.retain_outputs((0, 1, 2))
+            y = x
+        else:
+            self.retain_inputs((0, 1, 2))
+            self.retain_outputs((1, 2))
+            y = xp.empty_like(x)
+
+        scale = (gamma * inv_std)[expander]
+        if xp is numpy:
+            numpy.subtract(x, mean[expander], out=y)
+            y *= scale
+            y += beta[expander]
+            if self.slope == 0:
+                numpy.maximum(y, 0, out=y)
+            else:
+                numpy.multiply(y, self.slope, out=y, where=y < 0)
+        else:
+            cuda.elementwise(
+                'T x, T mean, T scale, T beta, T slope', 'T y',
+                '''
+                T z = (x - mean) * scale + beta;
+                y = z >= 0 ? z : (T)(z * slope);
+                ''',
+                'bn_leaky_relu_fwd')(
+                    x, mean[expander], scale, beta[expander], self.slope, y)
+        return y, mean, inv_std
+
+    def backward(self, indexes, grad_outputs):
+        gy, gmean, ginv_std = grad_outputs
+        if self.recompute:
+            gamma, beta = self.get_retained_inputs()
+            a, mean, inv_std = self.get_retained_outputs()
+        else:
+            a, gamma, beta = self.get_retained_inputs()
+            mean, inv_std = self.get_retained_outputs()
+
+        gx = ggamma = gbeta = None
+        if gy is not None:
+            gx, ggamma, gbeta = BatchNormalizationReLUGrad(
+                self.slope, self.recompute, self.expander, self.axis).apply(
+                    (a, mean, inv_std, gamma, beta, gy))
+
+        if gmean is not None or ginv_std is not None:
+            # The statistics depend on the input only in the double
+            # backpropagation.
+            e = _Expander(a.shape, gamma.shape, self.axis)
+            m = a.size // gamma.size
+            terms = [] if gx is None else [gx]
+            if gmean is not None:
+                terms.append(e.expand(gmean / m))
+            if ginv_std is not None:
+                _, mask = _normalized_input(
+                    a.data, mean.data, inv_std.data, gamma.data, beta.data,
+                    self.expander, self.slope, self.recompute)
+                x_hat = _normalized_input_variable(
+                    a, mean, inv_std, gamma, beta, mask, e, self.slope,
+                    self.recompute)
+                terms.append(
+                    -e.expand(inv_std * inv_std * ginv_std / m) * x_hat)
+            gx = terms[0]
+            for term in terms[1:]:
+                gx = gx + term
+        return gx, ggamma, gbeta
+
+
+class BatchNormalizationReLUGrad(function_node.FunctionNode):
+
+    """Gradient of batch normalization followed by leaky ReLU.
+
+    The inputs are the input of the normalization (or the output of the
+    activation if ``recompute`` is ``True``), the mean and the inverse of the
+    standard deviation of the mini-batch, ``gamma``, ``beta`` and the
+    gradient w.r.t. the output.
+
+    """
+
+    def __init__(self, slope, recompute, expander, axis):
+        self.slope = slope
+        self.recompute = recompute
+        self.expander = expander
+        self.axis = axis
+
+    def forward(self, inputs):
+        self.retain_inputs((0, 1, 2, 3, 4, 5))
+        a, mean, inv_std, gamma, beta, gy = inputs
+        xp = cuda.get_array_module(gy)
+        expander = self.expander
+
+        x_hat, mask = _normalized_input(
+            a, mean, inv_std, gamma, beta, expander, self.slope,
+            self.recompute)
+        g = xp.where(mask, gy, gy * gy.dtype.type(self.slope))
+
+        m = gy.size // gamma.size
+        ggamma = (g * x_hat).sum(axis=self.axis)
+        gbeta = g.sum(axis=self.axis)
+        gx = x_hat
+        gx *= ggamma[expander]
+        gx += gbeta[expander]
+        gx *= -1. / m
+        gx += g
+        gx *= (gamma * inv_std)[expander]
+        return gx, ggamma, gbeta
+
+    def backward(self, indexes, grad_outputs):
+        a, mean, inv_std, gamma, beta, gy = self.get_retained_inputs()
+        xp = cuda.get_array_module(gy)
+        e = _Expander(gy.shape, gamma.shape, self.axis)
+        m = gy.size // gamma.size
+
+        _, mask = _normalized_input(
+            a.data, mean.data, inv_std.data, gamma.data, beta.data,
+            self.expander, self.slope, self.recompute)
+        coeff = xp.where(mask, 1, self.slope).astype(gy.dtype)
+        x_hat = _normalized_input_variable(
+            a, mean, inv_std, gamma, beta, mask, e, self.slope,
+            self.recompute)
+        g = gy * coeff
+        ggamma = e.sum(g * x_hat)
+        gbeta = e.sum(g)
+        scale = gamma * inv_std
+
+        ggx, gggamma, ggbeta = [
+            chainer.Variable(xp.zeros(shape, gy.dtype)) if v is None else v
+            for v, shape in zip(
+                grad_outputs, (gy.shape, gamma.shape, gamma.shape))]
+
+        # Gradients w.r.t. g, x_hat and scale of the first-order gradients
+        # gx = scale * (g - (gbeta + x_hat * ggamma) / m), ggamma and gbeta.
+        sum_ggx = e.sum(ggx)
+        sum_ggx_x_hat = e.sum(ggx * x_hat)
+        g_g = (e.expand(scale) * (
+            ggx - (e.expand(sum_ggx) + x_hat * e.expand(sum_ggx_x_hat)) / m) +
+            x_hat * e.expand(gggamma) + e.expand(ggbeta))
+        g_x_hat = (g * e.expand(gggamma) - e.expand(scale / m) * (
+            ggx * e.expand(ggamma) + g * e.expand(sum_ggx_x_hat)))
+        g_scale = e.sum(ggx * g) - (
+            sum_ggx * gbeta + sum_ggx_x_hat * ggamma) / m
+
+        ga = gmean = gbeta2 = None
+        g_gamma = g_scale * inv_std
+        g_inv_std = g_scale * gamma
+        if self.recompute:
+            # x_hat = (y * scale - beta) / gamma
+            scale_inv = xp.where(mask, 1, 1. / self.slope).astype(gy.dtype)
+            ga = g_x_hat * scale_inv / e.expand(gamma)
+            gbeta2 = -e.sum(g_x_hat) / gamma
+            g_gamma = g_gamma - e.sum(g_x_hat * x_hat) / gamma
+        else:
+            # x_hat = (x - mean) * inv_std
+            ga = g_x_hat * e.expand(inv_std)
+            gmean = -e.sum(g_x_hat) * inv_std
+            g_inv_std = g_inv_std + e.sum(g_x_hat * x_hat) / inv_std
+        return ga, gmean, g_inv_std, g_gamma, gbeta2, g_g * coeff
+
+
+def batch_normalization_relu(x, gamma, beta, **kwargs):
+    """batch_normalization_relu(x, gamma, beta, eps=2e-5, running_mean=None, running_var=None, decay=0.9, slope=0.0, inplace=False)
+
+    Batch normalization followed by (leaky) ReLU.
+
+    This function computes
+    ``leaky_relu(batch_normalization(x, gamma, beta), slope)`` (or ``relu``
+    if ``slope`` is zero) in one function node, using the statistics of the
+    mini-batch as :func:`~chainer.functions.batch_normalization` in training
+    mode does.
+
+    If ``inplace`` is ``True`` and ``slope`` is positive, the output is
+    written to the data array of ``x`` when no one else uses the array (see
+    :func:`~chainer.functions.relu`), and only the output is kept for the
+    backward computation, from which the normalized input is recomputed by
+    inverting the leaky ReLU and the scaling by ``gamma``. Compared to
+    applying batch normalization and ReLU separately, which keeps both the
+    input of the normalization and the output of the activation, it halves
+    the memory of the activations of the layer, as in-place activated batch
+    normalization (InPlace-ABN) does. The plain ReLU is not invertible, so a
+    small positive ``slope`` (e.g. ``0.01``) is required for this memory
+    saving. Otherwise, the input is kept instead of the output.
+
+    Args:
+        x (Variable): Input variable.
+        gamma (Variable): Scaling parameter of normalized data.
+        beta (Variable): Shifting parameter of scaled normalized data.
+        eps (float): Epsilon value for numerical stability.
+        running_mean (numpy.ndarray or cupy.ndarray):
+            Running average of the mean updated in place. See
+            :func:`~chainer.functions.batch_normalization`.
+        running_var (numpy.ndarray or cupy.ndarray):
+            Running average of the variance updated in place. See
+            :func:`~chainer.functions.batch_normalization`.
+        decay (float): Decay rate of moving average.
+        slope (float): Slope of the leaky ReLU for negative inputs. It must
+            not be negative.
+        inplace (bool): If ``True``, the output overwrites ``x`` when it is
+            allowed.
+
+    Returns:
+        ~chainer.Variable: Output variable.
+
+    See: `In-Place Activated BatchNorm for Memory-Optimized Training of DNNs
+    <https://arxiv.org/abs/1712.02616>`_
+
+    .. seealso:: :func:`~chainer.functions.batch_normalization`
+
+    """  # NOQA
+    eps, running_mean, running_var, decay, slope, inplace = \
+        argument.parse_kwargs(
+            kwargs, ('eps', 2e-5), ('running_mean', None),
+            ('running_var', None), ('decay', 0.9), ('slope', 0.0),
+            ('inplace', False))
+    if slope < 0:
+        raise ValueError('slope must not be negative')
+    inplace = inplace and inplace_module.can_overwrite(x)
+    return BatchNormalizationReLU(
+        eps, running_mean, running_var, decay, slope, inplace).apply(
+            (x, gamma, beta))[0]
@@ -3,10 +3,32 @@ import six
 
 from chainer import cuda
 from chainer import function
+from chainer.utils import thread_pool
 from chainer.utils import type_check
 from chainer import ia
 
 
+def _cpu_conv_sum(y, x, n):
+    # Convolutional sum over the channels computed as the difference of
+    # cumulative sums, whose cost does not depend on the window width.
+    # The cumulative sums of half-precision inputs are taken in single
+    # precision to avoid cancellation.
+    half_n = n // 2
+    c = x.shape[1]
+    dtype = numpy.promote_types(x.dtype, numpy.float32)
+    cumsum = numpy.empty((x.shape[0], c + 2 * half_n + 1) + x.shape[2:],
+                         dtype=dtype)
+    # cumsum[:, j] is the sum of the channels before min(max(j - half_n, 0), c)
+    cumsum[:, :half_n + 1] = 0
+    # Accumulating the channels one by one is several times faster than
+    # numpy.cumsum along a non-last axis.
+    for i in six.moves.range(c):
+        j = half_n + i
+        numpy.add(cumsum[:, j], x[:, i], out=cumsum[:, j + 1])
+    cumsum[:, half_n + c + 1:] = cumsum[:, half_n + c:half_n + c + 1]
+    numpy.subtract(cumsum[:, 2 * half_n + 1:], cumsum[:, :c], out=y)
+
+
 def _cu_conv_sum(y, x, n):
     # Convolutional sum
     # TODO(beam2d): Use scan computation
@@ -62,19 +84,31 @@ class LocalResponseNormalization(function.Function):
         return self.y,
 
     def forward_cpu(self, x):
-        # pdb.set_trace()
         if ia.all_ready(x, (4,)):
             return self.forward_ia(x)
         else:
-            half_n = self.n // 2
-            x2 = numpy.square(x[0])
-            sum_part = x2.copy()
-            for i in six.moves.range(1, half_n + 1):
-                sum_part[:, i:] += x2[:, :-i]
-                sum_part[:, :-i] += x2[:, i:]
-            self.unit_scale = self.k + self.alpha * sum_part
-            self.scale = self.unit_scale ** -self.beta
-            self.y = x[0] * self.scale
+            x = x[0]
+            self.unit_scale = numpy.empty_like(x)
+            self.scale = numpy.empty_like(x)
+            self.y = numpy.empty_like(x)
+
+            def forward(b):
+                unit_scale = self.unit_scale[b]
+                _cpu_conv_sum(unit_scale, numpy.square(x[b]), self.n)
+                # The difference of the cumulative sums of the squares may
+                # be slightly negative due to rounding errors.
+                numpy.maximum(unit_scale, 0, out=unit_scale)
+                unit_scale *= self.alpha
+                unit_scale += self.k
+                # exp and log are much faster than power with a fractional
+                # exponent in NumPy.
+                scale = self.scale[b]
+                numpy.log(unit_scale, out=scale)
+                scale *= -self.beta
+                numpy.exp(scale, out=scale)
+                numpy.multiply(x[b], scale, out=self.y[b])
+
+            thread_pool.run_in_chunks(forward, len(x), x.size)
             return self.y,
 
     def backward_ia(self, x, gy):
@@ -90,15 +124,21 @@ class LocalResponseNormalization(function.Function):
         if ia.all_ready(x, (4,)):
             return self.backward_ia(x, gy)
         else:
-            half_n = self.n // 2
-            summand = self.y * gy[0] / self.unit_scale
-            sum_part = summand.copy()
-            for i in six.moves.range(1, half_n + 1):
-                sum_part[:, i:] += summand[:, :-i]
-                sum_part[:, :-i] += summand[:, i:]
-
-            gx = gy[0] * self.scale - 2 * \
-                self.alpha * self.beta * x[0] * sum_part
+            x, gy = x[0], gy[0]
+            gx = numpy.empty_like(x)
+            coeff = 2 * self.alpha * self.beta
+
+            def backward(b):
+                summand = self.y[b] * gy[b]
+                summand /= self.unit_scale[b]
+                sum_part = numpy.empty_like(summand)
+                _cpu_conv_sum(sum_part, summand, self.n)
+                sum_part *= x[b]
+                sum_part *= coeff
+                numpy.multiply(gy[b], self.scale[b], out=gx[b])
+                gx[b] -= sum_part
+
+            thread_pool.run_in_chunks(backward, len(x), x.size)
             return gx,
 
     def forward_gpu(self, x):
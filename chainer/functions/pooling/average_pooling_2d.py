@@ -1,10 +1,12 @@
 import numpy
+import six
 
 import chainer
 from chainer import cuda
 from chainer import function_node
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
+from chainer.utils import thread_pool
 from chainer import ia
 
 
@@ -17,9 +19,28 @@ class AveragePooling2D(pooling_2d.Pooling2D):
         self._in_shape = x[0].shape
         self._in_dtype = x[0].dtype
 
-        col = conv.im2col_cpu(x[0], self.kh, self.kw, self.sy, self.sx,
-                              self.ph, self.pw)
-        y = col.mean(axis=(2, 3))
+        n, c, h, w = x[0].shape
+        kh, kw, sy, sx = self.kh, self.kw, self.sy, self.sx
+        out_h = conv.get_conv_outsize(h, kh, sy, self.ph)
+        assert out_h > 0, 'Height in the output should be positive.'
+        out_w = conv.get_conv_outsize(w, kw, sx, self.pw)
+        assert out_w > 0, 'Width in the output should be positive.'
+        x_pad = pooling_2d._pad_cpu(
+            x[0], kh, kw, sy, sx, self.ph, self.pw, out_h, out_w, 0)
+        y = numpy.empty((n, c, out_h, out_w), dtype=x[0].dtype)
+        # Half-precision inputs are summed in single precision as mean does.
+        acc_dtype = numpy.promote_types(x[0].dtype, numpy.float32)
+
+        def forward(b):
+            x_b = x_pad[b]
+            acc = pooling_2d._window(
+                x_b, 0, 0, sy, sx, out_h, out_w).astype(acc_dtype)
+            for k in six.moves.range(1, kh * kw):
+                acc += pooling_2d._window(
+                    x_b, k // kw, k % kw, sy, sx, out_h, out_w)
+            numpy.multiply(acc, 1. / (kh * kw), out=y[b])
+
+        thread_pool.run_in_chunks(forward, n, y.size * kh * kw)
         return y,
 
     def forward_ia(self, x):
@@ -109,11 +130,26 @@ class AveragePooling2DGrad(function_node.FunctionNode):
         self.apool2d = apool2d
 
     def forward_cpu(self, gy):
+        n, c, out_h, out_w = gy[0].shape
         h, w = self._in_shape[2:]
-        gcol = numpy.tile(gy[0][:, :, None, None],
-                          (1, 1, self.kh, self.kw, 1, 1))
-        gx = conv.col2im_cpu(gcol, self.sy, self.sx, self.ph, self.pw, h, w)
-        gx /= self.kh * self.kw
+        kh, kw, sy, sx = self.kh, self.kw, self.sy, self.sx
+        ph, pw = self.ph, self.pw
+        pb = max(0, sy * (out_h - 1) + kh - h - ph)
+        pr = max(0, sx * (out_w - 1) + kw - w - pw)
+        gx = numpy.zeros((n, c, ph + h + pb, pw + w + pr),
+                         dtype=self._in_dtype)
+
+        def backward(b):
+            gy_b, gx_b = gy[0][b], gx[b]
+            for k in six.moves.range(kh * kw):
+                window = pooling_2d._window(
+                    gx_b, k // kw, k % kw, sy, sx, out_h, out_w)
+                window += gy_b
+            gx_b /= kh * kw
+
+        thread_pool.run_in_chunks(backward, n, gy[0].size * kh * kw)
+        if gx.shape[2:] != (h, w):
+            gx = numpy.ascontiguousarray(gx[:, :, ph:ph + h, pw:pw + w])
         return gx,
 
     def forward_ia(self, gy):
@@ -1,10 +1,12 @@
 import numpy
+import six
 
 import chainer
 from chainer import cuda
 from chainer import function_node
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
+from chainer.utils import thread_pool
 from chainer import ia
 
 
@@ -16,16 +18,33 @@ class MaxPooling2D(pooling_2d.Pooling2D):
         self._in_shape = x[0].shape
         self._in_dtype = x[0].dtype
 
-        col = conv.im2col_cpu(
-            x[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
-            pval=-float('inf'), cover_all=self.cover_all)
-        n, c, kh, kw, out_h, out_w = col.shape
-        col = col.reshape(n, c, kh * kw, out_h, out_w)
-
-        # We select maximum twice, since the implementation using numpy.choose
-        # hits its bug when kh * kw >= 32.
-        self.indexes = col.argmax(axis=2)
-        y = col.max(axis=2)
+        n, c, h, w = x[0].shape
+        kh, kw, sy, sx = self.kh, self.kw, self.sy, self.sx
+        out_h = conv.get_conv_outsize(h, kh, sy, self.ph, self.cover_all)
+        assert out_h > 0, 'Height in the output should be positive.'
+        out_w = conv.get_conv_outsize(w, kw, sx, self.pw, self.cover_all)
+        assert out_w > 0, 'Width in the output should be positive.'
+        x_pad = pooling_2d._pad_cpu(
+            x[0], kh, kw, sy, sx, self.ph, self.pw, out_h, out_w,
+            -float('inf'))
+        y = numpy.empty((n, c, out_h, out_w), dtype=x[0].dtype)
+        self.indexes = numpy.empty((n, c, out_h, out_w), dtype=numpy.intp)
+
+        def forward(b):
+            # The running maximum keeps the first index among equal values,
+            # as argmax does.
+            x_b, y_b, indexes_b = x_pad[b], y[b], self.indexes[b]
+            y_b[...] = pooling_2d._window(x_b, 0, 0, sy, sx, out_h, out_w)
+            indexes_b.fill(0)
+            mask = numpy.empty(y_b.shape, dtype=bool)
+            for k in six.moves.range(1, kh * kw):
+                window = pooling_2d._window(
+                    x_b, k // kw, k % kw, sy, sx, out_h, out_w)
+                numpy.greater(window, y_b, out=mask)
+                numpy.maximum(y_b, window, out=y_b)
+                numpy.copyto(indexes_b, k, where=mask)
+
+        thread_pool.run_in_chunks(forward, n, y.size * kh * kw)
         return y,
 
     def forward_ia(self, x):
@@ -160,20 +179,27 @@ class MaxPooling2DGrad(function_node.FunctionNode):
     def forward_cpu(self, gy):
         n, c, out_h, out_w = gy[0].shape
         h, w = self._in_shape[2:]
-        kh, kw = self.kh, self.kw
-
-        gcol = numpy.zeros(
-            (n * c * out_h * out_w * kh * kw), dtype=self._in_dtype)
-
-        indexes = self.indexes.flatten()
-        indexes += numpy.arange(0, indexes.size * kh * kw, kh * kw)
-
-        gcol[indexes] = gy[0].ravel()
-        gcol = gcol.reshape(n, c, out_h, out_w, kh, kw)
-        gcol = numpy.swapaxes(gcol, 2, 4)
-        gcol = numpy.swapaxes(gcol, 3, 5)
-
-        gx = conv.col2im_cpu(gcol, self.sy, self.sx, self.ph, self.pw, h, w)
+        kh, kw, sy, sx = self.kh, self.kw, self.sy, self.sx
+        ph, pw = self.ph, self.pw
+        pb = max(0, sy * (out_h - 1) + kh - h - ph)
+        pr = max(0, sx * (out_w - 1) + kw - w - pw)
+        gx = numpy.zeros((n, c, ph + h + pb, pw + w + pr),
+                         dtype=self._in_dtype)
+
+        def backward(b):
+            gy_b, gx_b, indexes_b = gy[0][b], gx[b], self.indexes[b]
+            mask = numpy.empty(gy_b.shape, dtype=bool)
+            g = numpy.empty(gy_b.shape, dtype=gx.dtype)
+            for k in six.moves.range(kh * kw):
+                numpy.equal(indexes_b, k, out=mask)
+                numpy.multiply(gy_b, mask, out=g)
+                window = pooling_2d._window(
+                    gx_b, k // kw, k % kw, sy, sx, out_h, out_w)
+                window += g
+
+        thread_pool.run_in_chunks(backward, n, gy[0].size * kh * kw)
+        if gx.shape[2:] != (h, w):
+            gx = numpy.ascontiguousarray(gx[:, :, ph:ph + h, pw:pw + w])
         return gx,
 
     def forward_gpu(self, gy):
@@ -238,15 +264,25 @@ class MaxPooling2DWithIndexes(function_node.FunctionNode):
             self.mpool2d = mpool2d
 
     def forward_cpu(self, x):
-        col = conv.im2col_cpu(
-            x[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
-            pval=-float('inf'), cover_all=self.cover_all)
-        n, c, kh, kw, out_h, out_w = col.shape
-        col = col.reshape(n, c, kh * kw, out_h, out_w)
-        col = col.transpose(0, 1, 3, 4, 2).reshape(-1, kh * kw)
-        indexes = self.indexes.ravel()
-        col = col[numpy.arange(len(indexes)), indexes]
-        return col.reshape(n, c, out_h, out_w),
+        n, c = x[0].shape[:2]
+        out_h, out_w = self.indexes.shape[2:]
+        kh, kw, sy, sx = self.kh, self.kw, self.sy, self.sx
+        x_pad = pooling_2d._pad_cpu(
+            x[0], kh, kw, sy, sx, self.ph, self.pw, out_h, out_w,
+            -float('inf'))
+        y = numpy.empty((n, c, out_h, out_w), dtype=x[0].dtype)
+
+        def forward(b):
+            x_b, y_b, indexes_b = x_pad[b], y[b], self.indexes[b]
+            mask = numpy.empty(y_b.shape, dtype=bool)
+            for k in six.moves.range(kh * kw):
+                numpy.equal(indexes_b, k, out=mask)
+                window = pooling_2d._window(
+                    x_b, k // kw, k % kw, sy, sx, out_h, out_w)
+                numpy.copyto(y_b, window, where=mask)
+
+        thread_pool.run_in_chunks(forward, n, y.size * kh * kw)
+        return y,
 
     def forward_gpu(self, inputs):
         if self._used_cudnn:
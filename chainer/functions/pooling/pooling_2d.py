@@ -18,6 +18,23 @@ def _pair(x):
     return x, x
 
 
+def _pad_cpu(x, kh, kw, sy, sx, ph, pw, out_h, out_w, pval):
+    # Pads the input just enough to cover the windows of all output pixels.
+    h, w = x.shape[2:]
+    pb = max(0, sy * (out_h - 1) + kh - h - ph)
+    pr = max(0, sx * (out_w - 1) + kw - w - pw)
+    if ph == pw == pb == pr == 0:
+        return x
+    return numpy.pad(x, ((0, 0), (0, 0), (ph, pb), (pw, pr)),
+                     mode='constant', constant_values=(pval,))
+
+
+def _window(x, ky, kx, sy, sx, out_h, out_w):
+    # Strided view of the elements at (ky, kx) of all the windows. Reducing
+    # the kh * kw views avoids building the column array of im2col.
+    return x[:, :, ky:ky + sy * out_h:sy, kx:kx + sx * out_w:sx]
+
+
 class Pooling2D(function_node.FunctionNode):
 
     """Base class of pooling function over a set of 2d planes."""
@@ -4,7 +4,7 @@
 # Copyright (c) 2015 Preferred Networks, Inc.
 # -----------------------------------------------------------------------------
 
-# Original work of _roi_pooling_slice, forward_cpu and backward_cpu:
+# Original work of _roi_pooling_bins, forward_cpu and backward_cpu:
 # -----------------------------------------------------------------------------
 # Copyright 2014 Nervana Systems Inc.
 # Licensed under the Apache License, Version 2.0 (the "License");
@@ -36,14 +36,28 @@ from chainer import function
 from chainer.utils import type_check
 
 
-def _roi_pooling_slice(size, stride, max_size, roi_offset):
-    start = int(numpy.floor(size * stride))
-    end = int(numpy.ceil((size + 1) * stride))
+def _roi_params(bottom_rois, spatial_scale, outh, outw):
+    idx = bottom_rois[:, 0].astype(numpy.int32)
+    coords = numpy.round(
+        bottom_rois[:, 1:].astype(numpy.float64) * spatial_scale)
+    xmin, ymin, xmax, ymax = coords.astype(numpy.int64).T
+    roi_width = numpy.maximum(xmax - xmin + 1, 1)
+    roi_height = numpy.maximum(ymax - ymin + 1, 1)
+    strideh = roi_height.astype(numpy.float64) / outh
+    stridew = roi_width.astype(numpy.float64) / outw
+    return idx, xmin, ymin, xmax, ymax, strideh, stridew
 
-    start = min(max(start + roi_offset, 0), max_size)
-    end = min(max(end + roi_offset, 0), max_size)
 
-    return slice(start, end), end - start
+def _roi_pooling_bins(n_bins, stride, max_size, roi_offset):
+    # Returns the start and end positions of the bins of all RoIs, each of
+    # which is an array of shape (n_rois, n_bins).
+    size = numpy.arange(n_bins)
+    start = numpy.floor(size * stride[:, None]).astype(numpy.int64)
+    end = numpy.ceil((size + 1) * stride[:, None]).astype(numpy.int64)
+
+    start = numpy.clip(start + roi_offset[:, None], 0, max_size)
+    end = numpy.clip(end + roi_offset[:, None], 0, max_size)
+    return start, end
 
 
 class ROIPooling2D(function.Function):
@@ -79,39 +93,56 @@ class ROIPooling2D(function.Function):
                                dtype=numpy.float32)
         self.argmax_data = numpy.zeros(top_data.shape, numpy.int32)
 
+        idx, xmin, ymin, _, _, strideh, stridew = _roi_params(
+            bottom_rois, self.spatial_scale, self.outh, self.outw)
+        hstart, hend = _roi_pooling_bins(self.outh, strideh, height, ymin)
+        wstart, wend = _roi_pooling_bins(self.outw, stridew, width, xmin)
+        c_index = numpy.arange(channels)[:, None, None]
+        pw_index = numpy.arange(self.outw)
+
         for i_roi in six.moves.range(n_rois):
-            idx, xmin, ymin, xmax, ymax = bottom_rois[i_roi]
-            xmin = int(round(xmin * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            ymin = int(round(ymin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            roi_width = max(xmax - xmin + 1, 1)
-            roi_height = max(ymax - ymin + 1, 1)
-            strideh = 1. * roi_height / self.outh
-            stridew = 1. * roi_width / self.outw
-
-            for outh in six.moves.range(self.outh):
-                sliceh, lenh = _roi_pooling_slice(
-                    outh, strideh, height, ymin)
-                if sliceh.stop <= sliceh.start:
-                    continue
-                for outw in six.moves.range(self.outw):
-                    slicew, lenw = _roi_pooling_slice(
-                        outw, stridew, width, xmin)
-                    if slicew.stop <= slicew.start:
-                        continue
-                    roi_data = bottom_data[int(idx), :, sliceh, slicew]\
-                        .reshape(channels, -1)
-                    top_data[i_roi, :, outh, outw] =\
-                        numpy.max(roi_data, axis=1)
-
-                    # get the max idx respect to feature_maps coordinates
-                    max_idx_slice = numpy.unravel_index(
-                        numpy.argmax(roi_data, axis=1), (lenh, lenw))
-                    max_idx_slice_h = max_idx_slice[0] + sliceh.start
-                    max_idx_slice_w = max_idx_slice[1] + slicew.start
-                    max_idx_slice = max_idx_slice_h * width + max_idx_slice_w
-                    self.argmax_data[i_roi, :, outh, outw] = max_idx_slice
+            hs, he = hstart[i_roi], hend[i_roi]
+            ws, we = wstart[i_roi], wend[i_roi]
+            valid_h = hs < he
+            valid_w = ws < we
+            if not (valid_h.any() and valid_w.any()):
+                continue
+
+            # The maximum is taken over the width of each bin first, and then
+            # over the height. The argmax is the first one in the row-major
+            # order within each bin as in the bin-wise computation.
+            hlo = hs[valid_h].min()
+            hhi = he[valid_h].max()
+            rows = bottom_data[idx[i_roi], :, hlo:hhi]
+
+            kw = numpy.arange((we - ws).max())
+            w_index = ws[:, None] + kw
+            w_mask = w_index < we[:, None]
+            cols = rows[:, :, numpy.minimum(w_index, width - 1)]
+            cols[:, :, ~w_mask] = -numpy.inf
+            col_argmax = cols.argmax(axis=3)
+            col_max = cols.max(axis=3)
+
+            kh = numpy.arange((he - hs).max())
+            h_index = hs[:, None] + kh
+            h_mask = h_index < he[:, None]
+            h_index = numpy.clip(h_index - hlo, 0, hhi - hlo - 1)
+            bins = col_max[:, h_index]
+            bins[:, ~h_mask] = -numpy.inf
+            row_argmax = bins.argmax(axis=2)
+            top = bins.max(axis=2)
+
+            h_rel = numpy.clip(
+                hs[:, None] - hlo + row_argmax, 0, hhi - hlo - 1)
+            max_idx_h = h_rel + hlo
+            max_idx_w = ws + col_argmax[c_index, h_rel, pw_index]
+            max_idx = max_idx_h * width + max_idx_w
+
+            empty = ~(valid_h[:, None] & valid_w)
+            top[:, empty] = 0
+            max_idx[:, empty] = 0
+            top_data[i_roi] = top
+            self.argmax_data[i_roi] = max_idx
         return top_data,
 
     def forward_gpu(self, inputs):
@@ -194,42 +225,39 @@ class ROIPooling2D(function.Function):
     def backward_cpu(self, inputs, gy):
         bottom_rois = inputs[1]
         channels, height, width = self._bottom_data_shape[1:]
-        n_rois = bottom_rois.shape[0]
         bottom_delta = numpy.zeros(self._bottom_data_shape, numpy.float32)
 
-        for i_roi in six.moves.range(n_rois):
-            idx, xmin, ymin, xmax, ymax = bottom_rois[i_roi]
-            idx = int(idx)
-            xmin = int(round(xmin * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            ymin = int(round(ymin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            roi_width = max(xmax - xmin + 1, 1)
-            roi_height = max(ymax - ymin + 1, 1)
-
-            strideh = float(roi_height) / float(self.outh)
-            stridew = float(roi_width) / float(self.outw)
-
-            # iterate all the w, h (from feature map) that fall into this ROIs
-            for w in six.moves.range(xmin, xmax + 1):
-                for h in six.moves.range(ymin, ymax + 1):
-                    phstart = int(numpy.floor(float(h - ymin) / strideh))
-                    phend = int(numpy.ceil(float(h - ymin + 1) / strideh))
-                    pwstart = int(numpy.floor(float(w - xmin) / stridew))
-                    pwend = int(numpy.ceil(float(w - xmin + 1) / stridew))
-
-                    phstart = min(max(phstart, 0), self.outh)
-                    phend = min(max(phend, 0), self.outh)
-                    pwstart = min(max(pwstart, 0), self.outw)
-                    pwend = min(max(pwend, 0), self.outw)
-
-                    for ph in six.moves.range(phstart, phend):
-                        for pw in six.moves.range(pwstart, pwend):
-                            max_idx_tmp = self.argmax_data[i_roi, :, ph, pw]
-                            for c in six.moves.range(channels):
-                                if max_idx_tmp[c] == (h * width + w):
-                                    bottom_delta[idx, c, h, w] += \
-                                        gy[0][i_roi, c, ph, pw]
+        idx, xmin, ymin, xmax, ymax, strideh, stridew = _roi_params(
+            bottom_rois, self.spatial_scale, self.outh, self.outw)
+        idx = idx[:, None, None, None]
+        xmin = xmin[:, None, None, None]
+        xmax = xmax[:, None, None, None]
+        ymin = ymin[:, None, None, None]
+        ymax = ymax[:, None, None, None]
+        strideh = strideh[:, None, None, None]
+        stridew = stridew[:, None, None, None]
+
+        # Each output element propagates its gradient to the pooled element
+        # if the element falls into the RoI and the output bin is one of the
+        # bins that can pool the element.
+        h, w = numpy.divmod(self.argmax_data, width)
+        phstart = numpy.clip(
+            numpy.floor((h - ymin) / strideh), 0, self.outh)
+        phend = numpy.clip(
+            numpy.ceil((h - ymin + 1) / strideh), 0, self.outh)
+        pwstart = numpy.clip(
+            numpy.floor((w - xmin) / stridew), 0, self.outw)
+        pwend = numpy.clip(
+            numpy.ceil((w - xmin + 1) / stridew), 0, self.outw)
+        ph = numpy.arange(self.outh)[:, None]
+        pw = numpy.arange(self.outw)
+        mask = ((ymin <= h) & (h <= ymax) & (xmin <= w) & (w <= xmax) &
+                (phstart <= ph) & (ph < phend) &
+                (pwstart <= pw) & (pw < pwend))
+
+        i_roi, c = numpy.nonzero(mask)[:2]
+        numpy.add.at(bottom_delta, (idx[i_roi, 0, 0, 0], c, h[mask], w[mask]),
+                     gy[0][mask])
         return bottom_delta, None
 
     def backward_gpu(self, inputs, gy):
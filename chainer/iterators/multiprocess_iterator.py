@@ -1,4 +1,5 @@
 from __future__ import division
+import collections
 from collections import namedtuple
 import multiprocessing
 from multiprocessing import sharedctypes
@@ -10,6 +11,7 @@ import warnings
 import numpy
 import six
 
+from chainer.dataset import example_random
 from chainer.dataset import iterator
 
 
@@ -17,7 +19,7 @@ _response_time = 1.
 _short_time = 0.001
 _PrefetchState = namedtuple('_PrefetchState', (
     'current_position', 'epoch', 'is_new_epoch',
-    'previous_epoch_detail', 'order'))
+    'previous_epoch_detail', 'order', 'seed'))
 
 
 class MultiprocessIterator(iterator.Iterator):
@@ -30,11 +32,22 @@ class MultiprocessIterator(iterator.Iterator):
     processes in the standard way using pickle.
 
     Note that this iterator effectively prefetches the examples for the next
-    batch asynchronously after the current batch is returned.
+    batches asynchronously after the current batch is returned. Up to
+    ``n_prefetch`` batches are loaded at the same time, and each example is
+    sent to the workers as a separate task, so that the workers that have
+    finished their examples start on the following batches instead of waiting
+    for a slow example. The batches are returned in the same order
+    regardless.
 
     This iterator saves ``-1`` instead of ``None`` in snapshots since some
     serializers do not support ``None``.
 
+    Each example is loaded in :func:`~chainer.dataset.example_random_scope`
+    of the seed of the iterator, the epoch and the index of the example, so
+    :func:`~chainer.dataset.get_example_random_state` gives the same random
+    state to the example regardless of the number of processes. The seed is
+    saved in snapshots.
+
     Args:
         dataset (~chainer.dataset.Dataset): Dataset to iterate.
         batch_size (int): Number of examples within each batch.
@@ -45,16 +58,21 @@ class MultiprocessIterator(iterator.Iterator):
             order of indexes.
         n_processes (int): Number of worker processes. The number of CPUs is
             used by default.
-        n_prefetch (int): Number of prefetch batches.
+        n_prefetch (int): Number of prefetch batches, which is also the
+            number of batches loaded at the same time.
         shared_mem (int): The size of using shared memory per data.
-            If ``None``, size is adjusted automatically.
+            If ``None``, size is adjusted automatically. Shared memory of
+            ``n_prefetch * batch_size * shared_mem`` bytes is allocated.
+        seed (int): Seed of the random states of the examples. If ``None``,
+            it is drawn from :mod:`numpy.random`.
 
     """
 
     _interruption_testing = False  # for testing
 
     def __init__(self, dataset, batch_size, repeat=True, shuffle=True,
-                 n_processes=None, n_prefetch=1, shared_mem=None):
+                 n_processes=None, n_prefetch=1, shared_mem=None,
+                 seed=None):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -63,6 +81,9 @@ class MultiprocessIterator(iterator.Iterator):
         self.n_processes = n_processes or multiprocessing.cpu_count()
         self.n_prefetch = max(n_prefetch, 1)
         self.shared_mem = shared_mem
+        if seed is None:
+            seed = example_random.generate_seed()
+        self.seed = seed
 
         self._finalized = False
 
@@ -90,7 +111,8 @@ class MultiprocessIterator(iterator.Iterator):
             batch, prefetch_state = self._comm.get()
 
         (self.current_position, self.epoch, self.is_new_epoch,
-            self._previous_epoch_detail, self._order) = prefetch_state
+            self._previous_epoch_detail, self._order,
+            self.seed) = prefetch_state
         if batch is None:
             raise StopIteration
         else:
@@ -126,7 +148,7 @@ class MultiprocessIterator(iterator.Iterator):
     def __copy__(self):
         other = MultiprocessIterator(
             self.dataset, self.batch_size, self.repeat, self.shuffle,
-            self.n_processes, self.n_prefetch, self.shared_mem)
+            self.n_processes, self.n_prefetch, self.shared_mem, self.seed)
 
         other.current_position = self.current_position
         other.epoch = self.epoch
@@ -168,6 +190,11 @@ class MultiprocessIterator(iterator.Iterator):
                     self._previous_epoch_detail, 0.)
             else:
                 self._previous_epoch_detail = -1.
+        try:
+            self.seed = serializer('seed', self.seed)
+        except KeyError:
+            # snapshots of older versions do not have the seed
+            pass
         self._set_prefetch_state()
 
     def reset(self):
@@ -193,7 +220,8 @@ class MultiprocessIterator(iterator.Iterator):
             epoch=self.epoch,
             is_new_epoch=self.is_new_epoch,
             previous_epoch_detail=self._previous_epoch_detail,
-            order=self._order)
+            order=self._order,
+            seed=self.seed)
         self._comm.reset(prefetch_state)
 
 
@@ -274,11 +302,15 @@ class _PrefetchLoop(object):
         self.repeat = repeat
         self.shuffle = shuffle
         self.n_processes = n_processes
+        self.n_prefetch = n_prefetch
         self.mem_size = mem_size
         self.comm = comm
 
         self._allocate_shared_memory()
         self._pool = None
+        # Batches being loaded, in the order of the iteration
+        self._in_flight = collections.deque()
+        self._n_submitted = 0
 
         # Use a distinct RandomState in the thread
         # for deterministic random number generation.
@@ -298,11 +330,12 @@ class _PrefetchLoop(object):
         if status == _Communicator.STATUS_RESET:
             self.prefetch_state = prefetch_state
 
-        indices = self._proceed()
+        seed, epochs, indices = self._proceed()
         if indices is None:  # stop iteration
             batch = None
         else:
-            batch = [self.dataset[idx] for idx in indices]
+            batch = [_fetch(self.dataset, index, seed, epoch)
+                     for index, epoch in six.moves.zip(indices, epochs)]
             self.mem_size = max(map(_measure, batch))
             self._allocate_shared_memory()
 
@@ -312,8 +345,9 @@ class _PrefetchLoop(object):
         if self.measure_required():
             self.mem_bulk = None
         else:
-            self.mem_bulk = \
-                sharedctypes.RawArray('b', self.batch_size * self.mem_size)
+            # Each batch being loaded has its own region of the shared memory
+            self.mem_bulk = sharedctypes.RawArray(
+                'b', self.n_prefetch * self.batch_size * self.mem_size)
 
     def launch_thread(self):
         self._pool = multiprocessing.Pool(
@@ -346,11 +380,16 @@ class _PrefetchLoop(object):
         elif status == _Communicator.STATUS_TERMINATE:
             return False  # stop loop
 
-        indices = self._proceed()
-        if indices is None:  # stop iteration
+        # Keep n_prefetch batches in flight. Batches submitted before a reset
+        # are still waited for, since the workers may be writing to their
+        # shared memory, but they are discarded by the communicator.
+        while len(self._in_flight) < self.n_prefetch:
+            self._submit(reset_count)
+
+        future, prefetch_state, reset_count = self._in_flight.popleft()
+        if future is None:  # stop iteration
             batch = None
         else:
-            future = self._pool.map_async(_fetch_run, enumerate(indices))
             while True:
                 try:
                     data_all = future.get(_response_time)
@@ -362,16 +401,32 @@ class _PrefetchLoop(object):
 
             batch = [_unpack(data, self.mem_bulk) for data in data_all]
 
-        self.comm.put(batch, self.prefetch_state, reset_count)
+        self.comm.put(batch, prefetch_state, reset_count)
         return True
 
+    def _submit(self, reset_count):
+        seed, epochs, indices = self._proceed()
+        if indices is None:  # stop iteration
+            future = None
+        else:
+            # The batches in flight use distinct regions of the shared memory
+            # since they are finished in the order of submission.
+            offset = self._n_submitted % self.n_prefetch * self.batch_size
+            self._n_submitted += 1
+            # Each example is a separate task, so that idle workers can start
+            # on the examples of the next batch.
+            args = [(offset + i, index, seed, epoch) for i, (index, epoch)
+                    in enumerate(six.moves.zip(indices, epochs))]
+            future = self._pool.map_async(_fetch_run, args, chunksize=1)
+        self._in_flight.append((future, self.prefetch_state, reset_count))
+
     def _proceed(self):
         n = len(self.dataset)
         (pos, epoch, is_new_epoch,
-            previous_epoch_detail, order) = self.prefetch_state
+            previous_epoch_detail, order, seed) = self.prefetch_state
 
         if pos < self.batch_size and epoch > 0 and not self.repeat:
-            return None  # stop iteration
+            return seed, None, None  # stop iteration
 
         previous_epoch_detail = epoch + pos / n
 
@@ -381,6 +436,7 @@ class _PrefetchLoop(object):
                 indices = numpy.arange(pos, new_pos)
             else:
                 indices = order[pos:new_pos]
+            epochs = numpy.full(len(indices), epoch, dtype=numpy.int64)
             is_new_epoch = False
         else:
             new_pos = new_pos - n if self.repeat else 0
@@ -396,13 +452,17 @@ class _PrefetchLoop(object):
                     order = self._random.permutation(n)
                     indices = \
                         numpy.concatenate((indices, order[:new_pos]))
+            # The examples after the end of the dataset belong to the next
+            # epoch
+            epochs = numpy.full(len(indices), epoch + 1, dtype=numpy.int64)
+            epochs[:n - pos] = epoch
             epoch += 1
             is_new_epoch = True
 
         self.prefetch_state = _PrefetchState(
             new_pos, epoch, is_new_epoch,
-            previous_epoch_detail, order)
-        return indices
+            previous_epoch_detail, order, seed)
+        return seed, epochs, indices
 
 
 # Using `parametarized` funciton (e.g. bound method) with Pool is tricky due to
@@ -424,9 +484,14 @@ def _fetch_setup(dataset, mem_size, mem_bulk):
     _fetch_mem_bulk = mem_bulk
 
 
+def _fetch(dataset, index, seed, epoch):
+    with example_random.example_random_scope(seed, epoch, index):
+        return dataset[index]
+
+
 def _fetch_run(inputs):
-    i, index = inputs
-    data = _fetch_dataset[index]
+    i, index, seed, epoch = inputs
+    data = _fetch(_fetch_dataset, index, seed, epoch)
     if _fetch_mem_bulk is not None:
         offset = i * _fetch_mem_size
         limit = offset + _fetch_mem_size
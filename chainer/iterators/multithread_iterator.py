@@ -4,6 +4,7 @@ from multiprocessing import pool
 import numpy
 import six
 
+from chainer.dataset import example_random
 from chainer.dataset import iterator
 
 
@@ -21,6 +22,12 @@ class MultithreadIterator(iterator.Iterator):
     This iterator saves ``-1`` instead of ``None`` in snapshots since some
     serializers do not support ``None``.
 
+    Each example is loaded in :func:`~chainer.dataset.example_random_scope`
+    of the seed of the iterator, the epoch and the index of the example, so
+    :func:`~chainer.dataset.get_example_random_state` gives the same random
+    state to the example regardless of the number of threads. The seed is
+    saved in snapshots.
+
     Args:
         dataset (~chainer.dataset.Dataset): Dataset to iterate.
         batch_size (int): Number of examples within each batch.
@@ -30,11 +37,13 @@ class MultithreadIterator(iterator.Iterator):
             beginning of each epoch. Otherwise, examples are extracted in the
             order of indexes.
         n_threads (int): Number of worker threads.
+        seed (int): Seed of the random states of the examples. If ``None``,
+            it is drawn from :mod:`numpy.random`.
 
     """
 
     def __init__(self, dataset, batch_size, repeat=True, shuffle=True,
-                 n_threads=1):
+                 n_threads=1, seed=None):
         self.dataset = dataset
         self.batch_size = batch_size
         self._repeat = repeat
@@ -45,6 +54,9 @@ class MultithreadIterator(iterator.Iterator):
 
         self.n_threads = n_threads
         self._pool = None
+        if seed is None:
+            seed = example_random.generate_seed()
+        self.seed = seed
 
         self.reset()
 
@@ -104,12 +116,18 @@ class MultithreadIterator(iterator.Iterator):
         self._order = serializer('_order', self._order)
         self._previous_epoch_detail = serializer(
             'previous_epoch_detail', self._previous_epoch_detail)
+        try:
+            self.seed = serializer('seed', self.seed)
+        except KeyError:
+            # snapshots of older versions do not have the seed
+            pass
         self._next = None
 
     @staticmethod
     def _read(args):
-        dataset, index = args
-        return dataset[index]
+        dataset, index, seed, epoch = args
+        with example_random.example_random_scope(seed, epoch, index):
+            return dataset[index]
 
     def _invoke_prefetch(self):
         assert self._next is None
@@ -127,7 +145,7 @@ class MultithreadIterator(iterator.Iterator):
         is_new_epoch = False
         for _ in six.moves.range(self.batch_size):
             index = i if order is None else order[i]
-            args.append((dataset, index))
+            args.append((dataset, index, self.seed, epoch))
             i += 1
             if i >= n:
                 epoch += 1
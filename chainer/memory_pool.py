@@ -0,0 +1,253 @@
+import mmap
+import threading
+import weakref
+
+import numpy
+
+from chainer import configuration
+
+
+_PAGE_SIZE = mmap.PAGESIZE
+
+
+def _round_size(size):
+    # Size classes are multiples of the page size with four classes per
+    # doubling, so that at most a quarter of each block is wasted.
+    size = max(size, _PAGE_SIZE)
+    step = max(_PAGE_SIZE, 1 << (size.bit_length() - 3))
+    return (size + step - 1) // step * step
+
+
+class CPUMemoryPool(object):
+
+    """Memory pool for arrays on the host.
+
+    The pool holds memory blocks of size classes, and reuses the blocks of
+    arrays that have been freed for new arrays of the same size class. Each
+    block is a page-aligned anonymous memory map. When an array allocated
+    from the pool and all the views of it are released, its block goes back
+    to the pool instead of being returned to the system, so iterations of
+    training with fixed shapes reach a steady state in which no memory is
+    newly mapped nor page-faulted.
+
+    Arrays smaller than ``min_bytes`` are allocated by NumPy as usual, since
+    the system allocator already recycles small blocks efficiently.
+
+    The pool used by Chainer is returned by :func:`chainer.cpu_memory_pool`,
+    and is used when ``chainer.config.use_cpu_memory_pool`` is ``True``.
+
+    Args:
+        min_bytes (int): Minimum size in bytes of arrays allocated from the
+            pool.
+
+    """
+
+    def __init__(self, min_bytes=1 << 16):
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self._free = {}
+        # Weak references to the arrays using blocks with the blocks, keyed
+        # by their ids since arrays are not hashable. The references must be
+        # kept alive for their callbacks to be called.
+        self._blocks = {}
+        self._limit = None
+        self._used_bytes = 0
+        self._free_bytes = 0
+        self._peak_bytes = 0
+        self._n_allocs = 0
+        self._n_hits = 0
+
+    def empty(self, shape, dtype=numpy.float32):
+        """Returns a new C-contiguous array without initializing it.
+
+        Args:
+            shape (int or tuple of ints): Shape of the array.
+            dtype: Data type of the array.
+
+        Returns:
+            numpy.ndarray: A new array whose memory may be reused from the
+            pool.
+
+        """
+        dtype = numpy.dtype(dtype)
+        if isinstance(shape, int):
+            shape = shape,
+        size = int(numpy.prod(shape, dtype=numpy.int64))
+        nbytes = size * dtype.itemsize
+        if nbytes < self.min_bytes:
+            return numpy.empty(shape, dtype=dtype)
+
+        block, block_size = self._malloc(nbytes)
+        array = numpy.frombuffer(block, dtype=dtype, count=size)
+        # Views of the array refer to it as their base, so the block is
+        # returned when the array and all of its views are released. The
+        # callback of a weak reference is used instead of weakref.finalize,
+        # which is not available in Python 2.
+        ref = weakref.ref(array, self._release)
+        with self._lock:
+            self._blocks[id(ref)] = ref, block, block_size
+        return array.reshape(shape)
+
+    def zeros(self, shape, dtype=numpy.float32):
+        """Returns a new C-contiguous array filled with zeros.
+
+        Args:
+            shape (int or tuple of ints): Shape of the array.
+            dtype: Data type of the array.
+
+        Returns:
+            numpy.ndarray: A new array whose memory may be reused from the
+            pool.
+
+        """
+        array = self.empty(shape, dtype)
+        array.fill(0)
+        return array
+
+    def _malloc(self, nbytes):
+        block_size = _round_size(nbytes)
+        with self._lock:
+            self._n_allocs += 1
+            blocks = self._free.get(block_size)
+            if blocks:
+                block = blocks.pop()
+                self._n_hits += 1
+                self._free_bytes -= block_size
+            else:
+                block = None
+            self._used_bytes += block_size
+            total = self._used_bytes + self._free_bytes
+            if total > self._peak_bytes:
+                self._peak_bytes = total
+        if block is None:
+            block = mmap.mmap(-1, block_size)
+        return block, block_size
+
+    def _release(self, ref):
+        # Blocks are not closed explicitly since the buffer of the array may
+        # still be exported; a block is unmapped when it is no longer
+        # referenced.
+        with self._lock:
+            _, block, block_size = self._blocks.pop(id(ref))
+            self._used_bytes -= block_size
+            if self._limit is None or \
+                    self._free_bytes + block_size <= self._limit:
+                self._free.setdefault(block_size, []).append(block)
+                self._free_bytes += block_size
+
+    def free_all_blocks(self):
+        """Releases all cached blocks to the system."""
+        with self._lock:
+            self._free = {}
+            self._free_bytes = 0
+
+    def set_limit(self, size):
+        """Sets the upper limit of the bytes of cached blocks.
+
+        Blocks freed beyond the limit are returned to the system. Cached blocks
+        that exceed the new limit are released immediately.
+
+        Args:
+            size (int): Limit in bytes. ``None`` means no limit.
+
+        """
+        with self._lock:
+            self._limit = size
+            if size is not None:
+                for block_size in sorted(self._free, reverse=True):
+                    blocks = self._free[block_size]
+                    while blocks and self._free_bytes > size:
+                        blocks.pop()
+                        self._free_bytes -= block_size
+
+    def get_limit(self):
+        """Returns the upper limit of the bytes of cached blocks."""
+        return self._limit
+
+    def used_bytes(self):
+        """Returns the bytes of the blocks used by living arrays."""
+        return self._used_bytes
+
+    def free_bytes(self):
+        """Returns the bytes of the blocks cached in the pool."""
+        return self._free_bytes
+
+    def total_bytes(self):
+        """Returns the bytes of all blocks held by the pool."""
+        return self._used_bytes + self._free_bytes
+
+    def peak_bytes(self):
+        """Returns the maximum of :meth:`total_bytes` ever reached."""
+        return self._peak_bytes
+
+    def n_free_blocks(self):
+        """Returns the number of the blocks cached in the pool."""
+        return sum(len(blocks) for blocks in self._free.values())
+
+    def hit_rate(self):
+        """Returns the ratio of the allocations served by cached blocks."""
+        if self._n_allocs == 0:
+            return 0.
+        return float(self._n_hits) / self._n_allocs
+
+    def stats(self):
+        """Returns a dictionary of the statistics of the pool.
+
+        The dictionary contains ``'n_allocs'``, ``'n_hits'``, ``'hit_rate'``,
+        ``'used_bytes'``, ``'free_bytes'``, ``'total_bytes'`` and
+        ``'peak_bytes'``.
+
+        """
+        return {
+            'n_allocs': self._n_allocs,
+            'n_hits': self._n_hits,
+            'hit_rate': self.hit_rate(),
+            'used_bytes': self.used_bytes(),
+            'free_bytes': self.free_bytes(),
+            'total_bytes': self.total_bytes(),
+            'peak_bytes': self.peak_bytes(),
+        }
+
+    def reset_stats(self):
+        """Resets the counters of allocations and the peak bytes."""
+        with self._lock:
+            self._n_allocs = 0
+            self._n_hits = 0
+            self._peak_bytes = self._used_bytes + self._free_bytes
+
+
+_default_pool = CPUMemoryPool()
+
+
+def cpu_memory_pool():
+    """Returns the memory pool for arrays on the host used by Chainer.
+
+    Returns:
+        CPUMemoryPool: The default memory pool.
+
+    """
+    return _default_pool
+
+
+def empty(shape, dtype=numpy.float32):
+    """Allocates an array on the host for internal buffers of functions.
+
+    The array is allocated from the default :class:`CPUMemoryPool` if
+    ``chainer.config.use_cpu_memory_pool`` is ``True``, and by
+    :func:`numpy.empty` otherwise.
+
+    """
+    if configuration.config.use_cpu_memory_pool:
+        return _default_pool.empty(shape, dtype)
+    return numpy.empty(shape, dtype=dtype)
+
+
+def zeros(shape, dtype=numpy.float32):
+    """Allocates a zero-filled array on the host for internal buffers.
+
+    See :func:`empty` for the condition to use the memory pool.
+
+    """
+    if configuration.config.use_cpu_memory_pool:
+        return _default_pool.zeros(shape, dtype)
+    return numpy.zeros(shape, dtype=dtype)
@@ -7,6 +7,7 @@ import six
 
 from chainer import cuda
 from chainer import link as link_module
+from chainer import reporter as reporter_module
 from chainer import serializer as serializer_module
 from chainer import variable
 
@@ -522,24 +523,32 @@ class GradientMethod(Optimizer):
         The actual update routines are defined by the update rule of each
         parameter.
 
+        If ``chainer.config.report_time`` is ``True``, the time spent in the
+        loss function, the backward computation and the parameter update are
+        reported as ``time/forward``, ``time/backward`` and
+        ``time/optimizer``, respectively.
+
         """
         if lossfun is not None:
             use_cleargrads = getattr(self, '_use_cleargrads', True)
-            loss = lossfun(*args, **kwds)
+            with reporter_module.report_time('forward'):
+                loss = lossfun(*args, **kwds)
             if use_cleargrads:
                 self.target.cleargrads()
             else:
                 self.target.zerograds()
-            loss.backward()
+            with reporter_module.report_time('backward'):
+                loss.backward()
             del loss
 
-        self.reallocate_cleared_grads()
+        with reporter_module.report_time('optimizer'):
+            self.reallocate_cleared_grads()
 
-        self.call_hooks()
+            self.call_hooks()
 
-        self.t += 1
-        for param in self.target.params():
-            param.update()
+            self.t += 1
+            for param in self.target.params():
+                param.update()
 
     def use_cleargrads(self, use=True):
         """Enables or disables use of :func:`~chainer.Link.cleargrads` in `update`.
@@ -1,6 +1,8 @@
-import collections
 import contextlib
 import copy
+import os
+import threading
+import time
 
 import numpy
 import six
@@ -10,10 +12,14 @@ from chainer import cuda
 from chainer import variable
 
 
-def _copy_variable(value):
-    if isinstance(value, variable.Variable):
-        return copy.copy(value)
-    return value
+# Select the best-resolution timer function
+try:
+    _get_time = time.perf_counter
+except AttributeError:
+    if os.name == 'nt':
+        _get_time = time.clock
+    else:
+        _get_time = time.time
 
 
 class Reporter(object):
@@ -71,11 +77,11 @@ class Reporter(object):
 
     def __enter__(self):
         """Makes this reporter object current."""
-        _reporters.append(self)
+        _get_reporters().append(self)
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Recovers the previous reporter object to the current."""
-        _reporters.pop()
+        _get_reporters().pop()
 
     @contextlib.contextmanager
     def scope(self, observation):
@@ -141,6 +147,11 @@ class Reporter(object):
            observer. This behavior can be changed by setting
            ``chainer.config.keep_graph_on_report`` to ``True``.
 
+        .. note::
+           The reported arrays are stored without being copied. They must not
+           be modified in place while the observation is in use, e.g. until it
+           is added to a :class:`DictSummary`.
+
         Args:
             values (dict): Dictionary of observed values.
             observer: Observer object. Its object ID is used to retrieve the
@@ -148,28 +159,44 @@ class Reporter(object):
                 name of the observed value.
 
         """
-        if not configuration.config.keep_graph_on_report:
-            values = {k: _copy_variable(v) for k, v in six.iteritems(values)}
-
         if observer is not None:
             observer_id = id(observer)
             if observer_id not in self._observer_names:
                 raise KeyError(
                     'Given observer is not registered to the reporter.')
             observer_name = self._observer_names[observer_id]
-            for key, value in six.iteritems(values):
-                name = '%s/%s' % (observer_name, key)
-                self.observation[name] = value
         else:
-            self.observation.update(values)
+            observer_name = None
+
+        observation = self.observation
+        keep_graph = configuration.config.keep_graph_on_report
+        for key, value in six.iteritems(values):
+            if not keep_graph and isinstance(value, variable.Variable):
+                value = copy.copy(value)
+            if observer_name is not None:
+                key = '%s/%s' % (observer_name, key)
+            observation[key] = value
 
 
 _reporters = []
+_thread_local = threading.local()
+
+
+def _get_reporters():
+    # Threads share the stack of reporters by default, so that values reported
+    # in worker threads (e.g. of ParallelUpdater) reach the current reporter.
+    return getattr(_thread_local, 'reporters', _reporters)
+
+
+def _use_thread_local_reporters():
+    # Gives the calling thread its own stack of reporters, which isolates the
+    # values reported in the thread from the reporters of other threads.
+    _thread_local.reporters = []
 
 
 def get_current_reporter():
     """Returns the current reporter object."""
-    return _reporters[-1]
+    return _get_reporters()[-1]
 
 
 def report(values, observer=None):
@@ -220,8 +247,9 @@ def report(values, observer=None):
             of the observed value.
 
     """
-    if _reporters:
-        current = _reporters[-1]
+    reporters = _get_reporters()
+    if reporters:
+        current = reporters[-1]
         current.report(values, observer)
 
 
@@ -233,13 +261,84 @@ def report_scope(observation):
     except that it does not make the reporter current redundantly.
 
     """
-    current = _reporters[-1]
+    current = _get_reporters()[-1]
     old = current.observation
     current.observation = observation
     yield
     current.observation = old
 
 
+class _NullTimeSpan(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_null_time_span = _NullTimeSpan()
+
+
+class _TimeSpan(object):
+
+    def __init__(self, reporter, name):
+        self._reporter = reporter
+        self._name = name
+
+    def __enter__(self):
+        self._start = _get_time()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = _get_time() - self._start
+        if exc_type is not None:
+            return
+        observation = self._reporter.observation
+        observation[self._name] = observation.get(self._name, 0) + elapsed
+
+
+def report_time(name):
+    """Returns a context manager that reports the elapsed time of its block.
+
+    The wall-clock time spent in the ``with`` block is written to the
+    observation of the current reporter by the name ``'time/<name>'``. If the
+    same name is measured more than once in one observation scope, the
+    durations are summed up.
+
+    Time measurement is enabled only if ``chainer.config.report_time`` is
+    ``True`` and a reporter is current. Otherwise, this function returns a
+    context manager that does nothing, so the overhead of instrumented code
+    is negligible by default.
+
+    .. admonition:: Example
+
+       >>> from chainer import Reporter, report_time, using_config
+       >>>
+       >>> reporter = Reporter()
+       >>> observation = {}
+       >>> with using_config('report_time', True):
+       ...     with reporter.scope(observation):
+       ...         with report_time('sleep'):
+       ...             pass
+       ...
+       >>> list(observation.keys())
+       ['time/sleep']
+
+    .. note::
+       The time of GPU computations is measured without synchronizing the
+       device, i.e., the reported value only covers the time needed to
+       launch the kernels unless the block waits for their completion.
+
+    Args:
+        name (str): Name of the measured span. It is prefixed by ``'time/'``.
+
+    """
+    reporters = _get_reporters()
+    if not reporters or not configuration.config.report_time:
+        return _null_time_span
+    return _TimeSpan(reporters[-1], 'time/' + name)
+
+
 def _get_device(x):
     if numpy.isscalar(x):
         return cuda.DummyDevice
@@ -251,34 +350,147 @@ class Summary(object):
 
     """Online summarization of a sequence of scalars.
 
-    Summary computes the statistics of given scalars online.
+    Summary computes the statistics of given scalars online. The added values
+    are just buffered, and they are reduced chunk by chunk, i.e., when
+    ``chunk_size`` values are accumulated or when the statistics are
+    requested. An added array is copied so that later in-place updates of it
+    do not change the statistics, but adding a value neither switches the
+    device nor synchronizes it, and values on a GPU are not transferred to
+    the host until the statistics are used.
+
+    Besides the mean and standard deviation, the minimum and maximum values
+    are computed at the reduction. The percentiles are available if
+    ``keep_values`` is ``True``, in which case all the added values are kept.
+
+    Args:
+        chunk_size (int): Number of values buffered before they are reduced.
+        keep_values (bool): If ``True``, the added values are kept to compute
+            the percentiles.
 
     """
 
-    def __init__(self):
+    def __init__(self, chunk_size=256, keep_values=False):
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        self._chunk_size = chunk_size
+        self._keep_values = keep_values
+        self._values = []
+        self._chunks = []
         self._x = 0
         self._x2 = 0
         self._n = 0
+        self._min = None
+        self._max = None
 
     def add(self, value):
         """Adds a scalar value.
 
         Args:
             value: Scalar value to accumulate. It is either a NumPy scalar or
-                a zero-dimensional array (on CPU or GPU).
+                a zero-dimensional array (on CPU or GPU). An array is copied
+                as it is reduced later.
+
+        """
+        if isinstance(value, (numpy.ndarray, cuda.ndarray)):
+            value = value.copy()
+        values = self._values
+        values.append(value)
+        if len(values) >= self._chunk_size:
+            self._reduce()
+
+    def _reduce(self):
+        values = self._values
+        if not values:
+            return
+        self._values = []
+        with _get_device(values[0]):
+            xp = cuda.get_array_module(values[0])
+            if xp is numpy:
+                chunk = numpy.asarray(values)
+            else:
+                chunk = xp.stack(values)
+            self._x += chunk.sum()
+            self._x2 += (chunk * chunk).sum()
+            self._n += len(values)
+            chunk_min = chunk.min()
+            chunk_max = chunk.max()
+            if self._min is None:
+                self._min, self._max = chunk_min, chunk_max
+            else:
+                self._min = xp.minimum(self._min, chunk_min)
+                self._max = xp.maximum(self._max, chunk_max)
+        if self._keep_values:
+            self._chunks.append(chunk)
+
+    def merge(self, other):
+        """Merges the statistics of another summary into this summary.
+
+        The merged summary is equivalent to the one to which all the values
+        added to both summaries are added, except for the order of the
+        floating point additions. The values of ``other`` are kept for the
+        percentiles only if both summaries keep values.
+
+        Args:
+            other (Summary): Summary to merge.
 
         """
-        with _get_device(value):
-            self._x += value
-            self._x2 += value * value
-            self._n += 1
+        self._reduce()
+        other._reduce()
+        if other._n == 0:
+            return
+        with _get_device(other._x):
+            self._x += other._x
+            self._x2 += other._x2
+            self._n += other._n
+            if self._min is None:
+                self._min, self._max = other._min, other._max
+            else:
+                xp = cuda.get_array_module(other._min)
+                self._min = xp.minimum(self._min, other._min)
+                self._max = xp.maximum(self._max, other._max)
+        if self._keep_values:
+            self._chunks.extend(other._chunks)
 
     def compute_mean(self):
         """Computes the mean."""
+        self._reduce()
         x, n = self._x, self._n
         with _get_device(x):
             return x / n
 
+    def compute_min(self):
+        """Computes the minimum value."""
+        self._reduce()
+        return self._min
+
+    def compute_max(self):
+        """Computes the maximum value."""
+        self._reduce()
+        return self._max
+
+    def compute_percentiles(self, q):
+        """Computes the percentiles of the added values.
+
+        This method is available only if the summary keeps the values.
+
+        Args:
+            q (float or sequence of floats): Percentiles to compute, which
+                must be between 0 and 100.
+
+        Returns:
+            Percentiles of the added values, each of which corresponds to an
+            element of ``q``.
+
+        """
+        if not self._keep_values:
+            raise RuntimeError(
+                'Percentiles are available only if keep_values is True')
+        self._reduce()
+        chunks = self._chunks
+        with _get_device(chunks[0]):
+            xp = cuda.get_array_module(chunks[0])
+            return xp.percentile(xp.concatenate(chunks), q)
+
     def make_statistics(self):
         """Computes and returns the mean and standard deviation values.
 
@@ -286,6 +498,7 @@ class Summary(object):
             tuple: Mean and standard deviation values.
 
         """
+        self._reduce()
         x, n = self._x, self._n
         xp = cuda.get_array_module(x)
         with _get_device(x):
@@ -295,18 +508,57 @@ class Summary(object):
             return mean, std
 
 
+# Whether the values of each type are accumulated by DictSummary. Arrays are
+# accumulated only if they are zero-dimensional, which is marked by None.
+_summarized_types = {}
+
+
+def _is_summarized(value):
+    t = type(value)
+    summarized = _summarized_types.get(t, False)
+    if summarized is False and t not in _summarized_types:
+        if numpy.isscalar(value):
+            summarized = True
+        elif hasattr(value, 'ndim'):
+            summarized = None
+        _summarized_types[t] = summarized
+    if summarized is None:
+        return value.ndim == 0
+    return summarized
+
+
 class DictSummary(object):
 
     """Online summarization of a sequence of dictionaries.
 
     ``DictSummary`` computes the statistics of a given set of scalars online.
     It only computes the statistics for scalar values and variables of scalar
-    values in the dictionaries.
+    values in the dictionaries. Each entry is summarized by :class:`Summary`,
+    so the values are reduced lazily in chunks.
+
+    Args:
+        chunk_size (int): Number of values of each entry buffered before they
+            are reduced.
+        min_max (bool): If ``True``, :meth:`make_statistics` also computes the
+            minimum and maximum values of each entry.
+        percentiles (sequence of floats): Percentiles that
+            :meth:`make_statistics` computes for each entry. If it is not
+            empty, all the values are kept until the summary is discarded.
 
     """
 
-    def __init__(self):
-        self._summaries = collections.defaultdict(Summary)
+    def __init__(self, chunk_size=256, min_max=False, percentiles=()):
+        self._chunk_size = chunk_size
+        self._min_max = min_max
+        self._percentiles = tuple(percentiles)
+        self._summaries = {}
+
+    def _get_summary(self, key):
+        summary = self._summaries.get(key)
+        if summary is None:
+            summary = Summary(self._chunk_size, bool(self._percentiles))
+            self._summaries[key] = summary
+        return summary
 
     def add(self, d):
         """Adds a dictionary of scalars.
@@ -321,8 +573,25 @@ class DictSummary(object):
         for k, v in six.iteritems(d):
             if isinstance(v, variable.Variable):
                 v = v.data
-            if numpy.isscalar(v) or getattr(v, 'ndim', -1) == 0:
-                summaries[k].add(v)
+            if _is_summarized(v):
+                summary = summaries.get(k)
+                if summary is None:
+                    summary = self._get_summary(k)
+                summary.add(v)
+
+    def merge(self, other):
+        """Merges the statistics of another summary into this summary.
+
+        Each entry of ``other`` is merged by :meth:`Summary.merge`. It can be
+        used to combine the summaries computed on parts of a dataset, e.g. in
+        separate processes.
+
+        Args:
+            other (DictSummary): Summary to merge.
+
+        """
+        for k, summary in six.iteritems(other._summaries):
+            self._get_summary(k).merge(summary)
 
     def compute_mean(self):
         """Creates a dictionary of mean values.
@@ -343,7 +612,10 @@ class DictSummary(object):
         It returns a single dictionary that holds mean and standard deviation
         values for every entry added to the summary. For an entry of name
         ``'key'``, these values are added to the dictionary by names ``'key'``
-        and ``'key.std'``, respectively.
+        and ``'key.std'``, respectively. If ``min_max`` is ``True``, the
+        minimum and maximum values are added by names ``'key.min'`` and
+        ``'key.max'``, and the ``q``-th percentile for each ``q`` in
+        ``percentiles`` is added by name ``'key.p<q>'``, e.g. ``'key.p50'``.
 
         Returns:
             dict: Dictionary of statistics of all entries.
@@ -354,5 +626,12 @@ class DictSummary(object):
             mean, std = summary.make_statistics()
             stats[name] = mean
             stats[name + '.std'] = std
+            if self._min_max:
+                stats[name + '.min'] = summary.compute_min()
+                stats[name + '.max'] = summary.compute_max()
+            if self._percentiles:
+                values = summary.compute_percentiles(self._percentiles)
+                for q, value in zip(self._percentiles, values):
+                    stats['%s.p%g' % (name, q)] = value
 
         return stats
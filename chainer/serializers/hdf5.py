@@ -29,7 +29,10 @@ class HDF5Serializer(serializer.Serializer):
 
     Args:
         group (h5py.Group): The group that this serializer represents.
-        compression (int): Gzip compression level.
+        compression (int or str): Compression filter of the datasets. An
+            integer from ``0`` to ``9`` is the gzip compression level,
+            ``'lzf'`` selects the fast LZF filter bundled with h5py, and
+            ``None`` disables the compression.
 
     """
 
@@ -72,7 +75,8 @@ def save_hdf5(filename, obj, compression=4):
     Args:
         filename (str): Target file name.
         obj: Object to be serialized. It must support serialization protocol.
-        compression (int): Gzip compression level.
+        compression (int or str): Compression filter of the datasets. See
+            :class:`HDF5Serializer` for the choices.
 
     .. note::
         Currently :func:`save_hdf5` only supports writing to an actual file on
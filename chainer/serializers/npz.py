@@ -1,9 +1,13 @@
-import numpy
+import io
+import struct
+import zlib
 
+import numpy
 import six
 
 from chainer import cuda
 from chainer import serializer
+from chainer.utils import thread_pool
 
 
 class DictionarySerializer(serializer.Serializer):
@@ -53,29 +57,152 @@ class DictionarySerializer(serializer.Serializer):
         return ret
 
 
+# Fields of the zip format used to write NPZ files. See the specification
+# of the format (APPNOTE.TXT) by PKWARE for details.
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP64_LIMIT = (1 << 31) - 1
+_ZIP_FILECOUNT_LIMIT = 0xffff
+_ZIP_VERSION = 20
+_ZIP64_VERSION = 45
+_ZIP_SYSTEM_UNIX = 3
+# The entries are stamped with 1980-01-01 00:00:00 as numpy.savez does.
+_ZIP_DOSDATE = 1 << 5 | 1
+_ZIP_DOSTIME = 0
+
+
+def _get_compression_level(compression):
+    if compression is True:
+        return zlib.Z_DEFAULT_COMPRESSION
+    if not compression:
+        return None
+    if not 1 <= compression <= 9:
+        raise ValueError(
+            'compression must be a bool or a compression level between 1 '
+            'and 9: {}'.format(compression))
+    return compression
+
+
+def _encode_npy(item, level):
+    # Makes a zip entry of an array in NPY format. It is called in worker
+    # threads; zlib releases the GIL while compressing and checksumming.
+    key, arr = item
+    f = io.BytesIO()
+    numpy.lib.format.write_array(f, numpy.asanyarray(arr))
+    data = f.getvalue()
+    crc = zlib.crc32(data) & 0xffffffff
+    size = len(data)
+    if level is None:
+        method = _ZIP_STORED
+    else:
+        method = _ZIP_DEFLATED
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    return (key + '.npy').encode('utf-8'), method, crc, size, data
+
+
+def _zip64_field(value, limit, mask):
+    # Value of a field that is moved to the zip64 records if it exceeds the
+    # limit.
+    return mask if value >= limit else value
+
+
+def _write_npz(file, target, level):
+    # Writes a zip archive whose entries are compressed in the thread pool.
+    # numpy.savez compresses them one by one through zipfile, which cannot
+    # write entries compressed beforehand.
+    items = sorted(six.iteritems(target))
+    entries = thread_pool.imap(lambda item: _encode_npy(item, level), items)
+    directory = []
+    offset = 0
+    for name, method, crc, size, data in entries:
+        zip64 = size >= _ZIP64_LIMIT or len(data) >= _ZIP64_LIMIT
+        if zip64:
+            extra = struct.pack('<2H2Q', 1, 16, size, len(data))
+            compress_size = file_size = 0xffffffff
+        else:
+            extra = b''
+            compress_size, file_size = len(data), size
+        header = struct.pack(
+            '<4s5H3L2H', b'PK\x03\x04',
+            _ZIP64_VERSION if zip64 else _ZIP_VERSION, 1 << 11, method,
+            _ZIP_DOSTIME, _ZIP_DOSDATE, crc, compress_size, file_size,
+            len(name), len(extra))
+        file.write(header + name + extra)
+        file.write(data)
+        directory.append((name, method, crc, size, len(data), offset))
+        offset += len(header) + len(name) + len(extra) + len(data)
+
+    start = offset
+    for name, method, crc, size, compress_size, header_offset in directory:
+        zip64_fields = [value for value in (size, compress_size, header_offset)
+                        if value >= _ZIP64_LIMIT]
+        if zip64_fields:
+            extra = struct.pack('<2H%dQ' % len(zip64_fields), 1,
+                                8 * len(zip64_fields), *zip64_fields)
+            version = _ZIP64_VERSION
+        else:
+            extra = b''
+            version = _ZIP_VERSION
+        record = struct.pack(
+            '<4s6H3L5H2L', b'PK\x01\x02', _ZIP_SYSTEM_UNIX << 8 | version,
+            version, 1 << 11, method, _ZIP_DOSTIME, _ZIP_DOSDATE, crc,
+            _zip64_field(compress_size, _ZIP64_LIMIT, 0xffffffff),
+            _zip64_field(size, _ZIP64_LIMIT, 0xffffffff),
+            len(name), len(extra), 0, 0, 0, 0o600 << 16,
+            _zip64_field(header_offset, _ZIP64_LIMIT, 0xffffffff))
+        file.write(record + name + extra)
+        offset += len(record) + len(name) + len(extra)
+
+    count = len(directory)
+    size = offset - start
+    if (count > _ZIP_FILECOUNT_LIMIT or size >= _ZIP64_LIMIT or
+            start >= _ZIP64_LIMIT):
+        # Zip64 end of central directory record and its locator
+        file.write(struct.pack(
+            '<4sQ2H2L4Q', b'PK\x06\x06', 44, _ZIP64_VERSION,
+            _ZIP64_VERSION, 0, 0, count, count, size, start))
+        file.write(struct.pack('<4sLQL', b'PK\x06\x07', 0, offset, 1))
+    count = _zip64_field(count, _ZIP_FILECOUNT_LIMIT + 1, 0xffff)
+    file.write(struct.pack(
+        '<4s4H2LH', b'PK\x05\x06', 0, 0, count, count,
+        _zip64_field(size, _ZIP64_LIMIT, 0xffffffff),
+        _zip64_field(start, _ZIP64_LIMIT, 0xffffffff), 0))
+
+
 def save_npz(file, obj, compression=True):
     """Saves an object to the file in NPZ format.
 
     This is a short-cut function to save only one object into an NPZ file.
 
+    If ``chainer.config.cpu_threads`` is not ``1``, the arrays are
+    compressed in parallel by the configured number of threads. The
+    resulting file is in the same format as the one written by
+    :func:`numpy.savez_compressed` (or :func:`numpy.savez` if the
+    compression is disabled).
+
     Args:
         file (str or file-like): Target file to write to.
         obj: Object to be serialized. It must support serialization protocol.
-        compression (bool): If ``True``, compression in the resulting zip file
-            is enabled.
+        compression (bool or int): If ``True``, compression in the resulting
+            zip file is enabled with the default level of zlib. An integer
+            from ``1`` to ``9`` specifies the compression level instead,
+            where ``1`` is the fastest and ``9`` gives the smallest file.
+            If ``False`` or ``0``, the arrays are stored without
+            compression.
 
     .. seealso::
         :func:`chainer.serializers.load_npz`
 
     """
+    level = _get_compression_level(compression)
     s = DictionarySerializer()
     s.save(obj)
     if isinstance(file, six.string_types):
-        file = open(file, 'wb')
-    if compression:
-        numpy.savez_compressed(file, **s.target)
+        with open(file, 'wb') as f:
+            _write_npz(f, s.target, level)
     else:
-        numpy.savez(file, **s.target)
+        _write_npz(file, s.target, level)
 
 
 class NpzDeserializer(serializer.Deserializer):
@@ -162,6 +289,33 @@ class NpzDeserializer(serializer.Deserializer):
         return value
 
 
+class _PrefetchedNpz(object):
+
+    # NPZ file whose arrays under the given path are read and decompressed
+    # in parallel beforehand. The errors of reading an array are raised when
+    # the array is accessed, as NpzFile does.
+
+    def __init__(self, npz, path):
+        self._npz = npz
+        keys = [key for key in npz.files if key.startswith(path)]
+        self._arrays = dict(zip(keys, thread_pool.imap(self._read, keys)))
+
+    def _read(self, key):
+        try:
+            return self._npz[key]
+        except Exception:
+            return None
+
+    def __contains__(self, key):
+        return key in self._npz
+
+    def __getitem__(self, key):
+        arr = self._arrays.get(key)
+        if arr is None:
+            return self._npz[key]
+        return arr
+
+
 def load_npz(file, obj, path='', strict=True):
     """Loads an object from the file in NPZ format.
 
@@ -178,10 +332,18 @@ def load_npz(file, obj, path='', strict=True):
             expected value is not found in the given NPZ file. Otherwise,
             it ignores the value and skip deserialization.
 
+    If ``chainer.config.cpu_threads`` is not ``1``, all the arrays in the
+    file are read and decompressed in parallel before the deserialization,
+    which requires memory to hold all of them at once.
+
     .. seealso::
         :func:`chainer.serializers.save_npz`
 
     """
     with numpy.load(file) as f:
-        d = NpzDeserializer(f, path=path, strict=strict)
+        npz = f
+        if thread_pool.get_num_threads() > 1 and not six.PY2:
+            # Members of a zip file cannot be read concurrently on Python 2.
+            npz = _PrefetchedNpz(f, path)
+        d = NpzDeserializer(npz, path=path, strict=strict)
         d.load(obj)
@@ -16,6 +16,7 @@ from chainer.training.extensions import value_observation  # NOQA
 from chainer.training.extensions._snapshot import snapshot  # NOQA
 from chainer.training.extensions._snapshot import snapshot_object  # NOQA
 from chainer.training.extensions.computational_graph import dump_graph  # NOQA
+from chainer.training.extensions.evaluator import AsyncEvaluator  # NOQA
 from chainer.training.extensions.evaluator import Evaluator  # NOQA
 from chainer.training.extensions.exponential_shift import ExponentialShift  # NOQA
 from chainer.training.extensions.linear_shift import LinearShift  # NOQA
@@ -1,14 +1,23 @@
 import copy
+import multiprocessing
+import sys
+import threading
+import traceback
 
 import six
 
 from chainer import configuration
+from chainer import cuda
 from chainer.dataset import convert
 from chainer.dataset import iterator as iterator_module
+from chainer.datasets import sub_dataset
 from chainer import function
+from chainer import iterators
 from chainer import link
 from chainer import reporter as reporter_module
 from chainer.training import extension
+from chainer.training import trigger as trigger_module
+from chainer.training.triggers import interval_trigger
 
 
 class Evaluator(extension.Extension):
@@ -42,6 +51,22 @@ class Evaluator(extension.Extension):
     evaluation. In both cases, the functions are called in testing mode
     (i.e., ``chainer.config.train`` is set to ``False``).
 
+    The evaluation can be parallelized on CPU by ``n_processes``. The
+    dataset of the iterator is split into ``n_processes`` contiguous shards
+    at the boundaries of the minibatches, each of which is evaluated by a
+    worker process with a copy of the target links. The workers are started
+    at each evaluation, so they evaluate the current parameters; they are
+    forked on Unix and see the parameters without any transfer. The
+    statistics of the values reported by the workers are merged by
+    :meth:`DictSummary.merge <chainer.DictSummary.merge>`, so the result is
+    the mean over the same minibatches as in the sequential evaluation. The
+    evaluator can also be called without a trainer to score a large dataset
+    in parallel::
+
+       evaluator = extensions.Evaluator(iterator, model, n_processes=8)
+       with chainer.Reporter():
+           result = evaluator()
+
     This extension is called at the end of each epoch by default.
 
     Args:
@@ -59,12 +84,17 @@ class Evaluator(extension.Extension):
             object is passed at each call.
         eval_func: Evaluation function called at each iteration. The target
             link to evaluate as a callable is used by default.
+        n_processes (int): Number of worker processes to evaluate the dataset
+            in parallel. If it is ``None``, the dataset is evaluated in this
+            process. The parallel evaluation requires the iterator to have
+            ``dataset`` and ``batch_size`` attributes, and runs on CPU.
 
     Attributes:
         converter: Converter function.
         device: Device to which the training data is sent.
         eval_hook: Function to prepare for each evaluation process.
         eval_func: Evaluation function called at each iteration.
+        n_processes (int): Number of worker processes.
 
     """
     trigger = 1, 'epoch'
@@ -72,7 +102,14 @@ class Evaluator(extension.Extension):
     priority = extension.PRIORITY_WRITER
 
     def __init__(self, iterator, target, converter=convert.concat_examples,
-                 device=None, eval_hook=None, eval_func=None):
+                 device=None, eval_hook=None, eval_func=None,
+                 n_processes=None):
+        if n_processes is not None:
+            if n_processes < 1:
+                raise ValueError('n_processes must be a positive integer')
+            if device is not None and device >= 0:
+                raise ValueError(
+                    'parallel evaluation is not supported on GPU')
         if isinstance(iterator, iterator_module.Iterator):
             iterator = {'main': iterator}
         self._iterators = iterator
@@ -85,6 +122,7 @@ class Evaluator(extension.Extension):
         self.device = device
         self.eval_hook = eval_hook
         self.eval_func = eval_func
+        self.n_processes = n_processes
 
     def get_iterator(self, name):
         """Returns the iterator of the given name."""
@@ -121,7 +159,15 @@ class Evaluator(extension.Extension):
             reported by the evaluation function.
 
         """
-        # set up a reporter
+        reporter = self._make_reporter()
+        with reporter:
+            with configuration.using_config('train', False):
+                result = self.evaluate()
+
+        reporter_module.report(result)
+        return result
+
+    def _make_reporter(self):
         reporter = reporter_module.Reporter()
         if hasattr(self, 'name'):
             prefix = self.name + '/'
@@ -131,13 +177,7 @@ class Evaluator(extension.Extension):
             reporter.add_observer(prefix + name, target)
             reporter.add_observers(prefix + name,
                                    target.namedlinks(skipself=True))
-
-        with reporter:
-            with configuration.using_config('train', False):
-                result = self.evaluate()
-
-        reporter_module.report(result)
-        return result
+        return reporter
 
     def evaluate(self):
         """Evaluates the model and returns a result dictionary.
@@ -167,6 +207,10 @@ class Evaluator(extension.Extension):
         if self.eval_hook:
             self.eval_hook(self)
 
+        if self.n_processes is not None:
+            summary = self._evaluate_parallel(iterator, eval_func)
+            return summary.compute_mean()
+
         if hasattr(iterator, 'reset'):
             iterator.reset()
             it = iterator
@@ -174,7 +218,10 @@ class Evaluator(extension.Extension):
             it = copy.copy(iterator)
 
         summary = reporter_module.DictSummary()
+        self._evaluate_batches(it, eval_func, summary)
+        return summary.compute_mean()
 
+    def _evaluate_batches(self, it, eval_func, summary):
         for batch in it:
             observation = {}
             with reporter_module.report_scope(observation):
@@ -189,4 +236,229 @@ class Evaluator(extension.Extension):
 
             summary.add(observation)
 
-        return summary.compute_mean()
+    def _evaluate_parallel(self, iterator, eval_func):
+        if not (hasattr(iterator, 'dataset') and
+                hasattr(iterator, 'batch_size')):
+            raise ValueError(
+                'parallel evaluation requires an iterator with dataset and '
+                'batch_size attributes')
+        dataset = iterator.dataset
+        batch_size = iterator.batch_size
+
+        # The shards are split at the boundaries of the minibatches, so that
+        # the workers evaluate the same minibatches as the sequential
+        # evaluation. The numbers of minibatches differ at most by one.
+        n_batches = -(-len(dataset) // batch_size)
+        n = max(min(self.n_processes, n_batches), 1)
+        bounds = [min(n_batches * i // n * batch_size, len(dataset))
+                  for i in six.moves.range(n + 1)]
+        workers = []
+        try:
+            for start, finish in six.moves.zip(bounds[:-1], bounds[1:]):
+                shard = sub_dataset.SubDataset(dataset, start, finish)
+                it = iterators.SerialIterator(
+                    shard, batch_size, repeat=False, shuffle=False)
+                receiver, sender = multiprocessing.Pipe(False)
+                process = multiprocessing.Process(
+                    target=_evaluate_shard,
+                    args=(self, eval_func, it, sender))
+                process.daemon = True
+                process.start()
+                sender.close()
+                workers.append((process, receiver))
+
+            summary = reporter_module.DictSummary()
+            for process, receiver in workers:
+                try:
+                    ok, value = receiver.recv()
+                except EOFError:
+                    raise RuntimeError(
+                        'worker process of evaluation exited unexpectedly '
+                        '(exit code: {})'.format(process.exitcode))
+                if not ok:
+                    raise RuntimeError(
+                        'evaluation failed in a worker process:\n' + value)
+                summary.merge(value)
+        finally:
+            for process, receiver in workers:
+                receiver.close()
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+        return summary
+
+
+def _evaluate_shard(evaluator, eval_func, it, sender):
+    # Runs in a worker process of Evaluator with its own reporter, which
+    # observes the targets in the same way as the evaluator in the parent.
+    try:
+        summary = reporter_module.DictSummary()
+        with evaluator._make_reporter():
+            with configuration.using_config('train', False):
+                evaluator._evaluate_batches(it, eval_func, summary)
+        sender.send((True, summary))
+    except Exception:
+        sender.send((False, traceback.format_exc()))
+    finally:
+        sender.close()
+
+
+def _is_last_iteration(trainer):
+    # Only the interval trigger can tell whether the training stops after
+    # this iteration without changing its state.
+    stop_trigger = trainer.stop_trigger
+    if not isinstance(stop_trigger, interval_trigger.IntervalTrigger):
+        return False
+    updater = trainer.updater
+    if stop_trigger.unit == 'iteration':
+        return updater.iteration >= stop_trigger.period
+    return updater.epoch_detail >= stop_trigger.period
+
+
+class AsyncEvaluator(Evaluator):
+
+    """Trainer extension to evaluate models in a background thread.
+
+    This extension works like :class:`Evaluator`, except that the evaluation
+    runs in a background thread while the training continues. When the
+    evaluation is triggered by ``eval_trigger``, the target links are copied
+    by :func:`copy.deepcopy`, and the copies are evaluated so that the updates
+    of the parameters do not affect the evaluation. The result is reported at
+    the first iteration after the evaluation finishes, with the iteration at
+    which the evaluation was started reported as ``'iteration'`` prefixed by
+    the extension name (e.g. ``'validation/iteration'``).
+
+    The extension has to be called at every iteration to report the results,
+    so it should be registered to the trainer without a trigger and the
+    interval of the evaluation should be given as ``eval_trigger`` instead::
+
+       trainer.extend(extensions.AsyncEvaluator(
+           val_iter, model, eval_trigger=(1, 'epoch')))
+
+    If an evaluation is triggered while the previous one is running, the
+    extension waits for the previous one to finish. The evaluation triggered
+    at the last iteration of the training is run to the end before the
+    extension returns, if the stop trigger of the trainer is an
+    :class:`~chainer.training.triggers.IntervalTrigger`.
+
+    NumPy and CuPy release the GIL in most of their computations, so the
+    evaluation overlaps with the training on hosts with multiple cores or with
+    GPUs. The evaluation runs with its own :class:`~chainer.Reporter` and
+    configuration in the thread, so the values reported in the evaluation are
+    not mixed with those of the training.
+
+    .. note::
+       ``eval_func`` is called as it is. If it is given, it should not refer
+       to the target links directly; they are being updated by the training.
+       The copied targets are available via :meth:`get_target` of the
+       evaluator passed to ``eval_hook``.
+
+    Args:
+        iterator: Dataset iterator for the validation dataset. It can also be
+            a dictionary of iterators. If this is just an iterator, the
+            iterator is registered by the name ``'main'``.
+        target: Link object or a dictionary of links to evaluate. If this is
+            just a link object, the link is registered by the name ``'main'``.
+        converter: Converter function to build input arrays.
+            :func:`~chainer.dataset.concat_examples` is used by default.
+        device: Device to which the training data is sent. Negative value
+            indicates the host memory (CPU).
+        eval_hook: Function to prepare for each evaluation process. It is
+            called at the beginning of the evaluation in the background
+            thread.
+        eval_func: Evaluation function called at each iteration. The copy of
+            the target link is used by default.
+        eval_trigger: Trigger that determines when to start an evaluation.
+            It is passed to :func:`~chainer.training.get_trigger`.
+
+    """
+    trigger = 1, 'iteration'
+
+    def __init__(self, iterator, target, converter=convert.concat_examples,
+                 device=None, eval_hook=None, eval_func=None,
+                 eval_trigger=(1, 'epoch')):
+        super(AsyncEvaluator, self).__init__(
+            iterator, target, converter, device, eval_hook, eval_func)
+        self.eval_trigger = trigger_module.get_trigger(eval_trigger)
+        self._thread = None
+        self._output = None
+
+    def __call__(self, trainer=None):
+        """Reports the finished evaluation and starts a new one if triggered.
+
+        If it is called without a trainer, a new evaluation is always started.
+
+        Args:
+            trainer (~chainer.training.Trainer): Trainer object that invokes
+                this extension.
+
+        Returns:
+            dict: Result dictionary of the evaluation that has finished since
+            the last call, or ``None`` if there is no such evaluation.
+
+        """
+        results = []
+        if self._thread is not None and not self._thread.is_alive():
+            results.append(self._collect())
+
+        if trainer is None or self.eval_trigger(trainer):
+            if self._thread is not None:
+                results.append(self._collect())
+            iteration = None if trainer is None else trainer.updater.iteration
+            self._start(iteration)
+            if trainer is not None and _is_last_iteration(trainer):
+                results.append(self._collect())
+
+        for result in results:
+            reporter_module.report(result)
+        return results[-1] if results else None
+
+    def _start(self, iteration):
+        evaluator = copy.copy(self)
+        evaluator._targets = dict([
+            (name, copy.deepcopy(target))
+            for name, target in six.iteritems(self._targets)])
+        self._output = {}
+        self._thread = threading.Thread(
+            target=evaluator._run, args=(iteration, self._output))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, iteration, output):
+        reporter_module._use_thread_local_reporters()
+        if self.device is not None and self.device >= 0:
+            cuda.get_device_from_id(self.device).use()
+        try:
+            reporter = self._make_reporter()
+            prefix = self.name + '/' if hasattr(self, 'name') else ''
+            with reporter:
+                with configuration.using_config('train', False):
+                    result = self.evaluate()
+            result[prefix + 'iteration'] = iteration
+            output['result'] = result
+        except Exception:
+            output['exc_info'] = sys.exc_info()
+
+    def _collect(self):
+        self._thread.join()
+        self._thread = None
+        output = self._output
+        self._output = None
+        if 'exc_info' in output:
+            six.reraise(*output['exc_info'])
+        return output['result']
+
+    def finalize(self):
+        """Waits for the running evaluation to finish.
+
+        The result of the evaluation is discarded.
+
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._output = None
+
+    def serialize(self, serializer):
+        if hasattr(self.eval_trigger, 'serialize'):
+            self.eval_trigger.serialize(serializer['eval_trigger'])
@@ -112,6 +112,16 @@ class Trainer(object):
 
     The default trainer is `plain`, i.e., it does not contain any extensions.
 
+    If ``chainer.config.report_time`` is ``True``, the trainer measures the
+    time spent in each update and each extension call, and reports them as
+    ``time/update`` and ``time/extension/<extension name>``, respectively. The
+    standard updaters additionally report the time of their phases (e.g.
+    ``time/iterator`` and ``time/converter``). Note that the time of an
+    extension is reported after it is called, so extensions of lower
+    priorities in the same iteration (e.g.
+    :class:`~chainer.training.extensions.LogReport`) only see the time of the
+    extensions invoked before them.
+
     Args:
         updater (~chainer.training.Updater): Updater object. It defines how to
             update the models.
@@ -289,6 +299,7 @@ class Trainer(object):
 
         update = self.updater.update
         reporter = self.reporter
+        report_time = reporter_module.report_time
         stop_trigger = self.stop_trigger
 
         # main training loop
@@ -296,10 +307,12 @@ class Trainer(object):
             while not stop_trigger(self):
                 self.observation = {}
                 with reporter.scope(self.observation):
-                    update()
+                    with report_time('update'):
+                        update()
                     for name, entry in extensions:
                         if entry.trigger(self):
-                            entry.extension(self)
+                            with report_time('extension/' + name):
+                                entry.extension(self)
         except Exception as e:
             if show_loop_exception_msg:
                 # Show the exception here, as it will appear as if chainer
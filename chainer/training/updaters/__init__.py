@@ -1,3 +1,5 @@
 from chainer.training.updaters import multiprocess_parallel_updater  # NOQA
+from chainer.training.updaters import shared_memory_parallel_updater  # NOQA
 
 from chainer.training.updaters.multiprocess_parallel_updater import MultiprocessParallelUpdater  # NOQA
+from chainer.training.updaters.shared_memory_parallel_updater import SharedMemoryParallelUpdater  # NOQA
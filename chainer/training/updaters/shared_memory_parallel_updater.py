@@ -0,0 +1,457 @@
+import multiprocessing
+import threading
+import traceback
+
+import numpy
+import six
+
+from chainer import cuda
+from chainer.dataset import convert
+from chainer import function
+from chainer import reporter as reporter_module
+from chainer import serializer as serializer_module
+from chainer import serializers
+from chainer.training import updater
+from chainer import variable
+
+
+# multiprocessing.Barrier is not available on Python 2.
+_available = hasattr(multiprocessing, 'Barrier')
+
+
+class _FlatLayout(object):
+
+    """Layout of the parameters of a link in a flat buffer."""
+
+    def __init__(self, link):
+        self.params = []
+        self.offsets = [0]
+        dtypes = []
+        for name, param in sorted(link.namedparams()):
+            if param.data is None:
+                raise RuntimeError(
+                    'parameter {} is not initialized. All parameters must '
+                    'be initialized before the processes are forked.'
+                    .format(name))
+            self.params.append(param)
+            self.offsets.append(self.offsets[-1] + param.size)
+            dtypes.append(param.dtype)
+        self.size = self.offsets[-1]
+        self.dtype = numpy.result_type(numpy.float32, *dtypes)
+
+    def bind(self, link):
+        # Returns the layout applied to another copy of the same link
+        layout = _FlatLayout.__new__(_FlatLayout)
+        layout.params = [param for _, param in sorted(link.namedparams())]
+        layout.offsets = self.offsets
+        layout.size = self.size
+        layout.dtype = self.dtype
+        return layout
+
+    def gather(self, buf, target):
+        offsets = self.offsets
+        for i, param in enumerate(self.params):
+            dst = buf[offsets[i]:offsets[i + 1]]
+            src = getattr(param, target)
+            if src is None:
+                dst.fill(0)
+            else:
+                dst[...] = src.ravel()
+
+    def scatter(self, buf, target):
+        offsets = self.offsets
+        for i, param in enumerate(self.params):
+            src = buf[offsets[i]:offsets[i + 1]].reshape(param.shape)
+            dst = getattr(param, target)
+            if dst is None:
+                setattr(param, target, src.astype(param.dtype))
+            else:
+                dst[...] = src
+
+
+def _shared_array(shape, dtype):
+    dtype = numpy.dtype(dtype)
+    size = int(numpy.prod(shape)) * dtype.itemsize
+    raw = multiprocessing.RawArray('b', max(size, 1))
+    return numpy.frombuffer(raw, dtype=dtype, count=int(numpy.prod(shape)))\
+        .reshape(shape)
+
+
+def _to_cpu_value(value):
+    if isinstance(value, variable.Variable):
+        value = value.data
+    return cuda.to_cpu(value)
+
+
+class _Communicator(object):
+
+    """Reduces and broadcasts flat buffers among processes.
+
+    Each process owns one row of the gradient buffer. The sum of the rows is
+    computed in parallel: each process reduces a contiguous chunk of the
+    columns into the first row, which is the shared-memory counterpart of the
+    reduce-scatter phase of the ring all-reduce.
+
+    """
+
+    def __init__(self, n_processes, size, dtype, timeout):
+        self.n_processes = n_processes
+        self.grads = _shared_array((n_processes, size), dtype)
+        self.params = _shared_array((size,), dtype)
+        # If a process fails, it aborts the barrier so that the others do not
+        # wait forever. The timeout covers the processes that die without
+        # aborting it.
+        self.barrier = multiprocessing.Barrier(n_processes, timeout=timeout)
+        bounds = numpy.linspace(0, size, n_processes + 1).astype(int)
+        self.chunks = [slice(bounds[i], bounds[i + 1])
+                       for i in six.moves.range(n_processes)]
+
+    def reduce(self, rank):
+        # The gradient of each process must have been written to its row
+        self.barrier.wait()
+        chunk = self.chunks[rank]
+        total = self.grads[0, chunk]
+        for i in six.moves.range(1, self.n_processes):
+            total += self.grads[i, chunk]
+        self.barrier.wait()
+        return self.grads[0]
+
+    def broadcast(self):
+        # The parameters must have been written to the buffer by the master
+        self.barrier.wait()
+        return self.params
+
+
+class _Worker(multiprocessing.Process):
+
+    def __init__(self, rank, pipe, master):
+        super(_Worker, self).__init__()
+        self.rank = rank
+        self.pipe = pipe
+        self.converter = master.converter
+        self.loss_func = master.loss_func
+        self.model = master._master
+        self.iterator = master._shm_iterators[rank]
+        self.comm = master._comm
+        self.layout = master._layout
+
+    def run(self):
+        layout = self.layout.bind(self.model)
+        reporter = reporter_module.Reporter()
+        reporter.add_observer('main', self.model)
+        while True:
+            job, data = self.pipe.recv()
+            if job == 'finalize':
+                self.iterator.finalize()
+                break
+            try:
+                if job == 'update':
+                    result = self.update(layout, reporter)
+                elif job == 'save':
+                    result = _save_iterator(self.iterator)
+                elif job == 'load':
+                    _load_iterator(self.iterator, data)
+                    result = None
+            except Exception:
+                self.comm.barrier.abort()
+                self.pipe.send(('error', traceback.format_exc()))
+                break
+            self.pipe.send(('ok', result))
+
+    def update(self, layout, reporter):
+        batch = self.converter(self.iterator.next())
+        observation = {}
+        with function.force_backprop_mode(), reporter.scope(observation):
+            loss = _calc_loss(self.loss_func or self.model, batch)
+
+        self.model.cleargrads()
+        loss.backward()
+        del loss
+
+        layout.gather(self.comm.grads[self.rank], 'grad')
+        self.model.cleargrads()
+        self.comm.reduce(self.rank)
+        layout.scatter(self.comm.broadcast(), 'data')
+
+        return {key: _to_cpu_value(value)
+                for key, value in six.iteritems(observation)}
+
+
+class SharedMemoryParallelUpdater(updater.StandardUpdater):
+
+    """Implementation of a multiprocess data-parallel CPU Updater.
+
+    This is an implementation of :class:`Updater` that trains a model on CPU
+    with multiple processes. It behaves similarly to
+    :class:`~chainer.training.updaters.MultiprocessParallelUpdater`, except
+    that it does not require GPUs nor NCCL: each process holds its own replica
+    of the model and its own iterator, and the gradients and the parameters
+    are exchanged through flat buffers in shared memory.
+
+    At each iteration, all processes compute the gradients of their own
+    mini-batches. The gradients are summed into one buffer, where each process
+    reduces an equal chunk of it, and the parameters are updated only in the
+    main process. The updated parameters are then copied back to the replicas
+    through another shared buffer. As in
+    :class:`~chainer.training.ParallelUpdater`, the gradients of the replicas
+    are summed, not averaged.
+
+    The values reported in the worker processes are sent to the main process,
+    and each of them is averaged with the values of the same key reported by
+    the other processes.
+
+    The worker processes are forked when the first update starts, so all
+    parameters of the model must be initialized by then. Since every process
+    runs its own BLAS, it is recommended to limit the number of threads of
+    the BLAS in each process (e.g. by ``OMP_NUM_THREADS``) so that the total
+    does not exceed the number of cores.
+
+    Args:
+        iterators: List of dataset iterators for the training dataset. The
+            number of the iterators determines the number of processes, and
+            the first one is used in the main process.
+        optimizer: Optimizer to update parameters. The model should be
+            attached to the optimizer.
+        converter: Converter function to build input arrays. Each batch
+            extracted by an iterator is passed to this function in the process
+            that owns the iterator.
+            :func:`~chainer.dataset.concat_examples` is used by default.
+        loss_func: Loss function. The model is used as a loss function by
+            default.
+        timeout (float): Time in seconds that a process waits for the others
+            to finish their parts of an iteration. If it is exceeded, or if
+            any process fails, the update raises an error instead of
+            blocking forever. ``None`` means no limit.
+
+    .. note::
+       This updater requires Python 3, since it synchronizes the processes
+       by :class:`multiprocessing.Barrier`.
+
+    """
+
+    def __init__(self, iterators, optimizer, converter=convert.concat_examples,
+                 loss_func=None, timeout=600):
+        if not _available:
+            raise RuntimeError(
+                'SharedMemoryParallelUpdater requires '
+                'multiprocessing.Barrier, which is available on Python 3.3 '
+                'or later.')
+        if not iterators:
+            raise ValueError('at least one iterator is required')
+        super(SharedMemoryParallelUpdater, self).__init__(
+            iterator=iterators[0],
+            optimizer=optimizer,
+            converter=converter,
+            loss_func=loss_func,
+        )
+
+        self._master = optimizer.target
+        self._shm_iterators = iterators
+        self._timeout = timeout
+        self._initialized = False
+
+        self._pipes = []
+        self._workers = []
+        self._comm = None
+        self._layout = None
+
+    def setup_workers(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self._master.cleargrads()
+        self._layout = _FlatLayout(self._master)
+        n_processes = len(self._shm_iterators)
+        self._comm = _Communicator(n_processes, self._layout.size,
+                                   self._layout.dtype, self._timeout)
+        for rank in six.moves.range(1, n_processes):
+            pipe, worker_end = multiprocessing.Pipe()
+            worker = _Worker(rank, worker_end, self)
+            worker.start()
+            # Only the worker holds its end, so that the main process sees
+            # EOF if the worker dies.
+            worker_end.close()
+            self._workers.append(worker)
+            self._pipes.append(pipe)
+
+    def update_core(self):
+        self.setup_workers()
+
+        for pipe in self._pipes:
+            pipe.send(('update', None))
+
+        try:
+            observation = self._update_master()
+        except Exception as e:
+            self._comm.barrier.abort()
+            errors = self._receive_all(self._timeout)
+            self.finalize()
+            if isinstance(e, threading.BrokenBarrierError) and errors:
+                # Reports the error that broke the barrier rather than the
+                # errors of the workers that were waiting for the barrier.
+                errors.sort(key=lambda tb: 'BrokenBarrierError' in tb)
+                raise RuntimeError(
+                    'a worker process of SharedMemoryParallelUpdater failed:'
+                    '\n' + errors[0])
+            raise
+
+        observations = [observation]
+        observations += self._receive_all(None, errors=False)
+        reporter_module.report(_average(observations))
+
+    def _update_master(self):
+        optimizer = self.get_optimizer('main')
+        model = self._master
+        comm = self._comm
+        layout = self._layout
+
+        with reporter_module.report_time('iterator'):
+            batch = self.get_iterator('main').next()
+        with reporter_module.report_time('converter'):
+            in_arrays = self.converter(batch)
+
+        observation = {}
+        with reporter_module.report_time('forward'):
+            with function.force_backprop_mode(), \
+                    _observe(observation):
+                loss = _calc_loss(self.loss_func or model, in_arrays)
+
+        model.cleargrads()
+        with reporter_module.report_time('backward'):
+            loss.backward()
+        del loss
+
+        with reporter_module.report_time('reduce'):
+            layout.gather(comm.grads[0], 'grad')
+            layout.scatter(comm.reduce(0), 'grad')
+
+        optimizer.update()
+
+        with reporter_module.report_time('broadcast'):
+            layout.gather(comm.params, 'data')
+            comm.broadcast()
+        return observation
+
+    def _receive_all(self, timeout, errors=True):
+        # Receives the replies of the workers. If errors is True, the
+        # tracebacks of the failed workers are returned. Otherwise, a failure
+        # of a worker is raised as an error.
+        results = []
+        for pipe in self._pipes:
+            if timeout is not None and not pipe.poll(timeout):
+                continue
+            try:
+                status, result = pipe.recv()
+            except EOFError:
+                status, result = 'error', 'the process exited unexpectedly'
+            if errors:
+                if status == 'error':
+                    results.append(result)
+            elif status == 'error':
+                self.finalize()
+                raise RuntimeError(
+                    'a worker process of SharedMemoryParallelUpdater failed:'
+                    '\n' + result)
+            else:
+                results.append(result)
+        return results
+
+    def serialize(self, serializer):
+        """Serializes the current state of the updater object.
+
+        The iterators of the worker processes are serialized by the names
+        ``'iterator:worker<rank>'`` in addition to the states serialized by
+        :class:`~chainer.training.StandardUpdater`.
+
+        """
+        super(SharedMemoryParallelUpdater, self).serialize(serializer)
+        saving = isinstance(serializer, serializer_module.Serializer)
+        if saving and self._pipes:
+            for pipe in self._pipes:
+                pipe.send(('save', None))
+            states = self._receive_all(None, errors=False)
+        for rank, iterator in enumerate(self._shm_iterators[1:], 1):
+            s = serializer['iterator:worker%d' % rank]
+            if not saving:
+                iterator.serialize(s)
+                if self._pipes:
+                    self._pipes[rank - 1].send(
+                        ('load', _save_iterator(iterator)))
+                continue
+            state = states[rank - 1] if self._pipes else \
+                _save_iterator(iterator)
+            for path, value in sorted(six.iteritems(state)):
+                names = path.split('/')
+                for name in names[:-1]:
+                    s = s[name]
+                s(names[-1], value)
+        if not saving and self._pipes:
+            self._receive_all(None, errors=False)
+
+    def finalize(self):
+        super(SharedMemoryParallelUpdater, self).finalize()
+        for pipe in self._pipes:
+            try:
+                pipe.send(('finalize', None))
+            except (IOError, OSError):
+                # the worker has already exited
+                pass
+        for worker in self._workers:
+            worker.join(self._timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._pipes = []
+        self._workers = []
+
+
+def _save_iterator(iterator):
+    state = {}
+    iterator.serialize(serializers.DictionarySerializer(state))
+    return state
+
+
+def _load_iterator(iterator, state):
+    iterator.serialize(serializers.NpzDeserializer(state))
+
+
+def _observe(observation):
+    try:
+        reporter_module.get_current_reporter()
+    except IndexError:
+        return _NullScope()
+    return reporter_module.report_scope(observation)
+
+
+class _NullScope(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+def _average(observations):
+    sums = {}
+    counts = {}
+    for observation in observations:
+        for key, value in six.iteritems(observation):
+            value = _to_cpu_value(value)
+            if key in sums:
+                sums[key] = sums[key] + value
+                counts[key] += 1
+            else:
+                sums[key] = value
+                counts[key] = 1
+    return {key: sums[key] / counts[key] for key in sums}
+
+
+def _calc_loss(loss_func, in_arrays):
+    if isinstance(in_arrays, tuple):
+        return loss_func(*in_arrays)
+    elif isinstance(in_arrays, dict):
+        return loss_func(**in_arrays)
+    else:
+        return loss_func(in_arrays)
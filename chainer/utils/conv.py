@@ -2,6 +2,7 @@ import numpy
 import six
 
 from chainer import cuda
+from chainer import memory_pool
 
 
 def get_conv_outsize(size, k, s, p, cover_all=False, d=1):
@@ -76,7 +77,7 @@ def im2col_cpu(
     img = numpy.pad(img,
                     ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
                     mode='constant', constant_values=(pval,))
-    col = numpy.ndarray((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
+    col = memory_pool.empty((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
 
     for j in six.moves.range(kh):
         jdy = j * dy
@@ -126,8 +127,8 @@ def im2col_gpu(img, kh, kw, sy, sx, ph, pw, cover_all=False, dy=1, dx=1,
 
 def col2im_cpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
     n, c, kh, kw, out_h, out_w = col.shape
-    img = numpy.zeros((n, c, h + 2 * ph + sy - 1, w + 2 * pw + sx - 1),
-                      dtype=col.dtype)
+    img = memory_pool.zeros(
+        (n, c, h + 2 * ph + sy - 1, w + 2 * pw + sx - 1), dtype=col.dtype)
     for j in six.moves.range(kh):
         jdy = j * dy
         j_lim = jdy + sy * out_h
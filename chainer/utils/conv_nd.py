@@ -3,6 +3,7 @@ import numpy
 import six
 
 from chainer import cuda
+from chainer import memory_pool
 from chainer.utils.conv import get_conv_outsize
 from chainer.utils import conv_nd_kernel
 
@@ -31,7 +32,7 @@ def im2col_nd_cpu(img, ksize, stride, pad, pval=0, cover_all=False):
     # Make patch array with which we will compute correlation with filter.
     # shape: (n, c, k_1, k_2, ..., k_N, out_1, out_2, ..., out_N)
     shape = (n, c) + ksize + outs
-    col = numpy.ndarray(shape, dtype=img.dtype)
+    col = memory_pool.empty(shape, dtype=img.dtype)
 
     # Fill the patch array.
     colon = slice(None)
@@ -82,7 +83,7 @@ def col2im_nd_cpu(col, stride, pad, dims):
     # Image with padded size.
     img_shape = (n, c) + tuple(d + 2 * p + s - 1
                                for (d, p, s) in zip(dims, pad, stride))
-    img = numpy.zeros(img_shape, dtype=col.dtype)
+    img = memory_pool.zeros(img_shape, dtype=col.dtype)
     for kxs in itertools.product(*[six.moves.range(k) for k in ksize]):
         # (:, :, kx_1:kx_lim_1:s_1, ..., kx_N:kx_lim_N:s_N)
         kx_lims = tuple(kx + s * out
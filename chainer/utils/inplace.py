@@ -0,0 +1,49 @@
+import sys
+
+import numpy
+
+from chainer import cuda
+from chainer import variable
+
+
+def can_overwrite(x):
+    """Tells whether a function may overwrite the data of its input in place.
+
+    The data of ``x`` can be overwritten only if it is an intermediate result
+    of the computational graph that no one else needs. That is, ``x`` must be
+    a variable created by a function node, its data must not be retained for
+    the backward computation of its creator or of the functions that have
+    already consumed it, and the data array must own its memory and must not
+    be referenced from anywhere else, e.g. from views of the array or
+    attributes of functions. The last condition is checked by the reference
+    count of the array.
+
+    Note that functions applied to ``x`` after the overwriting see the
+    overwritten data; the callers of in-place functions are responsible for
+    not using ``x`` afterward.
+
+    Args:
+        x: Input of a function.
+
+    Returns:
+        bool: ``True`` if the data of ``x`` can be overwritten.
+
+    """
+    if not isinstance(x, variable.Variable) or x.creator_node is None:
+        return False
+    if x.node.data is not None:
+        # The data is retained by the creator or by the consumers.
+        return False
+    data = x.data
+    if type(data) is numpy.ndarray:
+        if not data.flags.writeable:
+            return False
+    elif not (cuda.available and type(data) is cuda.ndarray):
+        return False
+    if data.base is not None:
+        # The array is a view of another array, e.g. the output of reshape,
+        # transpose or broadcast_to, whose memory may be used by others.
+        return False
+    # The references from the variable, the local name and the argument of
+    # getrefcount.
+    return sys.getrefcount(data) <= 3
@@ -0,0 +1,105 @@
+import multiprocessing
+import multiprocessing.pool
+import os
+import threading
+
+import six
+
+from chainer import configuration
+
+
+# Chunks with fewer elements than this are not worth being passed to another
+# thread.
+_MIN_CHUNK_SIZE = 1 << 15
+
+_lock = threading.Lock()
+_pool = None
+_pool_key = None
+
+
+def get_num_threads():
+    """Returns the number of threads used by functions on CPU.
+
+    It is given by ``chainer.config.cpu_threads``, where ``0`` means the
+    number of CPUs. The default is ``1`` unless ``CHAINER_CPU_THREADS`` is
+    set, so the functions do not use threads unless it is configured.
+
+    """
+    n_threads = configuration.config.cpu_threads
+    if n_threads <= 0:
+        n_threads = multiprocessing.cpu_count()
+    return n_threads
+
+
+def _get_pool(n_threads):
+    global _pool, _pool_key
+    # Threads are not inherited by forked processes, so each process creates
+    # its own pool.
+    key = os.getpid(), n_threads
+    with _lock:
+        if _pool_key != key:
+            if _pool is not None and _pool_key[0] == key[0]:
+                _pool.close()
+            _pool = multiprocessing.pool.ThreadPool(n_threads)
+            _pool_key = key
+        return _pool
+
+
+def run_in_chunks(func, batch_size, size):
+    """Calls a function on chunks of a mini-batch in parallel.
+
+    The mini-batch is split into contiguous chunks along the first axis, and
+    ``func`` is called with a slice of each chunk. The first chunk is
+    processed in the calling thread and the others in a thread pool, which
+    speeds up NumPy operations that release the GIL. ``func`` must write its
+    results to arrays allocated beforehand, and must not depend on the
+    thread-local configuration.
+
+    The mini-batch is not split if it is small, or if
+    ``chainer.config.cpu_threads`` is ``1``.
+
+    Args:
+        func (callable): Function that takes a slice of the mini-batch.
+        batch_size (int): Size of the mini-batch.
+        size (int): Total number of elements to process, which is used to
+            decide the number of chunks.
+
+    """
+    n_threads = get_num_threads()
+    n_chunks = min(n_threads, batch_size, size // _MIN_CHUNK_SIZE)
+    if n_chunks <= 1:
+        func(slice(0, batch_size))
+        return
+
+    bounds = [batch_size * i // n_chunks
+              for i in six.moves.range(n_chunks + 1)]
+    chunks = [slice(bounds[i], bounds[i + 1])
+              for i in six.moves.range(n_chunks)]
+    result = _get_pool(n_threads - 1).map_async(func, chunks[1:])
+    func(chunks[0])
+    result.get()
+
+
+def imap(func, iterable):
+    """Applies a function to each item of an iterable in parallel.
+
+    The items are processed by ``chainer.config.cpu_threads - 1`` threads in
+    the pool, while the calling thread consumes the results, e.g. writes them
+    to a file. The results are yielded in the order of the items. ``func``
+    must not depend on the thread-local configuration.
+
+    If ``chainer.config.cpu_threads`` is ``1``, the items are processed
+    lazily in the calling thread.
+
+    Args:
+        func (callable): Function that takes an item.
+        iterable: Items to process.
+
+    Returns:
+        Iterator of the results of ``func``.
+
+    """
+    n_threads = get_num_threads()
+    if n_threads <= 1:
+        return six.moves.map(func, iterable)
+    return _get_pool(n_threads - 1).imap(func, iterable)
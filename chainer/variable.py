@@ -1,6 +1,7 @@
 import collections
 import copy
 import heapq
+import itertools
 import traceback
 import warnings
 import weakref
@@ -853,7 +854,8 @@ class Variable(object):
         """
         self._node.set_creator_node(fnode)
 
-    def backward(self, retain_grad=False, enable_double_backprop=False):
+    def backward(self, retain_grad=False, enable_double_backprop=False,
+                 retain_graph=True):
         """Runs error backpropagation (a.k.a.\\  backprop) from this variable.
 
         On backprop,
@@ -893,12 +895,27 @@ class Variable(object):
                 enabling it results in larger memory consumption needed to
                 store the gradients w.r.t intermediate variables that are
                 required for the second gradient computation.
+            retain_graph (bool): If ``True`` (default), the computational
+                graph is kept after backprop so that backprop can be run
+                again through it, e.g. from another loss computed from the
+                same graph. If ``False``, each function node is unchained
+                from the graph and its retained arrays are released as soon
+                as the gradients w.r.t. its inputs are computed, so that the
+                memory of the activations can be reused for the gradients
+                during backprop. Do not set it to ``False`` if any other
+                variable is going to be backpropagated through the same
+                graph, since the gradients would not reach the nodes behind
+                the released part of the graph. The graph is always kept if
+                ``enable_double_backprop`` or
+                ``chainer.config.keep_graph_on_report`` is ``True``.
 
         """
+        retain_graph = (retain_graph or enable_double_backprop or
+                        chainer.config.keep_graph_on_report)
         with chainer.using_config('enable_backprop', enable_double_backprop):
-            self._backward_main(retain_grad)
+            self._backward_main(retain_grad, retain_graph)
 
-    def _backward_main(self, retain_grad):
+    def _backward_main(self, retain_grad, retain_graph=True):
         self._node._check_old_style_gradient()
         if self.creator_node is None:
             return
@@ -914,6 +931,7 @@ class Variable(object):
 
         cand_funcs = []
         seen_set = set()
+        cand_order = itertools.count()
         grads = {}
 
         # Initialize error by 1, if this is a loss variable
@@ -928,7 +946,8 @@ class Variable(object):
         def add_cand(cand):
             if cand not in seen_set:
                 # Negate since heapq is min-heap
-                heapq.heappush(cand_funcs, (-cand.rank, len(seen_set), cand))
+                heapq.heappush(
+                    cand_funcs, (-cand.rank, next(cand_order), cand))
                 seen_set.add(cand)
 
         add_cand(self.creator_node)
@@ -1074,6 +1093,19 @@ class Variable(object):
                     add_cand(x.creator_node)
 
             del gxs  # to reduce memory usage
+
+            if not retain_graph:
+                # All the function nodes that use the outputs have already
+                # been processed, so the node can be purged from the graph
+                # now. It releases the retained arrays and the references to
+                # the input nodes unless they are referenced elsewhere.
+                for y in outputs:
+                    if y is not None and y is not self.node:
+                        grads.pop(y, None)
+                func.unchain()
+                func._retained_output_data = None
+                seen_set.discard(func)
+                del in_data, outputs, out_grad, out_grad_data, in_grad
             if initial_device is not None:
                 initial_device.use()
 
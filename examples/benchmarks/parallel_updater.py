@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""Benchmark of ParallelUpdater with model replicas on CPU.
+
+This script measures the time per iteration of
+:class:`chainer.training.ParallelUpdater` training an MLP on random data with
+1, 2 and 4 replicas on the host, running the replicas sequentially and in
+threads.
+
+"""
+from __future__ import print_function
+import argparse
+import time
+
+import numpy
+
+import chainer
+import chainer.functions as F
+import chainer.links as L
+from chainer import training
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self, n_in, n_units, n_out):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.l1 = L.Linear(n_in, n_units)
+            self.l2 = L.Linear(n_units, n_units)
+            self.l3 = L.Linear(n_units, n_out)
+
+    def __call__(self, x):
+        h = F.relu(self.l1(x))
+        h = F.relu(self.l2(h))
+        return self.l3(h)
+
+
+def measure(dataset, args, n_replicas, use_threads):
+    model = L.Classifier(MLP(args.insize, args.unit, 10))
+    optimizer = chainer.optimizers.SGD()
+    optimizer.setup(model)
+    devices = {'main': -1}
+    for i in range(1, n_replicas):
+        devices['replica%d' % i] = -1
+    iterator = chainer.iterators.SerialIterator(dataset, args.batchsize)
+    updater = training.ParallelUpdater(
+        iterator, optimizer, devices=devices, use_threads=use_threads)
+
+    for _ in range(args.warmup):
+        updater.update()
+    start = time.time()
+    for _ in range(args.iteration):
+        updater.update()
+    elapsed = time.time() - start
+    updater.finalize()
+    return elapsed / args.iteration
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of ParallelUpdater on CPU')
+    parser.add_argument('--batchsize', '-b', type=int, default=256,
+                        help='Number of examples in each mini-batch')
+    parser.add_argument('--insize', '-i', type=int, default=784,
+                        help='Number of input features')
+    parser.add_argument('--unit', '-u', type=int, default=1000,
+                        help='Number of units')
+    parser.add_argument('--iteration', '-n', type=int, default=20,
+                        help='Number of measured iterations')
+    parser.add_argument('--warmup', '-w', type=int, default=3,
+                        help='Number of iterations before measurement')
+    parser.add_argument('--replicas', '-r', type=int, nargs='+',
+                        default=[1, 2, 4], help='Numbers of replicas')
+    args = parser.parse_args()
+
+    x = numpy.random.uniform(
+        -1, 1, (args.batchsize * 4, args.insize)).astype(numpy.float32)
+    t = numpy.random.randint(0, 10, len(x)).astype(numpy.int32)
+    dataset = chainer.datasets.TupleDataset(x, t)
+
+    print('{:>8} {:>14} {:>14} {:>8}'.format(
+        'replicas', 'sequential[ms]', 'threads[ms]', 'speedup'))
+    for n_replicas in args.replicas:
+        sequential = measure(dataset, args, n_replicas, False)
+        threads = measure(dataset, args, n_replicas, True)
+        print('{:>8} {:>14.2f} {:>14.2f} {:>8.2f}'.format(
+            n_replicas, sequential * 1000, threads * 1000,
+            sequential / threads))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""Runs the microbenchmarks in ``suite`` and writes the results to JSON.
+
+The benchmarks are written in the style of airspeed velocity (asv), and this
+script runs them without asv::
+
+    python run_suite.py run -o results.json
+    python run_suite.py run -b 'functions.TimeActivation' -o relu.json
+    python run_suite.py compare base.json results.json
+
+Each benchmark is called repeatedly so that a measurement takes at least
+``--min-time`` seconds, and the minimum, median and maximum of ``--repeat``
+measurements of the time per call are recorded. ``compare`` shows the ratios
+of the medians of two results and exits with 1 if any of them is slower than
+``--factor``.
+
+"""
+from __future__ import print_function
+import argparse
+import datetime
+import importlib
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import pkgutil
+import platform
+import re
+import subprocess
+import sys
+import timeit
+import traceback
+
+import numpy
+
+import chainer
+
+
+def _params_of(cls):
+    # asv accepts a flat list as the values of a single parameter.
+    params = getattr(cls, 'params', [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    names = getattr(cls, 'param_names', None)
+    if names is None:
+        names = ['param%d' % (i + 1) for i in range(len(params))]
+    return params, names
+
+
+def discover(pattern):
+    import suite
+    for _, module_name, _ in pkgutil.iter_modules(suite.__path__):
+        module = importlib.import_module('suite.' + module_name)
+        for cls_name, cls in sorted(vars(module).items()):
+            if (cls_name.startswith('_') or not inspect.isclass(cls) or
+                    cls.__module__ != module.__name__):
+                continue
+            for method in sorted(dir(cls)):
+                if not method.startswith('time_'):
+                    continue
+                name = '.'.join((module_name, cls_name, method))
+                if pattern is None or re.search(pattern, name):
+                    yield name, cls, method
+
+
+def measure(func, min_time, repeat):
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1000000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = sorted(t / number for t in timer.repeat(repeat, number))
+    return {
+        'min': samples[0],
+        'median': float(numpy.median(samples)),
+        'max': samples[-1],
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_benchmark(cls, method, params, min_time, repeat):
+    # As asv does, a benchmark whose setup raises NotImplementedError is
+    # skipped, and an error of a benchmark does not stop the others.
+    obj = cls()
+    try:
+        if hasattr(obj, 'setup'):
+            obj.setup(*params)
+    except NotImplementedError as e:
+        return {'skipped': str(e)}
+    except Exception:
+        return {'error': traceback.format_exc()}
+    try:
+        return measure(lambda: getattr(obj, method)(*params),
+                       min_time, repeat)
+    except Exception:
+        return {'error': traceback.format_exc()}
+    finally:
+        if hasattr(obj, 'teardown'):
+            obj.teardown(*params)
+
+
+def _format_time(t):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if t >= scale:
+            return '{:.3g} {}'.format(t / scale, unit)
+    return '{:.3g} ns'.format(t / 1e-9)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    results = {}
+    for name, cls, method in discover(args.bench):
+        params, param_names = _params_of(cls)
+        entries = []
+        for combination in itertools.product(*params):
+            result = run_benchmark(cls, method, combination, args.min_time,
+                                   args.repeat)
+            result['params'] = list(combination)
+            entries.append(result)
+            label = name
+            if combination:
+                label += '({})'.format(', '.join(map(str, combination)))
+            if 'skipped' in result:
+                print('{}: skipped ({})'.format(label, result['skipped']),
+                      file=sys.stderr)
+            elif 'error' in result:
+                print('{}: failed\n{}'.format(label, result['error']),
+                      file=sys.stderr)
+            else:
+                print('{}: {}'.format(label, _format_time(result['median'])),
+                      file=sys.stderr)
+        results[name] = {'param_names': param_names, 'results': entries}
+
+    output = {
+        'version': 1,
+        'commit': _git_commit(),
+        'date': datetime.datetime.utcnow().isoformat(),
+        'env': {
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'chainer': chainer.__version__,
+            'ideep': chainer.ia.available,
+            'platform': platform.platform(),
+            'cpu_count': multiprocessing.cpu_count(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=1, sort_keys=True)
+    else:
+        json.dump(output, sys.stdout, indent=1, sort_keys=True)
+        print()
+
+
+def _medians(path):
+    with open(path) as f:
+        results = json.load(f)['results']
+    medians = {}
+    for name, benchmark in results.items():
+        for entry in benchmark['results']:
+            if 'median' in entry:
+                key = name
+                if entry['params']:
+                    key += '({})'.format(
+                        ', '.join(map(str, entry['params'])))
+                medians[key] = entry['median']
+    return medians
+
+
+def compare(args):
+    base = _medians(args.base)
+    target = _medians(args.target)
+    regressed = False
+    for key in sorted(set(base) & set(target)):
+        ratio = target[key] / base[key]
+        mark = ''
+        if ratio > args.factor:
+            mark = '  slower'
+            regressed = True
+        elif ratio < 1 / args.factor:
+            mark = '  faster'
+        if mark or args.all:
+            print('{:>10} {:>10} {:6.2f}  {}{}'.format(
+                _format_time(base[key]), _format_time(target[key]), ratio,
+                key, mark))
+    return 1 if regressed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Microbenchmarks of Chainer on CPU')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--bench', '-b', default=None,
+                            help='regular expression to select the '
+                            'benchmarks by their names')
+    run_parser.add_argument('--output', '-o', default=None,
+                            help='path to the JSON file to write the results '
+                            '(default: standard output)')
+    run_parser.add_argument('--repeat', '-r', type=int, default=5,
+                            help='number of the measurements of each '
+                            'benchmark')
+    run_parser.add_argument('--min-time', '-t', type=float, default=0.05,
+                            help='minimum time of a measurement in seconds')
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='compare two results')
+    compare_parser.add_argument('base', help='JSON file of the base results')
+    compare_parser.add_argument('target',
+                                help='JSON file of the results to compare')
+    compare_parser.add_argument('--factor', '-f', type=float, default=1.1,
+                                help='ratio of the times regarded as a '
+                                'significant change')
+    compare_parser.add_argument('--all', '-a', action='store_true',
+                                help='show the benchmarks without '
+                                'significant changes as well')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if args.command == 'run':
+        run(args)
+    elif args.command == 'compare':
+        sys.exit(compare(args))
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""Microbenchmarks of Chainer on CPU.
+
+The benchmarks are written in the style of `airspeed velocity
+<https://asv.readthedocs.io/>`_: each class has ``time_*`` methods measured
+after ``setup`` is called with every combination of ``params``. They can be
+run by asv or by ``run_suite.py`` in the parent directory, which does not
+require asv.
+
+"""
@@ -0,0 +1,12 @@
+import numpy
+
+
+def uniform(shape, dtype=numpy.float32, seed=0):
+    random_state = numpy.random.RandomState(seed)
+    return random_state.uniform(-1, 1, shape).astype(dtype)
+
+
+def parse_shape(shape):
+    # Shapes are given as strings like '32x1024' so that the parameters are
+    # readable in the JSON output.
+    return tuple(int(s) for s in shape.split('x'))
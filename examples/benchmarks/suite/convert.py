@@ -0,0 +1,28 @@
+from chainer.dataset import convert
+
+from suite import common
+
+
+class TimeConcatExamples(object):
+
+    """Time to convert a batch of pairs of an image and a label."""
+
+    params = [[1, 32, 256], ['3x32x32', '3x224x224']]
+    param_names = ['batch_size', 'shape']
+
+    def setup(self, batch_size, shape):
+        shape = common.parse_shape(shape)
+        labels = common.uniform((batch_size,)).astype('i')
+        self.batch = [(common.uniform(shape, seed=i), labels[i])
+                      for i in range(batch_size)]
+
+    def time_concat_examples(self, batch_size, shape):
+        convert.concat_examples(self.batch)
+
+    def time_concat_examples_with_padding(self, batch_size, shape):
+        convert.concat_examples(self.batch, padding=0)
+
+    def time_concat_with_buffer_pool(self, batch_size, shape):
+        if not hasattr(self, 'pool'):
+            self.pool = convert.ConcatWithBufferPool()
+        self.pool(self.batch)
@@ -0,0 +1,107 @@
+import chainer
+import chainer.functions as F
+from chainer import function_node
+
+from suite import common
+
+
+class Nop(function_node.FunctionNode):
+
+    def forward(self, inputs):
+        return inputs[0],
+
+    def backward(self, indexes, grad_outputs):
+        return grad_outputs[0],
+
+
+class TimeApply(object):
+
+    """Overhead of applying a function node to a small array."""
+
+    params = [[True, False], [True, False]]
+    param_names = ['enable_backprop', 'type_check']
+
+    def setup(self, enable_backprop, type_check):
+        self.x = chainer.Variable(common.uniform((2, 3)))
+
+    def time_apply(self, enable_backprop, type_check):
+        with chainer.using_config('enable_backprop', enable_backprop), \
+                chainer.using_config('type_check', type_check):
+            Nop().apply((self.x,))
+
+    def time_add(self, enable_backprop, type_check):
+        with chainer.using_config('enable_backprop', enable_backprop), \
+                chainer.using_config('type_check', type_check):
+            self.x + self.x
+
+
+class TimeBackprop(object):
+
+    """Overhead of the backward propagation through a chain of nodes.
+
+    The difference of ``time_forward_backward`` and ``time_forward`` is the
+    time of :meth:`~chainer.Variable.backward`.
+
+    """
+
+    params = [10, 100]
+    param_names = ['length']
+
+    def setup(self, length):
+        self.x = chainer.Variable(common.uniform((2, 3)))
+
+    def forward(self, length):
+        h = self.x
+        for _ in range(length):
+            h, = Nop().apply((h,))
+        return h
+
+    def time_forward(self, length):
+        self.forward(length)
+
+    def time_forward_backward(self, length):
+        y = self.forward(length)
+        y.grad = self.x.data
+        y.backward()
+
+    def time_branch_backward(self, length):
+        # Every node is used twice, which makes the gradients accumulated.
+        h = self.x
+        for _ in range(length // 2):
+            h = h + h
+        h.grad = self.x.data
+        h.backward()
+
+
+class TimeTypeCheck(object):
+
+    """Overhead of the type check of functions with various attributes.
+
+    The attributes of the functions are scalars (``relu``), tuples
+    (``reshape``), slices (``get_item``) and arrays
+    (``fixed_batch_normalization``).
+
+    """
+
+    params = ['relu', 'reshape', 'get_item', 'fixed_batch_normalization']
+    param_names = ['function']
+
+    def setup(self, function):
+        x = chainer.Variable(common.uniform((2, 3)))
+        gamma = common.uniform((3,))
+        funcs = {
+            'relu': lambda: F.relu(x),
+            'reshape': lambda: F.reshape(x, (3, 2)),
+            'get_item': lambda: F.get_item(x, (slice(None), 0)),
+            'fixed_batch_normalization': lambda: F.fixed_batch_normalization(
+                x, gamma, gamma, gamma, gamma),
+        }
+        self.func = funcs[function]
+
+    def time_apply(self, function):
+        with chainer.using_config('type_check', True):
+            self.func()
+
+    def time_apply_without_type_check(self, function):
+        with chainer.using_config('type_check', False):
+            self.func()
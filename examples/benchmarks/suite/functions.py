@@ -0,0 +1,220 @@
+import numpy
+
+import chainer
+import chainer.functions as F
+
+from suite import common
+
+
+def _floats(*shapes):
+    return lambda: [common.uniform(shape, seed=i)
+                    for i, shape in enumerate(shapes)]
+
+
+def _labels(n, n_class):
+    return numpy.random.RandomState(0).randint(
+        0, n_class, n).astype(numpy.int32)
+
+
+class _FunctionBenchmark(object):
+
+    """Base class of the benchmarks of a family of functions.
+
+    ``functions`` maps the name of each function to a pair of the function
+    and a dictionary mapping the size (``'small'`` or ``'large'``) to a
+    callable making the input arrays. Floating point inputs are given as
+    variables to ``time_forward_backward`` and differentiated.
+
+    """
+
+    functions = {}
+    param_names = ['function', 'size']
+
+    def setup(self, function, size):
+        self.func, make_inputs = self.functions[function]
+        self.inputs = make_inputs[size]()
+        y = self.func(*self.inputs)
+        self.gy = numpy.ones_like(y.data)
+
+    def time_forward(self, function, size):
+        with chainer.no_backprop_mode():
+            self.func(*self.inputs)
+
+    def time_forward_backward(self, function, size):
+        xs = [chainer.Variable(x) if x.dtype.kind == 'f' else x
+              for x in self.inputs]
+        y = self.func(*xs)
+        y.grad = self.gy
+        y.backward()
+
+
+def _unary(func):
+    return func, {'small': _floats((16, 128)),
+                  'large': _floats((128, 2048))}
+
+
+class TimeActivation(_FunctionBenchmark):
+
+    functions = {
+        'relu': _unary(F.relu),
+        'leaky_relu': _unary(F.leaky_relu),
+        'elu': _unary(F.elu),
+        'sigmoid': _unary(F.sigmoid),
+        'tanh': _unary(F.tanh),
+        'softplus': _unary(F.softplus),
+        'softmax': _unary(F.softmax),
+        'log_softmax': _unary(F.log_softmax),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+class TimeArray(_FunctionBenchmark):
+
+    functions = {
+        'reshape': (lambda x: F.reshape(x, (-1,)),
+                    {'small': _floats((16, 128)),
+                     'large': _floats((128, 2048))}),
+        'transpose': (lambda x: F.transpose(x, (0, 2, 3, 1)),
+                      {'small': _floats((8, 16, 8, 8)),
+                       'large': _floats((32, 64, 32, 32))}),
+        'concat': (lambda x, y: F.concat((x, y)),
+                   {'small': _floats((16, 64), (16, 64)),
+                    'large': _floats((128, 1024), (128, 1024))}),
+        'split_axis': (lambda x: F.concat(F.split_axis(x, 4, 1)),
+                       {'small': _floats((16, 128)),
+                        'large': _floats((128, 2048))}),
+        'broadcast_to': (lambda x: F.broadcast_to(x, (64,) + x.shape[1:]),
+                         {'small': _floats((1, 128)),
+                          'large': _floats((1, 4096))}),
+        'get_item': (lambda x: x[:, ::2],
+                     {'small': _floats((16, 128)),
+                      'large': _floats((128, 2048))}),
+        'pad': (lambda x: F.pad(x, ((0, 0), (0, 0), (1, 1), (1, 1)),
+                                'constant'),
+                {'small': _floats((8, 16, 8, 8)),
+                 'large': _floats((32, 64, 32, 32))}),
+        'stack': (lambda x, y: F.stack((x, y)),
+                  {'small': _floats((16, 64), (16, 64)),
+                   'large': _floats((128, 1024), (128, 1024))}),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+class TimeConnection(_FunctionBenchmark):
+
+    functions = {
+        'linear': (F.linear,
+                   {'small': _floats((16, 128), (64, 128), (64,)),
+                    'large': _floats((128, 1024), (1024, 1024), (1024,))}),
+        'convolution_2d': (lambda x, W, b: F.convolution_2d(x, W, b, pad=1),
+                           {'small': _floats((8, 16, 16, 16), (16, 16, 3, 3),
+                                             (16,)),
+                            'large': _floats((16, 32, 32, 32), (32, 32, 3, 3),
+                                             (32,))}),
+        'deconvolution_2d': (
+            lambda x, W, b: F.deconvolution_2d(x, W, b, stride=2),
+            {'small': _floats((8, 16, 8, 8), (16, 16, 2, 2), (16,)),
+             'large': _floats((16, 32, 16, 16), (32, 32, 2, 2), (32,))}),
+        'embed_id': (
+            F.embed_id,
+            {'small': lambda: [_labels(64, 1000),
+                               common.uniform((1000, 64))],
+             'large': lambda: [_labels(4096, 10000),
+                               common.uniform((10000, 256))]}),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+def _classification(n, n_class):
+    return lambda: [common.uniform((n, n_class)), _labels(n, n_class)]
+
+
+class TimeLoss(_FunctionBenchmark):
+
+    functions = {
+        'softmax_cross_entropy': (
+            F.softmax_cross_entropy,
+            {'small': _classification(16, 10),
+             'large': _classification(256, 1000)}),
+        'sigmoid_cross_entropy': (
+            F.sigmoid_cross_entropy,
+            {'small': lambda: [common.uniform((16, 10)),
+                               _labels(160, 2).reshape(16, 10)],
+             'large': lambda: [common.uniform((256, 1000)),
+                               _labels(256000, 2).reshape(256, 1000)]}),
+        'mean_squared_error': (
+            F.mean_squared_error,
+            {'small': _floats((16, 128), (16, 128)),
+             'large': _floats((128, 2048), (128, 2048))}),
+        'huber_loss': (
+            lambda x, t: F.sum(F.huber_loss(x, t, 1)),
+            {'small': _floats((16, 128), (16, 128)),
+             'large': _floats((128, 2048), (128, 2048))}),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+def _binary(func):
+    return func, {'small': _floats((16, 128), (16, 128)),
+                  'large': _floats((128, 2048), (128, 2048))}
+
+
+class TimeMath(_FunctionBenchmark):
+
+    functions = {
+        'add': _binary(lambda x, y: x + y),
+        'mul': _binary(lambda x, y: x * y),
+        'exp': _unary(F.exp),
+        'sum': _unary(lambda x: F.sum(x, axis=1)),
+        'max': _unary(lambda x: F.max(x, axis=1)),
+        'matmul': (F.matmul, {'small': _floats((16, 128), (128, 64)),
+                              'large': _floats((512, 512), (512, 512))}),
+        'batch_matmul': (F.matmul,
+                         {'small': _floats((16, 8, 16), (16, 16, 8)),
+                          'large': _floats((64, 64, 64), (64, 64, 64))}),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+def _images(*channel_shapes):
+    return {'small': _floats((8, 16, 16, 16), *channel_shapes[0]),
+            'large': _floats((32, 64, 32, 32), *channel_shapes[1])}
+
+
+class TimeNormalization(_FunctionBenchmark):
+
+    functions = {
+        'batch_normalization': (F.batch_normalization,
+                                _images([(16,), (16,)], [(64,), (64,)])),
+        'local_response_normalization': (F.local_response_normalization,
+                                         _images([], [])),
+        'normalize': (F.normalize, {'small': _floats((16, 128)),
+                                    'large': _floats((128, 2048))}),
+        'layer_normalization': (F.layer_normalization,
+                                {'small': _floats((16, 128), (128,), (128,)),
+                                 'large': _floats((128, 2048), (2048,),
+                                                  (2048,))}),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+class TimePooling(_FunctionBenchmark):
+
+    functions = {
+        'max_pooling_2d': (lambda x: F.max_pooling_2d(x, 3, 2, 1),
+                           _images([], [])),
+        'average_pooling_2d': (lambda x: F.average_pooling_2d(x, 3, 2, 1),
+                               _images([], [])),
+        'unpooling_2d': (lambda x: F.unpooling_2d(x, 2, cover_all=False),
+                         _images([], [])),
+    }
+    params = [sorted(functions), ['small', 'large']]
+
+
+class TimeNoise(_FunctionBenchmark):
+
+    functions = {
+        'dropout': _unary(F.dropout),
+        'gaussian': _binary(F.gaussian),
+    }
+    params = [sorted(functions), ['small', 'large']]
@@ -0,0 +1,28 @@
+from chainer import iterators
+
+from suite import common
+
+
+class TimeIterators(object):
+
+    """Time to iterate over an epoch of a dataset of arrays."""
+
+    params = [
+        ['SerialIterator', 'MultithreadIterator', 'MultiprocessIterator'],
+        [1, 32],
+        [True, False],
+    ]
+    param_names = ['iterator', 'batch_size', 'shuffle']
+    timeout = 120
+
+    def setup(self, iterator, batch_size, shuffle):
+        self.dataset = common.uniform((1024, 32))
+        self.iterator_class = getattr(iterators, iterator)
+
+    def time_epoch(self, iterator, batch_size, shuffle):
+        it = self.iterator_class(self.dataset, batch_size, repeat=False,
+                                 shuffle=shuffle)
+        for _ in it:
+            pass
+        if hasattr(it, 'finalize'):
+            it.finalize()
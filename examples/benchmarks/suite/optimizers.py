@@ -0,0 +1,51 @@
+import numpy
+
+import chainer
+from chainer import optimizers
+
+from suite import common
+
+
+class ManyParams(chainer.Link):
+
+    def __init__(self, n_params, size):
+        super(ManyParams, self).__init__()
+        with self.init_scope():
+            for i in range(n_params):
+                setattr(self, 'p%d' % i,
+                        chainer.Parameter(common.uniform((size,), seed=i)))
+
+
+class TimeUpdate(object):
+
+    """Time of an update over many parameters.
+
+    The gradients are set in advance, so only the update rules and the hooks
+    are measured.
+
+    """
+
+    params = [
+        ['SGD', 'MomentumSGD', 'NesterovAG', 'AdaGrad', 'AdaDelta', 'Adam',
+         'RMSprop', 'SMORMS3'],
+        ['100x1000', '10x100000'],
+    ]
+    param_names = ['optimizer', 'params']
+
+    def setup(self, optimizer, params):
+        n_params, size = common.parse_shape(params)
+        self.link = ManyParams(n_params, size)
+        for param in self.link.params():
+            param.grad = numpy.full_like(param.data, 1e-3)
+        self.optimizer = getattr(optimizers, optimizer)()
+        self.optimizer.setup(self.link)
+        # Initializes the states of the update rules
+        self.optimizer.update()
+
+    def time_update(self, optimizer, params):
+        self.optimizer.update()
+
+    def time_update_with_weight_decay(self, optimizer, params):
+        if not self.optimizer._hooks:
+            self.optimizer.add_hook(chainer.optimizer.WeightDecay(1e-4))
+        self.optimizer.update()
@@ -0,0 +1,54 @@
+import numpy
+
+import chainer
+from chainer import reporter
+
+
+class TimeDictSummary(object):
+
+    """Time to summarize the observations of 100 iterations."""
+
+    params = [[10, 50], ['scalar', 'variable']]
+    param_names = ['n_keys', 'value']
+
+    def setup(self, n_keys, value):
+        if value == 'scalar':
+            def make(x):
+                return numpy.float32(x)
+        else:
+            def make(x):
+                return chainer.Variable(numpy.array(x, 'f'))
+        self.observations = [
+            {'main/value%d' % k: make(i + k) for k in range(n_keys)}
+            for i in range(100)]
+
+    def time_add(self, n_keys, value):
+        summary = reporter.DictSummary()
+        for observation in self.observations:
+            summary.add(observation)
+        summary.make_statistics()
+
+    def time_add_with_percentiles(self, n_keys, value):
+        summary = reporter.DictSummary(min_max=True, percentiles=(50, 90))
+        for observation in self.observations:
+            summary.add(observation)
+        summary.make_statistics()
+
+
+class TimeReport(object):
+
+    """Time to report variables to an observer."""
+
+    params = [10, 50]
+    param_names = ['n_keys']
+
+    def setup(self, n_keys):
+        self.reporter = reporter.Reporter()
+        self.observer = object()
+        self.reporter.add_observer('main', self.observer)
+        self.values = {'value%d' % k: chainer.Variable(numpy.array(k, 'f'))
+                       for k in range(n_keys)}
+
+    def time_report(self, n_keys):
+        with self.reporter.scope({}):
+            self.reporter.report(self.values, self.observer)
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+
+import chainer
+from chainer import serializers
+
+from suite import common
+
+
+class Model(chainer.Link):
+
+    def __init__(self, n_params, size):
+        super(Model, self).__init__()
+        with self.init_scope():
+            for i in range(n_params):
+                setattr(self, 'p%d' % i,
+                        chainer.Parameter(common.uniform((size,), seed=i)))
+
+
+class TimeSerializers(object):
+
+    """Time to save and load the parameters of a link."""
+
+    params = [['npz', 'npz_compressed', 'npz_level1', 'hdf5', 'hdf5_lzf'],
+              ['100x1000', '10x1000000'], [1, 4]]
+    param_names = ['format', 'params', 'cpu_threads']
+
+    def setup(self, format, params, cpu_threads):
+        if format.startswith('hdf5'):
+            try:
+                import h5py  # NOQA
+            except ImportError:
+                raise NotImplementedError('h5py is not installed')
+        self.link = Model(*common.parse_shape(params))
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'model')
+        self.save(format, cpu_threads)
+
+    def teardown(self, format, params, cpu_threads):
+        shutil.rmtree(self.dir)
+
+    def save(self, format, cpu_threads):
+        compression = {'npz': False, 'npz_compressed': True, 'npz_level1': 1,
+                       'hdf5': 4, 'hdf5_lzf': 'lzf'}[format]
+        with chainer.using_config('cpu_threads', cpu_threads):
+            if format.startswith('hdf5'):
+                serializers.save_hdf5(self.path, self.link, compression)
+            else:
+                serializers.save_npz(self.path, self.link, compression)
+
+    def time_save(self, format, params, cpu_threads):
+        self.save(format, cpu_threads)
+
+    def time_load(self, format, params, cpu_threads):
+        with chainer.using_config('cpu_threads', cpu_threads):
+            if format.startswith('hdf5'):
+                serializers.load_hdf5(self.path, self.link)
+            else:
+                serializers.load_npz(self.path, self.link)
@@ -0,0 +1,48 @@
+import chainer
+import chainer.functions as F
+from chainer import training
+
+from suite import common
+from suite.optimizers import ManyParams
+
+
+class _Loss(ManyParams):
+
+    def __call__(self, x):
+        return sum(F.sum(param) for param in self.params()) * F.sum(x)
+
+
+class TimeParallelUpdater(object):
+
+    """Time of an update of ParallelUpdater with replicas on the host.
+
+    The loss is cheap to compute, so the reduction of the gradients and the
+    broadcast of the parameters dominate the time.
+
+    """
+
+    params = [
+        ['100x1000', '10x100000'],
+        [2, 4],
+    ]
+    param_names = ['params', 'replicas']
+
+    def setup(self, params, replicas):
+        n_params, size = common.parse_shape(params)
+        model = _Loss(n_params, size)
+        optimizer = chainer.optimizers.SGD()
+        optimizer.setup(model)
+        devices = {'main': -1}
+        for i in range(1, replicas):
+            devices['replica%d' % i] = -1
+        dataset = common.uniform((replicas * 4,))
+        iterator = chainer.iterators.SerialIterator(dataset, replicas * 4)
+        self.updater = training.ParallelUpdater(
+            iterator, optimizer, devices=devices)
+        self.updater.update()
+
+    def teardown(self, params, replicas):
+        self.updater.finalize()
+
+    def time_update(self, params, replicas):
+        self.updater.update()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+import argparse
+
+import chainer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pack image files into shard files')
+    parser.add_argument('dataset',
+                        help='Path to image-label list file')
+    parser.add_argument('prefix',
+                        help='Prefix of the paths to output shard files')
+    parser.add_argument('--root', '-R', default='.',
+                        help='Root directory path of image files')
+    parser.add_argument('--shard_size', '-s', type=int, default=1024,
+                        help='Number of images in each shard file')
+    args = parser.parse_args()
+
+    paths = chainer.datasets.create_image_shards(
+        args.dataset, args.prefix, args.root, args.shard_size)
+    print('wrote {} shard files'.format(len(paths)))
+
+
+if __name__ == '__main__':
+    main()
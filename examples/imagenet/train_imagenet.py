@@ -10,6 +10,7 @@ ImageDataLayer).
 """
 from __future__ import print_function
 import argparse
+import glob
 import random
 
 import numpy as np
@@ -28,7 +29,9 @@ import resnet50
 class PreprocessedDataset(chainer.dataset.DatasetMixin):
 
     def __init__(self, path, root, mean, crop_size, random=True):
-        self.base = chainer.datasets.LabeledImageDataset(path, root)
+        # The images are converted to float32 after cropping
+        self.base = chainer.datasets.LabeledImageDataset(
+            path, root, dtype=np.uint8)
         self.mean = mean.astype('f')
         self.crop_size = crop_size
         self.random = random
@@ -60,7 +63,7 @@ class PreprocessedDataset(chainer.dataset.DatasetMixin):
         bottom = top + crop_size
         right = left + crop_size
 
-        image = image[:, top:bottom, left:right]
+        image = image[:, top:bottom, left:right].astype(np.float32)
         image -= self.mean[:, top:bottom, left:right]
         image *= (1.0 / 255.0)  # Scale to [0, 1]
         return image, label
@@ -103,6 +106,10 @@ def main():
                         help='Root directory path of image files')
     parser.add_argument('--val_batchsize', '-b', type=int, default=250,
                         help='Validation minibatch size')
+    parser.add_argument('--shards', action='store_true',
+                        help='Read the images from shard files made by '
+                        'make_shards.py, in which case the train and val '
+                        'arguments are the prefixes of the shard files')
     parser.add_argument('--test', action='store_true')
     parser.set_defaults(test=False)
     args = parser.parse_args()
@@ -118,8 +125,18 @@ def main():
 
     # Load the datasets and mean file
     mean = np.load(args.mean)
-    train = PreprocessedDataset(args.train, args.root, mean, model.insize)
-    val = PreprocessedDataset(args.val, args.root, mean, model.insize, False)
+    if args.shards:
+        train = chainer.datasets.ImageShardDataset(
+            sorted(glob.glob(args.train + '-*.shard')), model.insize,
+            random=True, mean=mean, scale=1.0 / 255.0)
+        val = chainer.datasets.ImageShardDataset(
+            sorted(glob.glob(args.val + '-*.shard')), model.insize,
+            mean=mean, scale=1.0 / 255.0)
+    else:
+        train = PreprocessedDataset(
+            args.train, args.root, mean, model.insize)
+        val = PreprocessedDataset(
+            args.val, args.root, mean, model.insize, False)
     # These iterators load the images with subprocesses running in parallel to
     # the training/validation.
     train_iter = chainer.iterators.MultiprocessIterator(
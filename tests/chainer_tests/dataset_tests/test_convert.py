@@ -1,9 +1,13 @@
+import pickle
+import threading
 import unittest
 
 import numpy
 
 from chainer import cuda
 from chainer import dataset
+from chainer import iterators
+from chainer import serializers
 from chainer import testing
 from chainer.testing import attr
 
@@ -323,4 +327,251 @@ class TestToDeviceMultiGPU(unittest.TestCase):
         self.assertEqual(int(y.device), self.device)
 
 
+@testing.parameterize(*testing.product({
+    'padding': [None, 0],
+    'device': [None, -1],
+}))
+class TestConcatWithBufferPool(unittest.TestCase):
+
+    def setUp(self):
+        self.converter = dataset.ConcatWithBufferPool()
+
+    def make_batch(self, size=3):
+        return [(numpy.random.rand(2, 3).astype(numpy.float32),
+                 numpy.int32(i)) for i in range(size)]
+
+    def check_same(self, actual, expect):
+        self.assertEqual(len(actual), len(expect))
+        for x, y in zip(actual, expect):
+            self.assertEqual(x.dtype, y.dtype)
+            numpy.testing.assert_array_equal(x, y)
+
+    def test_tuple(self):
+        batch = self.make_batch()
+        self.check_same(
+            self.converter(batch, self.device, self.padding),
+            dataset.concat_examples(batch, self.device, self.padding))
+
+    def test_dict(self):
+        batch = [{'x': x, 't': t} for x, t in self.make_batch()]
+        actual = self.converter(batch, self.device, self.padding)
+        expect = dataset.concat_examples(batch, self.device, self.padding)
+        self.assertEqual(sorted(actual.keys()), ['t', 'x'])
+        for key in actual:
+            numpy.testing.assert_array_equal(actual[key], expect[key])
+
+    def test_array(self):
+        batch = [x for x, _ in self.make_batch()]
+        numpy.testing.assert_array_equal(
+            self.converter(batch, self.device, self.padding),
+            dataset.concat_examples(batch, self.device, self.padding))
+
+    def test_reuse(self):
+        x1, _ = self.converter(self.make_batch(), self.device, self.padding)
+        x2, _ = self.converter(self.make_batch(), self.device, self.padding)
+        self.assertFalse(numpy.may_share_memory(x1, x2))
+        batch = self.make_batch()
+        x3, _ = self.converter(batch, self.device, self.padding)
+        self.assertTrue(numpy.may_share_memory(x1, x3))
+        self.check_same(
+            (x3,), dataset.concat_examples(batch, padding=self.padding)[:1])
+
+    def test_reuse_scalars(self):
+        if self.device is not None:
+            return
+        _, t1 = self.converter(self.make_batch(), self.device, self.padding)
+        self.converter(self.make_batch(), self.device, self.padding)
+        _, t3 = self.converter(self.make_batch(), self.device, self.padding)
+        # NumPy scalars are also concatenated into the pooled buffers
+        self.assertTrue(numpy.may_share_memory(t1, t3))
+        numpy.testing.assert_array_equal(t3, [0, 1, 2])
+        self.assertEqual(t3.dtype, numpy.int32)
+
+    def test_smaller_batch(self):
+        self.converter(self.make_batch(4), self.device, self.padding)
+        self.converter(self.make_batch(4), self.device, self.padding)
+        batch = self.make_batch(2)
+        self.check_same(
+            self.converter(batch, self.device, self.padding),
+            dataset.concat_examples(batch, padding=self.padding))
+
+
+class TestConcatWithBufferPoolPadding(unittest.TestCase):
+
+    def test_grow_envelope(self):
+        converter = dataset.ConcatWithBufferPool(n_buffers=1)
+        x1 = converter([numpy.ones((2,), 'f'), numpy.ones((3,), 'f')],
+                       padding=-1)
+        numpy.testing.assert_array_equal(x1, [[1, 1, -1], [1, 1, 1]])
+        x2 = converter([numpy.ones((4,), 'f'), numpy.ones((1,), 'f')],
+                       padding=-1)
+        numpy.testing.assert_array_equal(
+            x2, [[1, 1, 1, 1], [1, -1, -1, -1]])
+        x3 = converter([numpy.ones((1,), 'f'), numpy.ones((2,), 'f')],
+                       padding=-1)
+        self.assertTrue(numpy.may_share_memory(x2, x3))
+        numpy.testing.assert_array_equal(x3, [[1, -1], [1, 1]])
+
+    def test_shape_mismatch(self):
+        converter = dataset.ConcatWithBufferPool()
+        with self.assertRaises(ValueError):
+            converter([numpy.ones((2,), 'f'), numpy.ones((3,), 'f')])
+
+    def test_invalid_n_buffers(self):
+        with self.assertRaises(ValueError):
+            dataset.ConcatWithBufferPool(n_buffers=0)
+
+
+class TestConcatWithBufferPoolThreads(unittest.TestCase):
+
+    @unittest.skipUnless(hasattr(threading, 'Barrier'),
+                         'threading.Barrier is not available')
+    def test_concurrent_calls(self):
+        # Each of the concurrent calls takes its own buffers
+        n_threads = 4
+        converter = dataset.ConcatWithBufferPool(n_buffers=n_threads)
+        barrier = threading.Barrier(n_threads)
+        results = [None] * n_threads
+
+        def convert(i):
+            batch = [numpy.full((2, 3), i, 'f') for _ in range(5)]
+            barrier.wait()
+            for _ in range(100):
+                results[i] = converter(batch)
+                barrier.wait()
+                # Other threads convert their batches while this one is
+                # still in use.
+                numpy.testing.assert_array_equal(results[i], i)
+                barrier.wait()
+
+        threads = [threading.Thread(target=convert, args=(i,))
+                   for i in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(n_threads):
+            for j in range(i):
+                self.assertFalse(
+                    numpy.may_share_memory(results[i], results[j]))
+
+    def test_pickle(self):
+        converter = dataset.ConcatWithBufferPool()
+        converter([numpy.ones((2,), 'f')])
+        converter = pickle.loads(pickle.dumps(converter))
+        numpy.testing.assert_array_equal(
+            converter([numpy.zeros((2,), 'f')]), [[0, 0]])
+
+
+class TestPrefetchConverter(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = [(numpy.full((2, 3), i, dtype=numpy.float32),
+                         numpy.int32(i)) for i in range(10)]
+        self.converted = []
+
+        def converter(batch, device=None):
+            self.converted.append(batch)
+            return dataset.concat_examples(batch, device)
+
+        self.converter = dataset.PrefetchConverter(converter)
+
+    def make_iterator(self, repeat=True):
+        return self.converter.prefetch(
+            iterators.SerialIterator(
+                self.dataset, 3, repeat=repeat, shuffle=False))
+
+    def test_same_batches(self):
+        it = self.make_iterator()
+        expect = iterators.SerialIterator(self.dataset, 3, shuffle=False)
+        for _ in range(8):
+            batch = it.next()
+            expect_batch = expect.next()
+            self.assertEqual(it.epoch, expect.epoch)
+            self.assertEqual(it.epoch_detail, expect.epoch_detail)
+            self.assertEqual(it.previous_epoch_detail,
+                             expect.previous_epoch_detail)
+            self.assertEqual(it.is_new_epoch, expect.is_new_epoch)
+
+            x, t = self.converter(batch)
+            expect_x, expect_t = dataset.concat_examples(expect_batch)
+            numpy.testing.assert_array_equal(x, expect_x)
+            numpy.testing.assert_array_equal(t, expect_t)
+        it.finalize()
+
+    def test_prefetched(self):
+        it = self.make_iterator()
+        # the device is learned by the first call
+        self.converter(it.next())
+        self.converter(it.next())
+        batch = it.next()
+        # the third batch has been converted in the background
+        self.assertTrue(any(b is batch for b in self.converted))
+        self.converter(batch)
+        it.finalize()
+        self.assertEqual(sum(b is batch for b in self.converted), 1)
+
+    def test_other_batch(self):
+        it = self.make_iterator()
+        self.converter(it.next())
+        it.next()
+        batch = self.dataset[:2]
+        x, t = self.converter(batch)
+        self.assertIs(self.converted[-1], batch)
+        self.assertEqual(x.shape, (2, 2, 3))
+        it.finalize()
+
+    def test_stop_iteration(self):
+        it = self.make_iterator(repeat=False)
+        batches = list(it)
+        self.assertEqual(len(batches), 4)
+        it.reset()
+        self.assertEqual(len(list(it)), 4)
+
+    def test_attributes(self):
+        it = self.make_iterator()
+        self.assertIs(it.dataset, self.dataset)
+        self.assertEqual(it.batch_size, 3)
+
+    def test_serialize(self):
+        it = self.make_iterator()
+        expect = iterators.SerialIterator(self.dataset, 3, shuffle=False)
+        for _ in range(2):
+            it.next()
+            expect.next()
+
+        target = {}
+        it.serialize(serializers.DictionarySerializer(target))
+        expect_target = {}
+        expect.serialize(serializers.DictionarySerializer(expect_target))
+        self.assertEqual(sorted(target.keys()), sorted(expect_target.keys()))
+        for key in target:
+            numpy.testing.assert_array_equal(target[key], expect_target[key])
+
+        it = self.make_iterator()
+        it.next()
+        it.serialize(serializers.NpzDeserializer(target))
+        self.assertEqual(it.epoch_detail, expect.epoch_detail)
+        batch = it.next()
+        numpy.testing.assert_array_equal(
+            dataset.concat_examples(batch)[1], [6, 7, 8])
+        it.finalize()
+
+    def test_continue_after_serialize(self):
+        # Taking a snapshot in the middle of an epoch must not skip or
+        # repeat the prefetched batch.
+        it = self.make_iterator()
+        expect = iterators.SerialIterator(self.dataset, 3, shuffle=False)
+        for i in range(8):
+            if i in (2, 3, 5):
+                it.serialize(serializers.DictionarySerializer({}))
+            batch = it.next()
+            expect_batch = expect.next()
+            self.assertEqual(it.epoch_detail, expect.epoch_detail)
+            numpy.testing.assert_array_equal(
+                self.converter(batch)[1],
+                dataset.concat_examples(expect_batch)[1])
+        it.finalize()
+
+
 testing.run_module(__name__, __file__)
@@ -0,0 +1,66 @@
+import threading
+import unittest
+
+import numpy
+
+from chainer import dataset
+from chainer import testing
+
+
+class TestMakeRandomState(unittest.TestCase):
+
+    def test_deterministic(self):
+        x1 = dataset.make_random_state(1, 2, 3).uniform(size=5)
+        x2 = dataset.make_random_state(1, 2, 3).uniform(size=5)
+        numpy.testing.assert_array_equal(x1, x2)
+
+    def test_distinct(self):
+        values = set()
+        for seed, epoch, index in [(1, 2, 3), (0, 2, 3), (1, 0, 3),
+                                   (1, 2, 0), (2, 1, 3), (1, 3, 2)]:
+            random_state = dataset.make_random_state(seed, epoch, index)
+            values.add(random_state.randint(1 << 30))
+        self.assertEqual(len(values), 6)
+
+    def test_numpy_integer(self):
+        x1 = dataset.make_random_state(
+            numpy.uint32(5), numpy.int64(1), numpy.int32(7)).uniform()
+        x2 = dataset.make_random_state(5, 1, 7).uniform()
+        self.assertEqual(x1, x2)
+
+
+class TestExampleRandomScope(unittest.TestCase):
+
+    def test_outside(self):
+        self.assertIs(dataset.get_example_random_state(), numpy.random)
+
+    def test_scope(self):
+        with dataset.example_random_scope(1, 2, 3):
+            random_state = dataset.get_example_random_state()
+            self.assertIs(dataset.get_example_random_state(), random_state)
+            x = random_state.uniform(size=3)
+        expect = dataset.make_random_state(1, 2, 3).uniform(size=3)
+        numpy.testing.assert_array_equal(x, expect)
+        self.assertIs(dataset.get_example_random_state(), numpy.random)
+
+    def test_nested(self):
+        with dataset.example_random_scope(1, 2, 3):
+            outer = dataset.get_example_random_state()
+            with dataset.example_random_scope(1, 2, 4):
+                self.assertIsNot(dataset.get_example_random_state(), outer)
+            self.assertIs(dataset.get_example_random_state(), outer)
+
+    def test_thread_local(self):
+        results = []
+
+        def target():
+            results.append(dataset.get_example_random_state())
+
+        with dataset.example_random_scope(1, 2, 3):
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+        self.assertIs(results[0], numpy.random)
+
+
+testing.run_module(__name__, __file__)
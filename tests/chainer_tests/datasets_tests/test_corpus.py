@@ -0,0 +1,110 @@
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from chainer import datasets
+from chainer import testing
+
+
+_text = u'''the cat sat on the mat
+the dog
+
+a cat and a dog
+'''
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'corpus.txt')
+        with io.open(self.path, 'w', encoding='utf-8') as f:
+            f.write(_text)
+        self.prefix = os.path.join(self.temp_dir, 'corpus')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_vocabulary(self):
+        vocab = datasets.build_vocabulary(self.path)
+        self.assertEqual(vocab['the'], 0)
+        self.assertEqual(vocab['a'], 1)
+        self.assertEqual(vocab['cat'], 2)
+        self.assertEqual(vocab['dog'], 3)
+        self.assertEqual(len(vocab), 8)
+        self.assertEqual(sorted(vocab.values()), list(range(8)))
+
+    def test_build_vocabulary_min_count(self):
+        vocab = datasets.build_vocabulary(
+            self.path, min_count=2, special_tokens=['<UNK>', '<EOS>'])
+        self.assertEqual(
+            vocab, {'<UNK>': 0, '<EOS>': 1, 'the': 2, 'a': 3, 'cat': 4,
+                    'dog': 5})
+
+    def test_build_vocabulary_max_size(self):
+        vocab = datasets.build_vocabulary(
+            [self.path, self.path], max_size=3, special_tokens=['<UNK>'])
+        self.assertEqual(vocab, {'<UNK>': 0, 'the': 1, 'a': 2})
+
+    def check_corpus(self, dataset, vocab, eos):
+        sentences = [line.split() for line in _text.splitlines()]
+        self.assertEqual(len(dataset), len(sentences))
+        for i, sentence in enumerate(sentences):
+            expect = [vocab.get(w, 0) for w in sentence] + eos
+            actual = dataset[i]
+            self.assertIsInstance(actual, numpy.ndarray)
+            self.assertEqual(actual.dtype, numpy.int32)
+            numpy.testing.assert_array_equal(actual, expect)
+        numpy.testing.assert_array_equal(dataset[-1], dataset[3])
+        self.assertEqual(len(dataset[1:3]), 2)
+        self.assertEqual(dataset.offsets[-1], len(dataset.tokens))
+
+    def test_convert_corpus(self):
+        vocab = datasets.build_vocabulary(
+            self.path, min_count=2, special_tokens=['<UNK>', '<EOS>'])
+        dataset = datasets.convert_corpus(
+            self.path, vocab, self.prefix, unknown='<UNK>')
+        self.check_corpus(dataset, vocab, [])
+        self.check_corpus(datasets.CorpusDataset(self.prefix), vocab, [])
+
+    def test_convert_corpus_eos(self):
+        vocab = datasets.build_vocabulary(
+            self.path, min_count=2, special_tokens=['<UNK>', '<EOS>'])
+        dataset = datasets.convert_corpus(
+            self.path, vocab, self.prefix, unknown='<UNK>', eos='<EOS>',
+            chunk_size=2)
+        self.check_corpus(dataset, vocab, [1])
+
+    def test_convert_corpus_unknown_word(self):
+        vocab = datasets.build_vocabulary(self.path, min_count=2)
+        with self.assertRaises(KeyError):
+            datasets.convert_corpus(self.path, vocab, self.prefix)
+
+    def test_index_error(self):
+        vocab = datasets.build_vocabulary(self.path)
+        dataset = datasets.convert_corpus(self.path, vocab, self.prefix)
+        with self.assertRaises(IndexError):
+            dataset[4]
+
+    def test_pickle(self):
+        vocab = datasets.build_vocabulary(self.path)
+        dataset = datasets.convert_corpus(self.path, vocab, self.prefix)
+        dumped = pickle.dumps(dataset)
+        self.assertLess(len(dumped), 1000)
+        loaded = pickle.loads(dumped)
+        self.check_corpus(loaded, vocab, [])
+
+    def test_empty(self):
+        path = os.path.join(self.temp_dir, 'empty.txt')
+        open(path, 'w').close()
+        dataset = datasets.convert_corpus(path, {}, self.prefix)
+        self.assertEqual(len(dataset), 0)
+        self.assertEqual(len(dataset.tokens), 0)
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,175 @@
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from chainer import dataset
+from chainer import datasets
+from chainer.datasets import image_dataset
+from chainer import testing
+
+
+def _encode(image, format):
+    buf = io.BytesIO()
+    image_dataset.Image.fromarray(image).save(buf, format=format)
+    return buf.getvalue()
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageShardDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.images = [
+            numpy.random.randint(0, 256, (8, 10, 3)).astype(numpy.uint8)
+            for _ in range(5)]
+        self.labels = [3, 1, 4, 1, 5]
+        self.paths = []
+        for start, stop in [(0, 3), (3, 5)]:
+            path = os.path.join(self.temp_dir, '%d.shard' % start)
+            with datasets.ImageShardWriter(path) as writer:
+                for i in range(start, stop):
+                    writer.write(_encode(self.images[i], 'PNG'),
+                                 self.labels[i])
+                self.assertEqual(len(writer), stop - start)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_len(self):
+        ds = datasets.ImageShardDataset(self.paths)
+        self.assertEqual(len(ds), 5)
+
+    def test_read_raw(self):
+        ds = datasets.ImageShardDataset(self.paths)
+        data, label = ds.read_raw(3)
+        self.assertEqual(data, _encode(self.images[3], 'PNG'))
+        self.assertEqual(label, 1)
+        data, label = ds.read_raw(-1)
+        self.assertEqual(label, 5)
+        with self.assertRaises(IndexError):
+            ds.read_raw(5)
+
+    def test_get(self):
+        ds = datasets.ImageShardDataset(self.paths)
+        for i in range(5):
+            image, label = ds[i]
+            self.assertEqual(image.dtype, numpy.float32)
+            numpy.testing.assert_array_equal(
+                image, self.images[i].transpose(2, 0, 1))
+            self.assertEqual(label.dtype, numpy.int32)
+            self.assertEqual(label, self.labels[i])
+
+    def test_get_uint8(self):
+        ds = datasets.ImageShardDataset(self.paths[1], dtype=numpy.uint8)
+        image, label = ds[0]
+        self.assertEqual(image.dtype, numpy.uint8)
+        numpy.testing.assert_array_equal(
+            image, self.images[3].transpose(2, 0, 1))
+
+    def test_center_crop(self):
+        mean = numpy.random.uniform(0, 255, (3, 8, 10)).astype(numpy.float32)
+        ds = datasets.ImageShardDataset(
+            self.paths, crop_size=(4, 6), mean=mean, scale=0.5)
+        image, _ = ds[2]
+        self.assertEqual(image.shape, (3, 4, 6))
+        expect = self.images[2].transpose(2, 0, 1).astype(numpy.float32)
+        expect = (expect[:, 2:6, 2:8] - mean[:, 2:6, 2:8]) * 0.5
+        numpy.testing.assert_allclose(image, expect)
+
+    def test_random_crop(self):
+        mean = numpy.random.uniform(0, 255, (3, 8, 10)).astype(numpy.float32)
+        ds = datasets.ImageShardDataset(
+            self.paths, crop_size=5, random=True, mean=mean)
+        with dataset.example_random_scope(0, 0, 4):
+            image, _ = ds[4]
+        with dataset.example_random_scope(0, 0, 4):
+            random_state = dataset.get_example_random_state()
+            top = random_state.randint(0, 4)
+            left = random_state.randint(0, 6)
+            flip = random_state.randint(0, 2)
+        expect = self.images[4].transpose(2, 0, 1).astype(numpy.float32)
+        expect = expect[:, top:top + 5, left:left + 5] - \
+            mean[:, top:top + 5, left:left + 5]
+        if flip:
+            expect = expect[:, :, ::-1]
+        numpy.testing.assert_allclose(image, expect)
+
+    def test_crop_too_large(self):
+        ds = datasets.ImageShardDataset(self.paths, crop_size=9)
+        with self.assertRaises(ValueError):
+            ds[0]
+
+    def test_pickle(self):
+        ds = datasets.ImageShardDataset(self.paths, crop_size=4)
+        ds = pickle.loads(pickle.dumps(ds))
+        self.assertEqual(len(ds), 5)
+        image, label = ds[4]
+        self.assertEqual(image.shape, (3, 4, 4))
+        self.assertEqual(label, 5)
+
+    def test_invalid_file(self):
+        path = os.path.join(self.temp_dir, 'invalid.shard')
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            datasets.ImageShardDataset(path)
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageShardDatasetReducedSize(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'jpeg.shard')
+        image = numpy.random.randint(
+            0, 256, (64, 96, 3)).astype(numpy.uint8)
+        with datasets.ImageShardWriter(self.path) as writer:
+            writer.write(_encode(image, 'JPEG'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_full_size(self):
+        image, _ = datasets.ImageShardDataset(self.path)[0]
+        self.assertEqual(image.shape, (3, 64, 96))
+
+    def test_reduced_size(self):
+        ds = datasets.ImageShardDataset(self.path, min_size=(16, 20))
+        image, _ = ds[0]
+        self.assertEqual(image.shape, (3, 16, 24))
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestCreateImageShards(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_create_image_shards(self):
+        root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        pairs = os.path.join(root, 'labeled_img.lst')
+        paths = datasets.create_image_shards(
+            pairs, os.path.join(self.temp_dir, 'train'), root=root,
+            shard_size=1)
+        self.assertEqual(
+            [os.path.basename(path) for path in paths],
+            ['train-00000.shard', 'train-00001.shard'])
+
+        expect = datasets.LabeledImageDataset(pairs, root=root)
+        actual = datasets.ImageShardDataset(paths)
+        self.assertEqual(len(actual), 2)
+        for i in range(2):
+            numpy.testing.assert_array_equal(actual[i][0], expect[i][0])
+            self.assertEqual(actual[i][1], expect[i][1])
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,121 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from chainer import datasets
+from chainer import testing
+
+
+class TestNpyDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'x.npy')
+        self.x = numpy.random.rand(5, 20, 30).astype(numpy.float32)
+        numpy.save(self.path, self.x)
+        self.dataset = datasets.NpyDataset(self.path)
+
+    def tearDown(self):
+        del self.dataset
+        shutil.rmtree(self.temp_dir)
+
+    def test_len(self):
+        self.assertEqual(len(self.dataset), 5)
+
+    def test_getitem(self):
+        example = self.dataset[2]
+        self.assertIs(type(example), numpy.ndarray)
+        numpy.testing.assert_array_equal(example, self.x[2])
+
+    def check_batch(self, index, expect):
+        batch = self.dataset[index]
+        self.assertIsInstance(batch, list)
+        self.assertEqual(len(batch), len(expect))
+        for x, y in zip(batch, expect):
+            numpy.testing.assert_array_equal(x, y)
+
+    def test_slice(self):
+        self.check_batch(slice(1, 4), self.x[1:4])
+
+    def test_list(self):
+        self.check_batch([4, 0, 2], self.x[[4, 0, 2]])
+
+    def test_array(self):
+        self.check_batch(numpy.array([3, 1]), self.x[[3, 1]])
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.dataset.array[0] = 0
+
+    def test_pickle(self):
+        dumped = pickle.dumps(self.dataset)
+        self.assertLess(len(dumped), self.x.nbytes)
+        loaded = pickle.loads(dumped)
+        numpy.testing.assert_array_equal(loaded[3], self.x[3])
+
+
+class TestNpzDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'data.npz')
+        self.x = numpy.random.rand(5, 20, 30).astype(numpy.float32)
+        self.t = numpy.arange(5, dtype=numpy.int32)
+        self.f = numpy.asfortranarray(numpy.random.rand(5, 4))
+        numpy.savez(self.path, x=self.x, t=self.t, f=self.f)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_keys(self):
+        dataset = datasets.NpzDataset(self.path, ['x', 't'])
+        self.assertEqual(len(dataset), 5)
+        x, t = dataset[3]
+        numpy.testing.assert_array_equal(x, self.x[3])
+        self.assertEqual(t, 3)
+
+    def test_default_keys(self):
+        dataset = datasets.NpzDataset(self.path)
+        self.assertEqual(sorted(dataset.keys), ['f', 't', 'x'])
+        self.assertEqual(len(dataset[0]), 3)
+
+    def test_single_key(self):
+        dataset = datasets.NpzDataset(self.path, 'f')
+        numpy.testing.assert_array_equal(dataset[2], self.f[2])
+        batch = dataset[1:3]
+        self.assertEqual(len(batch), 2)
+        numpy.testing.assert_array_equal(batch[1], self.f[2])
+
+    def test_batch(self):
+        dataset = datasets.NpzDataset(self.path, ['x', 't'])
+        batch = dataset[numpy.array([4, 1])]
+        self.assertEqual(len(batch), 2)
+        for (x, t), i in zip(batch, [4, 1]):
+            numpy.testing.assert_array_equal(x, self.x[i])
+            self.assertEqual(t, i)
+
+    def test_pickle(self):
+        dataset = datasets.NpzDataset(self.path, ['x', 't'])
+        dumped = pickle.dumps(dataset)
+        self.assertLess(len(dumped), self.x.nbytes)
+        x, t = pickle.loads(dumped)[2]
+        numpy.testing.assert_array_equal(x, self.x[2])
+
+    def test_compressed(self):
+        path = os.path.join(self.temp_dir, 'compressed.npz')
+        numpy.savez_compressed(path, x=self.x)
+        with self.assertRaises(ValueError):
+            datasets.NpzDataset(path)
+
+    def test_wrong_length(self):
+        path = os.path.join(self.temp_dir, 'wrong.npz')
+        numpy.savez(path, x=self.x, y=self.t[:3])
+        with self.assertRaises(ValueError):
+            datasets.NpzDataset(path)
+
+
+testing.run_module(__name__, __file__)
@@ -232,4 +232,41 @@ class TestSpatialTransformerSamplerForwardPaddedImage(unittest.TestCase):
                                cuda.to_gpu(self.expected))
 
 
+@testing.parameterize(*testing.product({
+    'use_cudnn': ['always', 'never'],
+}))
+class TestSpatialTransformerSamplerBackwardIdentity(unittest.TestCase):
+
+    in_shape = (3, 2, 4, 5)
+
+    def setUp(self):
+        self.x = numpy.random.uniform(
+            size=self.in_shape).astype(numpy.float32)
+        mesh = numpy.meshgrid(
+            numpy.linspace(-1., 1., num=self.in_shape[3]),
+            numpy.linspace(-1., 1., num=self.in_shape[2]))
+        grid = numpy.concatenate([mesh[0][None], mesh[1][None]], axis=0)
+        self.grid = numpy.repeat(
+            grid[None], self.in_shape[0], axis=0).astype(numpy.float32)
+        self.gy = numpy.random.uniform(
+            size=self.in_shape).astype(numpy.float32)
+
+    def check_backward(self, x, grid, gy):
+        x = Variable(x)
+        y = functions.spatial_transformer_sampler(x, grid)
+        y.grad = gy
+        y.backward()
+        # Each pixel of each image is sampled exactly once with weight one
+        testing.assert_allclose(x.grad, self.gy)
+
+    def test_backward_cpu(self):
+        self.check_backward(self.x, self.grid, self.gy)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        with chainer.using_config('use_cudnn', self.use_cudnn):
+            self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.grid),
+                                cuda.to_gpu(self.gy))
+
+
 testing.run_module(__name__, __file__)
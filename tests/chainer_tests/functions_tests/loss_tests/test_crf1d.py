@@ -9,6 +9,7 @@ from chainer import functions
 from chainer import gradient_check
 from chainer import testing
 from chainer.testing import attr
+from chainer.utils import type_check
 
 
 @testing.parameterize(*testing.product_dict(
@@ -105,6 +106,12 @@ class TestCRF1d(unittest.TestCase):
                             [cuda.to_gpu(y) for y in self.ys],
                             cuda.to_gpu(self.g))
 
+    def test_single_function_node(self):
+        cost = chainer.Variable(self.cost)
+        xs = [chainer.Variable(x) for x in self.xs]
+        loss = functions.crf1d(cost, xs, self.ys, reduce=self.reduce)
+        self.assertIsInstance(loss.creator, functions.loss.crf1d.CRF1d)
+
     def check_argmax(self, cost_data, xs_data):
         cost = chainer.Variable(cost_data)
         xs = [chainer.Variable(x) for x in xs_data]
@@ -137,6 +144,21 @@ class TestCRF1d(unittest.TestCase):
             numpy.testing.assert_array_equal(
                 cuda.to_cpu(path[t]), best_paths[t])
 
+        # The score is backpropagated to the inputs along the best path.
+        s.grad = cuda.get_array_module(s.data).ones_like(s.data)
+        s.backward()
+        if len(best_paths) > 1:
+            expected_gcost = numpy.zeros_like(self.cost)
+            for p1, p2 in zip(best_paths[:-1], best_paths[1:]):
+                numpy.add.at(expected_gcost, (p1[:len(p2)], p2), 1)
+            testing.assert_allclose(cuda.to_cpu(cost.grad), expected_gcost)
+        else:
+            self.assertIsNone(cost.grad)
+        for x, p in zip(xs, best_paths):
+            expected_gx = numpy.zeros_like(x.grad)
+            expected_gx[numpy.arange(len(p)), p] = 1
+            testing.assert_allclose(cuda.to_cpu(x.grad), expected_gx)
+
     def test_argmax_cpu(self):
         self.check_argmax(self.cost, self.xs)
 
@@ -160,4 +182,31 @@ class TestCRF1d(unittest.TestCase):
             [cuda.to_gpu(y) for y in self.ys])
 
 
+@testing.parameterize(
+    {'ys': [numpy.zeros((2,), numpy.float32)]},
+    {'ys': [numpy.zeros((2, 1), numpy.int32)]},
+    {'ys': [numpy.zeros((3,), numpy.int32)]},
+    {'ys': [numpy.zeros((2,), numpy.int32)] * 2},
+)
+class TestCRF1dInvalidLabels(unittest.TestCase):
+
+    def setUp(self):
+        self.cost = numpy.zeros((3, 3), numpy.float32)
+        self.xs = [numpy.zeros((2, 3), numpy.float32)]
+
+    def check_invalid_labels(self, cost_data, xs_data, ys_data):
+        with self.assertRaises(type_check.InvalidType):
+            functions.crf1d(cost_data, xs_data, ys_data)
+
+    def test_invalid_labels_cpu(self):
+        self.check_invalid_labels(self.cost, self.xs, self.ys)
+
+    @attr.gpu
+    def test_invalid_labels_gpu(self):
+        self.check_invalid_labels(
+            cuda.to_gpu(self.cost),
+            [cuda.to_gpu(x) for x in self.xs],
+            [cuda.to_gpu(y) for y in self.ys])
+
+
 testing.run_module(__name__, __file__)
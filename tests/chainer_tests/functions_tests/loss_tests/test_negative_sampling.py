@@ -106,6 +106,25 @@ class TestNegativeSamplingFunction(unittest.TestCase):
             make_sampler(cuda.cupy, self.label_size))
 
 
+class TestNegativeSamplingAllIgnored(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3)).astype(numpy.float32)
+        self.t = numpy.array([-1, -1], numpy.int32)
+        self.w = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+
+    def test_backward_cpu(self):
+        x = chainer.Variable(self.x)
+        w = chainer.Variable(self.w)
+        y = functions.negative_sampling(
+            x, self.t, w, make_sampler(numpy, 5), 2, reduce='no')
+        y.grad = numpy.ones_like(y.data)
+        y.backward()
+        testing.assert_allclose(y.data, numpy.zeros(2, numpy.float32))
+        testing.assert_allclose(x.grad, numpy.zeros_like(self.x))
+        testing.assert_allclose(w.grad, numpy.zeros_like(self.w))
+
+
 class TestNegativeSamplingInvalidReductionOption(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,153 @@
+import unittest
+
+import numpy
+import six
+
+import chainer
+from chainer import cuda
+from chainer import functions
+from chainer import gradient_check
+from chainer import testing
+from chainer.testing import attr
+
+
+@testing.parameterize(*testing.product({
+    'param_shape': [(3,), (3, 4)],
+    'ndim': [0, 2],
+    'slope': [0.0, 0.1],
+    'inplace': [False, True],
+    'dtype': [numpy.float32, numpy.float64],
+}))
+@testing.fix_random()
+class TestBatchNormalizationReLU(unittest.TestCase):
+
+    def setUp(self):
+        self.eps = 2e-5
+        self.decay = 0.9
+        self.gamma = numpy.random.uniform(
+            .5, 1, self.param_shape).astype(self.dtype)
+        self.beta = numpy.random.uniform(
+            -1, 1, self.param_shape).astype(self.dtype)
+        shape = (5,) + self.param_shape + (2,) * self.ndim
+        self.x = numpy.random.uniform(-1, 1, shape).astype(self.dtype)
+        self.gy = numpy.random.uniform(-1, 1, shape).astype(self.dtype)
+        self.ggx = numpy.random.uniform(-1, 1, shape).astype(self.dtype)
+        self.gggamma = numpy.random.uniform(
+            -1, 1, self.param_shape).astype(self.dtype)
+        self.ggbeta = numpy.random.uniform(
+            -1, 1, self.param_shape).astype(self.dtype)
+        head_ndim = self.gamma.ndim + 1
+        self.aggr_axes = (0,) + tuple(six.moves.range(head_ndim, self.x.ndim))
+        self.check_forward_options = {'atol': 1e-4, 'rtol': 1e-3}
+        self.check_backward_options = {
+            'dtype': numpy.float64, 'atol': 1e-3, 'rtol': 1e-2}
+
+    def reference(self, x, gamma, beta, running_mean, running_var):
+        h = functions.batch_normalization(
+            x, gamma, beta, eps=self.eps, running_mean=running_mean,
+            running_var=running_var, decay=self.decay)
+        if self.slope == 0:
+            return functions.relu(h)
+        return functions.leaky_relu(h, self.slope)
+
+    def fused(self, x, gamma, beta, running_mean, running_var):
+        return functions.batch_normalization_relu(
+            x, gamma, beta, eps=self.eps, running_mean=running_mean,
+            running_var=running_var, decay=self.decay, slope=self.slope,
+            inplace=self.inplace)
+
+    def check_forward(self, args):
+        xp = cuda.get_array_module(args[0])
+        results = []
+        for f in (self.reference, self.fused):
+            x, gamma, beta = [chainer.Variable(a.copy()) for a in args]
+            running_mean = xp.zeros_like(args[1])
+            running_var = xp.ones_like(args[1])
+            # The input is an intermediate variable, whose data can be
+            # overwritten.
+            y = f(x * 1, gamma, beta, running_mean, running_var)
+            self.assertEqual(y.data.dtype, self.dtype)
+            y.grad = xp.asarray(self.gy)
+            y.backward()
+            results.append((y.data, running_mean, running_var,
+                            x.grad, gamma.grad, beta.grad))
+
+        for expect, actual in zip(*results):
+            testing.assert_allclose(
+                expect, actual, **self.check_forward_options)
+
+    def test_forward_cpu(self):
+        self.check_forward([self.x, self.gamma, self.beta])
+
+    @attr.gpu
+    def test_forward_gpu(self):
+        self.check_forward([cuda.to_gpu(self.x), cuda.to_gpu(self.gamma),
+                            cuda.to_gpu(self.beta)])
+
+    def check_inplace(self, args):
+        x, gamma, beta = [chainer.Variable(a) for a in args]
+        h = x * 1
+        h_data_id = id(h.data)
+        y = self.fused(h, gamma, beta, None, None)
+        # The output overwrites the input only if the input can be recovered
+        # from the output.
+        self.assertEqual(id(y.data) == h_data_id,
+                         self.inplace and self.slope > 0)
+
+    def test_inplace_cpu(self):
+        self.check_inplace([self.x, self.gamma, self.beta])
+
+    @attr.gpu
+    def test_inplace_gpu(self):
+        self.check_inplace([cuda.to_gpu(self.x), cuda.to_gpu(self.gamma),
+                            cuda.to_gpu(self.beta)])
+
+    def check_backward(self, args, y_grad):
+        def f(x, gamma, beta):
+            return self.fused(x * 1, gamma, beta, None, None)
+
+        gradient_check.check_backward(
+            f, args, y_grad, **self.check_backward_options)
+
+    def test_backward_cpu(self):
+        self.check_backward([self.x, self.gamma, self.beta], self.gy)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        self.check_backward(
+            [cuda.to_gpu(self.x), cuda.to_gpu(self.gamma),
+             cuda.to_gpu(self.beta)], cuda.to_gpu(self.gy))
+
+    def check_double_backward(self, args, y_grad, x_grad_grad):
+        def f(x, gamma, beta):
+            y = self.fused(x * 1, gamma, beta, None, None)
+            return y * y  # make nonlinear against beta
+
+        gradient_check.check_double_backward(
+            f, args, y_grad, x_grad_grad, **self.check_backward_options)
+
+    def test_double_backward_cpu(self):
+        self.check_double_backward(
+            [self.x, self.gamma, self.beta], self.gy,
+            [self.ggx, self.gggamma, self.ggbeta])
+
+    @attr.gpu
+    def test_double_backward_gpu(self):
+        self.check_double_backward(
+            [cuda.to_gpu(self.x), cuda.to_gpu(self.gamma),
+             cuda.to_gpu(self.beta)], cuda.to_gpu(self.gy),
+            [cuda.to_gpu(self.ggx), cuda.to_gpu(self.gggamma),
+             cuda.to_gpu(self.ggbeta)])
+
+
+class TestBatchNormalizationReLUInvalidSlope(unittest.TestCase):
+
+    def test_negative_slope(self):
+        x = numpy.zeros((2, 3), numpy.float32)
+        gamma = numpy.ones((3,), numpy.float32)
+        beta = numpy.zeros((3,), numpy.float32)
+        with self.assertRaises(ValueError):
+            functions.batch_normalization_relu(x, gamma, beta, slope=-0.1)
+
+
+testing.run_module(__name__, __file__)
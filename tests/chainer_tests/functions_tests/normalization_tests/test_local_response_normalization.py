@@ -66,4 +66,26 @@ class TestLocalResponseNormalization(unittest.TestCase):
         self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.gy))
 
 
+class TestLocalResponseNormalizationCPUThreads(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(
+            -1, 1, (8, 16, 32, 32)).astype(numpy.float32)
+
+    def forward_backward(self, cpu_threads):
+        x = chainer.Variable(self.x)
+        with chainer.using_config('cpu_threads', cpu_threads):
+            y = functions.local_response_normalization(x)
+            y.grad = numpy.ones_like(y.data)
+            y.backward()
+        return y.data, x.grad
+
+    def test_chunks(self):
+        # The mini-batch is large enough to be split into chunks
+        y_expect, gx_expect = self.forward_backward(1)
+        y, gx = self.forward_backward(4)
+        testing.assert_allclose(y_expect, y)
+        testing.assert_allclose(gx_expect, gx)
+
+
 testing.run_module(__name__, __file__)
@@ -238,4 +238,26 @@ class TestMaxPooling2DCudnnCall(unittest.TestCase):
             self.assertEqual(func.called, expect)
 
 
+class TestMaxPooling2DCPUThreads(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(
+            -1, 1, (8, 16, 33, 33)).astype(numpy.float32)
+
+    def forward_backward(self, cpu_threads):
+        x = chainer.Variable(self.x)
+        with chainer.using_config('cpu_threads', cpu_threads):
+            y = functions.max_pooling_2d(x, 3, stride=2, pad=1)
+            y.grad = numpy.ones_like(y.data)
+            y.backward()
+        return y.data, x.grad
+
+    def test_chunks(self):
+        # The mini-batch is large enough to be split into chunks
+        y_expect, gx_expect = self.forward_backward(1)
+        y, gx = self.forward_backward(4)
+        testing.assert_allclose(y_expect, y)
+        testing.assert_allclose(gx_expect, gx)
+
+
 testing.run_module(__name__, __file__)
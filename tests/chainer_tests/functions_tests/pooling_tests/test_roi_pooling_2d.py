@@ -48,6 +48,42 @@ class TestROIPooling2D(unittest.TestCase):
     def test_forward_cpu(self):
         self.check_forward(self.x, self.rois)
 
+    def test_forward_cpu_values(self):
+        y = functions.roi_pooling_2d(
+            self.x, self.rois, outh=self.outh, outw=self.outw,
+            spatial_scale=self.spatial_scale)
+        height, width = self.x.shape[2:]
+        for i_roi, roi in enumerate(self.rois):
+            idx = int(roi[0])
+            xmin, ymin, xmax, ymax = [
+                int(round(float(v) * self.spatial_scale)) for v in roi[1:]]
+            strideh = max(ymax - ymin + 1, 1) / float(self.outh)
+            stridew = max(xmax - xmin + 1, 1) / float(self.outw)
+            for ph in range(self.outh):
+                hstart = min(max(
+                    int(numpy.floor(ph * strideh)) + ymin, 0), height)
+                hend = min(max(
+                    int(numpy.ceil((ph + 1) * strideh)) + ymin, 0), height)
+                for pw in range(self.outw):
+                    wstart = min(max(
+                        int(numpy.floor(pw * stridew)) + xmin, 0), width)
+                    wend = min(max(
+                        int(numpy.ceil((pw + 1) * stridew)) + xmin, 0),
+                        width)
+                    patch = self.x[idx, :, hstart:hend, wstart:wend]
+                    numpy.testing.assert_array_equal(
+                        y.data[i_roi, :, ph, pw], patch.max(axis=(1, 2)))
+
+    def test_backward_cpu_roi_outside(self):
+        # RoIs partially outside of the image
+        rois = numpy.array([
+            [0, -3, -4, 4, 5],
+            [1, 5, 8, 20, 30],
+        ], dtype=numpy.float32)
+        gy = numpy.random.uniform(
+            -1, 1, (2, 3, self.outh, self.outw)).astype(numpy.float32)
+        self.check_backward(self.x, rois, gy)
+
     @attr.gpu
     def test_forward_gpu(self):
         self.check_forward(cuda.to_gpu(self.x), cuda.to_gpu(self.rois))
@@ -13,6 +13,7 @@ import unittest
 import numpy
 import six
 
+from chainer import dataset as dataset_module
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -391,6 +392,111 @@ class TestMultiprocessIteratorSerialize(unittest.TestCase):
         self.assertAlmostEqual(it.previous_epoch_detail, 4 / 6)
 
 
+class SkewedCostDataset(object):
+
+    def __init__(self, n):
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        # Every fourth example is slow to load
+        if i % 4 == 0:
+            time.sleep(0.05)
+        return numpy.full((3,), i, dtype=numpy.float32), i
+
+
+@testing.parameterize(*testing.product({
+    'n_prefetch': [1, 3],
+    'shared_mem': [None, 1000],
+}))
+class TestMultiprocessIteratorSkewedCost(unittest.TestCase):
+
+    def test_order(self):
+        dataset = SkewedCostDataset(12)
+        it = iterators.MultiprocessIterator(
+            dataset, 3, shuffle=False, n_processes=3,
+            n_prefetch=self.n_prefetch, shared_mem=self.shared_mem)
+        for epoch in range(2):
+            for i in range(4):
+                batch = it.next()
+                expect = list(range(i * 3, (i + 1) * 3))
+                self.assertEqual([t for _, t in batch], expect)
+                for x, t in batch:
+                    numpy.testing.assert_array_equal(x, numpy.full((3,), t))
+                self.assertEqual(it.is_new_epoch, i == 3)
+            self.assertEqual(it.epoch, epoch + 1)
+        it.finalize()
+
+    def test_reset_with_batches_in_flight(self):
+        dataset = SkewedCostDataset(12)
+        it = iterators.MultiprocessIterator(
+            dataset, 3, shuffle=False, n_processes=3,
+            n_prefetch=self.n_prefetch, shared_mem=self.shared_mem)
+        it.next()
+        it.next()
+        it.reset()
+        batch = it.next()
+        self.assertEqual([t for _, t in batch], [0, 1, 2])
+        self.assertAlmostEqual(it.epoch_detail, 3 / 12)
+        it.finalize()
+
+
+class RandomDataset(object):
+
+    def __len__(self):
+        return 7
+
+    def __getitem__(self, i):
+        random_state = dataset_module.get_example_random_state()
+        return i, random_state.randint(1 << 30)
+
+
+@testing.parameterize(*testing.product({
+    'n_processes': [1, 3],
+    'n_prefetch': [1, 2],
+}))
+class TestMultiprocessIteratorExampleRandom(unittest.TestCase):
+
+    def create_iterator(self):
+        return iterators.MultiprocessIterator(
+            RandomDataset(), 3, n_processes=self.n_processes,
+            n_prefetch=self.n_prefetch, seed=12345)
+
+    def check_batch(self, batch, epoch):
+        for index, value in batch:
+            random_state = dataset_module.make_random_state(
+                12345, epoch, index)
+            self.assertEqual(value, random_state.randint(1 << 30))
+
+    def test_example_random_state(self):
+        it = self.create_iterator()
+        self.check_batch(it.next(), 0)
+        self.check_batch(it.next(), 0)
+        # the third batch is across the end of the first epoch
+        batch = it.next()
+        self.check_batch(batch[:1], 0)
+        self.check_batch(batch[1:], 1)
+        it.finalize()
+
+    def test_serialize(self):
+        it = self.create_iterator()
+        it.next()
+        target = {}
+        it.serialize(DummySerializer(target))
+        expect = it.next()
+        it.finalize()
+
+        it = iterators.MultiprocessIterator(
+            RandomDataset(), 3, n_processes=self.n_processes,
+            n_prefetch=self.n_prefetch)
+        it.serialize(DummyDeserializer(target))
+        self.assertEqual(it.seed, 12345)
+        self.assertEqual(sorted(it.next()), sorted(expect))
+        it.finalize()
+
+
 class TestMultiprocessIteratorConcurrency(unittest.TestCase):
 
     def test_finalize_not_deadlock(self):
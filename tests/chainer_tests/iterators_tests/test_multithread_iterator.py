@@ -5,6 +5,7 @@ import unittest
 import numpy
 import six
 
+from chainer import dataset as dataset_module
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -327,4 +328,55 @@ class TestMultithreadIteratorSerialize(unittest.TestCase):
         self.assertAlmostEqual(it.previous_epoch_detail, 4 / 6)
 
 
+class RandomDataset(object):
+
+    def __len__(self):
+        return 7
+
+    def __getitem__(self, i):
+        random_state = dataset_module.get_example_random_state()
+        return i, random_state.randint(1 << 30)
+
+
+@testing.parameterize(*testing.product({
+    'n_threads': [1, 3],
+}))
+class TestMultithreadIteratorExampleRandom(unittest.TestCase):
+
+    def create_iterator(self):
+        return iterators.MultithreadIterator(
+            RandomDataset(), 3, n_threads=self.n_threads, seed=12345)
+
+    def check_batch(self, batch, epoch):
+        for index, value in batch:
+            random_state = dataset_module.make_random_state(
+                12345, epoch, index)
+            self.assertEqual(value, random_state.randint(1 << 30))
+
+    def test_example_random_state(self):
+        it = self.create_iterator()
+        self.check_batch(it.next(), 0)
+        self.check_batch(it.next(), 0)
+        # the third batch is across the end of the first epoch
+        batch = it.next()
+        self.check_batch(batch[:1], 0)
+        self.check_batch(batch[1:], 1)
+        it.finalize()
+
+    def test_serialize(self):
+        it = self.create_iterator()
+        it.next()
+        target = {}
+        it.serialize(DummySerializer(target))
+        expect = it.next()
+        it.finalize()
+
+        it = iterators.MultithreadIterator(
+            RandomDataset(), 3, n_threads=self.n_threads)
+        it.serialize(DummyDeserializer(target))
+        self.assertEqual(it.seed, 12345)
+        self.assertEqual(sorted(it.next()), sorted(expect))
+        it.finalize()
+
+
 testing.run_module(__name__, __file__)
@@ -1,6 +1,7 @@
 import os
 import tempfile
 import unittest
+import zipfile
 
 import mock
 import numpy
@@ -374,6 +375,77 @@ class TestSaveNpz(unittest.TestCase):
         self.assertIsInstance(serializer, npz.DictionarySerializer)
 
 
+@testing.parameterize(*testing.product({
+    'compression': [False, True, 1, 9],
+    'cpu_threads': [1, 3],
+}))
+class TestSaveNpzCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.link = link.Chain()
+        with self.link.init_scope():
+            self.link.linear = links.Linear(30, 20)
+            self.link.linear.add_persistent(
+                'obj', numpy.array([1, None], dtype=object))
+        self.file = six.BytesIO()
+
+    def save(self):
+        with chainer.using_config('cpu_threads', self.cpu_threads):
+            npz.save_npz(self.file, self.link, self.compression)
+        self.file.seek(0)
+
+    def check_zip(self):
+        with zipfile.ZipFile(self.file) as z:
+            self.assertIsNone(z.testzip())
+            compress_types = {info.compress_type for info in z.infolist()}
+        self.file.seek(0)
+        if self.compression:
+            self.assertEqual(compress_types, {zipfile.ZIP_DEFLATED})
+        else:
+            self.assertEqual(compress_types, {zipfile.ZIP_STORED})
+
+    def check_load(self):
+        with numpy.load(self.file) as f:
+            self.assertEqual(sorted(f.files),
+                             ['linear/W', 'linear/b', 'linear/obj'])
+            numpy.testing.assert_array_equal(
+                f['linear/W'], self.link.linear.W.data)
+        self.file.seek(0)
+
+        target = link.Chain()
+        with target.init_scope():
+            target.linear = links.Linear(30, 20)
+        # The object array is not loaded, so it does not matter that it
+        # cannot be read without pickle.
+        with chainer.using_config('cpu_threads', self.cpu_threads):
+            npz.load_npz(self.file, target)
+        numpy.testing.assert_array_equal(
+            target.linear.W.data, self.link.linear.W.data)
+        numpy.testing.assert_array_equal(
+            target.linear.b.data, self.link.linear.b.data)
+
+    def test_save(self):
+        self.save()
+        self.check_zip()
+        self.check_load()
+
+    def test_save_zip64(self):
+        # Makes every entry and the directory exceed the limits of the zip
+        # format without zip64 extensions.
+        with mock.patch.object(npz, '_ZIP64_LIMIT', 16), \
+                mock.patch.object(npz, '_ZIP_FILECOUNT_LIMIT', 1):
+            self.save()
+        self.check_zip()
+        self.check_load()
+
+
+class TestSaveNpzInvalidCompression(unittest.TestCase):
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            npz.save_npz(six.BytesIO(), link.Link(), 10)
+
+
 @testing.parameterize(*testing.product({
     'compress': [False, True],
     'file_type': ['filename', 'bytesio'],
@@ -318,6 +318,39 @@ Actual: 1 < 2"""
             f(v)
 
 
+class CountingCheckFunction(chainer.Function):
+
+    n_checks = 0
+
+    def __init__(self, ndim):
+        self.ndim = ndim
+
+    def check_type_forward(self, in_types):
+        CountingCheckFunction.n_checks += 1
+        x_type, = in_types
+        type_check.expect(x_type.ndim == self.ndim)
+
+    def forward(self, inputs):
+        return inputs
+
+
+class TestFunctionTypeCheckCache(unittest.TestCase):
+
+    def setUp(self):
+        CountingCheckFunction.n_checks = 0
+        chainer.function_node._type_check_caches.pop(
+            CountingCheckFunction, None)
+
+    def test_type_check_cache(self):
+        x = numpy.zeros((2, 3), numpy.float32)
+        for _ in range(2):
+            CountingCheckFunction(2)(x)
+        self.assertEqual(CountingCheckFunction.n_checks, 1)
+        with self.assertRaises(type_check.InvalidType):
+            CountingCheckFunction(1)(x)
+        self.assertEqual(CountingCheckFunction.n_checks, 3)
+
+
 @testing.parameterize(
     {'return_value': (numpy.array([float('nan')], numpy.float32),),
      'valid': False},
@@ -299,6 +299,100 @@ Actual: 1 < 2"""
             f.apply((v,))
 
 
+class CountingCheckFunctionNode(chainer.FunctionNode):
+
+    n_checks = 0
+
+    def __init__(self, ndim=2, extra=None):
+        self.ndim = ndim
+        if extra is not None:
+            self.extra = extra
+
+    def check_type_forward(self, in_types):
+        CountingCheckFunctionNode.n_checks += 1
+        x_type, = in_types
+        type_check.expect(x_type.ndim == self.ndim)
+
+    def forward(self, inputs):
+        return inputs
+
+
+class TestFunctionNodeTypeCheckCache(unittest.TestCase):
+
+    def setUp(self):
+        CountingCheckFunctionNode.n_checks = 0
+        chainer.function_node._type_check_caches.pop(
+            CountingCheckFunctionNode, None)
+        self.x = numpy.zeros((2, 3), numpy.float32)
+
+    def apply(self, x, *args, **kwargs):
+        CountingCheckFunctionNode(*args, **kwargs).apply((x,))
+
+    def test_same_signature(self):
+        for _ in range(3):
+            self.apply(self.x)
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 1)
+
+    def test_different_signature(self):
+        self.apply(self.x)
+        self.apply(numpy.zeros((4, 3), numpy.float32))
+        self.apply(self.x.astype(numpy.float64))
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 3)
+
+    def test_different_attribute(self):
+        self.apply(self.x)
+        self.apply(self.x, extra=(1, 2))
+        self.apply(self.x, extra=(1, 2))
+        self.apply(self.x, extra=(1, 3))
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 3)
+        with self.assertRaises(type_check.InvalidType):
+            self.apply(self.x, ndim=1)
+
+    def test_array_attribute(self):
+        for _ in range(2):
+            self.apply(self.x, extra=numpy.zeros(3))
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 2)
+        # The cache of the class is disabled.
+        for _ in range(2):
+            self.apply(self.x)
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 4)
+
+    def test_object_attribute(self):
+        for _ in range(2):
+            self.apply(self.x, extra=object())
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 2)
+        self.assertIsNone(chainer.function_node._type_check_caches[
+            CountingCheckFunctionNode])
+
+    def test_invalid_type_is_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(type_check.InvalidType):
+                self.apply(numpy.zeros(3, numpy.float32))
+        self.assertNotIn(
+            CountingCheckFunctionNode,
+            [cls for cls, cache in
+             six.iteritems(chainer.function_node._type_check_caches)
+             if cache])
+
+    def test_invalid_type_is_not_chained(self):
+        with self.assertRaises(type_check.InvalidType) as cm:
+            self.apply(numpy.zeros(3, numpy.float32))
+        self.assertIsNone(cm.exception.__context__)
+
+    def test_cache_size(self):
+        size = chainer.function_node._TYPE_CHECK_CACHE_SIZE
+        for i in range(size + 1):
+            self.apply(numpy.zeros((i + 1, 3), numpy.float32))
+        cache = chainer.function_node._type_check_caches[
+            CountingCheckFunctionNode]
+        self.assertEqual(len(cache), 1)
+
+    def test_type_check_disabled(self):
+        with chainer.using_config('type_check', False):
+            self.apply(self.x)
+        self.assertEqual(CountingCheckFunctionNode.n_checks, 0)
+
+
 @testing.parameterize(
     {'return_value': (numpy.array([float('nan')], numpy.float32),),
      'valid': False},
@@ -412,6 +506,48 @@ class TestNoBackpropMode(unittest.TestCase):
         self.assertTrue(y.creator_node is not None)
 
 
+class TestInferenceMode(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.array([1, -2], 'f')
+
+    def test_arrays(self):
+        with chainer.using_config('inference', True):
+            y = chainer.functions.relu(self.x)
+        self.assertIsInstance(y, numpy.ndarray)
+        numpy.testing.assert_array_equal(y, [1, 0])
+
+    def test_variables(self):
+        x = chainer.Variable(self.x)
+        w = chainer.Parameter(numpy.array([2, 3], 'f'))
+        with chainer.using_config('inference', True):
+            y, = chainer.FunctionNode.apply(
+                chainer.functions.math.basic_math.Mul(), (x, w))
+        self.assertIsInstance(y, numpy.ndarray)
+        numpy.testing.assert_array_equal(y, [2, -6])
+        self.assertIsNone(x.grad)
+
+    def test_link(self):
+        link = chainer.links.Linear(2, 3)
+        expect = link(self.x[None]).data
+        with chainer.using_config('inference', True):
+            y = link(self.x[None])
+        self.assertIsInstance(y, numpy.ndarray)
+        numpy.testing.assert_array_equal(y, expect)
+
+    def test_no_hooks(self):
+        with chainer.using_config('inference', True), \
+                chainer.function_hooks.TimerHook() as hook:
+            chainer.functions.relu(self.x)
+        self.assertEqual(hook.call_history, [])
+
+    def test_type_check(self):
+        f = CountingCheckFunctionNode(ndim=2)
+        with chainer.using_config('inference', True):
+            with self.assertRaises(type_check.InvalidType):
+                f.apply((self.x,))
+
+
 class MyThread(threading.Thread):
 
     def run(self):
@@ -471,6 +607,17 @@ class TestFunctionNodeRetaining(unittest.TestCase):
         numpy.testing.assert_array_equal(self.f1.backward_outputs[0].data,
                                          self.f1_output_data[1])
 
+    def test_retain_collected_output(self):
+        inputs = [chainer.Variable(numpy.array([1], dtype=numpy.float32)),
+                  chainer.Variable(numpy.array([1], dtype=numpy.float32))]
+        f = FunctionNodeWithRetaining()
+        y = f.apply(inputs)[0]
+        # The retained output is garbage-collected before the backward, and
+        # the recreated one is registered as an output of the node.
+        y.grad = numpy.array([1], dtype=numpy.float32)
+        y.backward()
+        self.assertIs(f.outputs[1](), f.backward_outputs[0].node)
+
 
 def _get_value(x):
     if isinstance(x, chainer.Variable):
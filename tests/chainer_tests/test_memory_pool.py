@@ -0,0 +1,146 @@
+import gc
+import unittest
+
+import numpy
+
+import chainer
+from chainer import functions
+from chainer import memory_pool
+from chainer import testing
+
+
+class TestCPUMemoryPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = memory_pool.CPUMemoryPool(min_bytes=1024)
+
+    def test_empty(self):
+        x = self.pool.empty((3, 500), numpy.float32)
+        self.assertEqual(x.shape, (3, 500))
+        self.assertEqual(x.dtype, numpy.float32)
+        self.assertTrue(x.flags.c_contiguous)
+        self.assertTrue(x.flags.writeable)
+        self.assertEqual(self.pool.used_bytes(), 8192)
+        self.assertEqual(self.pool.free_bytes(), 0)
+
+    def test_zeros(self):
+        x = self.pool.zeros((4, 1000), numpy.float64)
+        numpy.testing.assert_array_equal(x, numpy.zeros((4, 1000)))
+
+    def test_small_array_is_not_pooled(self):
+        x = self.pool.empty((10,), numpy.float32)
+        self.assertEqual(x.shape, (10,))
+        self.assertEqual(self.pool.stats()['n_allocs'], 0)
+        self.assertEqual(self.pool.total_bytes(), 0)
+
+    def test_reuse(self):
+        x = self.pool.empty((1000,), numpy.float32)
+        address = x.ctypes.data
+        del x
+        gc.collect()
+        self.assertEqual(self.pool.used_bytes(), 0)
+        self.assertEqual(self.pool.free_bytes(), 4096)
+        self.assertEqual(self.pool.n_free_blocks(), 1)
+
+        # an array of the same size class reuses the block
+        y = self.pool.empty((900,), numpy.float32)
+        self.assertEqual(y.ctypes.data, address)
+        self.assertEqual(self.pool.n_free_blocks(), 0)
+        self.assertEqual(self.pool.hit_rate(), 0.5)
+        self.assertEqual(self.pool.peak_bytes(), 4096)
+
+    def test_view_keeps_block(self):
+        x = self.pool.empty((100, 100), numpy.float32)
+        x[...] = 1
+        view = x[10:20].T
+        del x
+        gc.collect()
+        self.assertEqual(self.pool.free_bytes(), 0)
+        y = self.pool.zeros((100, 100), numpy.float32)
+        numpy.testing.assert_array_equal(view, numpy.ones((100, 10)))
+        del view, y
+        gc.collect()
+        self.assertEqual(self.pool.used_bytes(), 0)
+        self.assertEqual(self.pool.n_free_blocks(), 2)
+
+    def test_free_all_blocks(self):
+        x = self.pool.empty((1000,), numpy.float32)
+        del x
+        gc.collect()
+        self.pool.free_all_blocks()
+        self.assertEqual(self.pool.free_bytes(), 0)
+        self.assertEqual(self.pool.n_free_blocks(), 0)
+
+    def test_set_limit(self):
+        xs = [self.pool.empty((1000,), numpy.float32) for _ in range(3)]
+        del xs
+        gc.collect()
+        self.assertEqual(self.pool.free_bytes(), 3 * 4096)
+        self.pool.set_limit(5000)
+        self.assertEqual(self.pool.get_limit(), 5000)
+        self.assertEqual(self.pool.free_bytes(), 4096)
+        xs = [self.pool.empty((1000,), numpy.float32) for _ in range(3)]
+        del xs
+        gc.collect()
+        self.assertEqual(self.pool.free_bytes(), 4096)
+
+    def test_stats(self):
+        x = self.pool.empty((1000,), numpy.float32)
+        stats = self.pool.stats()
+        self.assertEqual(stats['n_allocs'], 1)
+        self.assertEqual(stats['n_hits'], 0)
+        self.assertEqual(stats['used_bytes'], 4096)
+        self.assertEqual(stats['total_bytes'], 4096)
+        del x
+        self.pool.reset_stats()
+        self.assertEqual(self.pool.stats()['n_allocs'], 0)
+        self.assertEqual(self.pool.hit_rate(), 0.)
+
+    def test_size_class(self):
+        self.assertEqual(memory_pool._round_size(1), memory_pool._PAGE_SIZE)
+        for size in [5000, 100000, 1234567, 1 << 20]:
+            rounded = memory_pool._round_size(size)
+            self.assertGreaterEqual(rounded, size)
+            self.assertLessEqual(rounded, size * 1.25 + memory_pool._PAGE_SIZE)
+            self.assertEqual(rounded % memory_pool._PAGE_SIZE, 0)
+
+
+class TestCPUMemoryPoolConvolution(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = memory_pool.cpu_memory_pool()
+        self.pool.free_all_blocks()
+        self.x = numpy.random.uniform(
+            -1, 1, (4, 3, 32, 32)).astype(numpy.float32)
+        self.W = numpy.random.uniform(
+            -1, 1, (8, 3, 3, 3)).astype(numpy.float32)
+
+    def tearDown(self):
+        self.pool.free_all_blocks()
+
+    def forward_backward(self):
+        x = chainer.Variable(self.x)
+        W = chainer.Variable(self.W)
+        y = functions.convolution_2d(x, W, pad=1)
+        y.grad = numpy.ones_like(y.data)
+        y.backward()
+        return y.data, x.grad, W.grad
+
+    def test_steady_state(self):
+        expected = self.forward_backward()
+        with chainer.using_config('use_cpu_memory_pool', True):
+            for _ in range(2):
+                self.forward_backward()
+            gc.collect()
+            self.pool.reset_stats()
+            for _ in range(3):
+                actual = self.forward_backward()
+            gc.collect()
+        stats = self.pool.stats()
+        self.assertGreater(stats['n_allocs'], 0)
+        self.assertEqual(stats['hit_rate'], 1.)
+        for e, a in zip(expected, actual):
+            testing.assert_allclose(e, a)
+
+
+testing.run_module(__name__, __file__)
@@ -610,5 +610,18 @@ class TestGradientMethodClearGrads(unittest.TestCase):
         self.target.cleargrads()
         self.optimizer.update()
 
+    def test_update_report_time(self):
+        def lossfun():
+            return chainer.functions.sum(self.target.param)
+
+        reporter = chainer.Reporter()
+        observation = {}
+        with chainer.using_config('report_time', True):
+            with reporter.scope(observation):
+                self.optimizer.update(lossfun)
+        self.assertEqual(
+            set(observation.keys()),
+            {'time/forward', 'time/backward', 'time/optimizer'})
+
 
 testing.run_module(__name__, __file__)
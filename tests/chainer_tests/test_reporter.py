@@ -1,4 +1,6 @@
 import contextlib
+import pickle
+import threading
 import unittest
 
 import numpy
@@ -162,6 +164,88 @@ class TestReport(unittest.TestCase):
         self.assertEqual(observation['x'], 1)
         self.assertNotIn('x', reporter.observation)
 
+    def test_report_from_thread(self):
+        # Threads share the current reporter by default
+        reporter = chainer.Reporter()
+        with reporter:
+            thread = threading.Thread(
+                target=lambda: chainer.report({'x': 1}))
+            thread.start()
+            thread.join()
+        self.assertEqual(reporter.observation, {'x': 1})
+
+    def test_thread_local_reporters(self):
+        def run():
+            chainer.reporter._use_thread_local_reporters()
+            chainer.report({'x': 1})
+            local_reporter = chainer.Reporter()
+            with local_reporter:
+                chainer.report({'y': 2})
+            observations.append(local_reporter.observation)
+
+        observations = []
+        reporter = chainer.Reporter()
+        with reporter:
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+            self.assertIs(chainer.get_current_reporter(), reporter)
+        self.assertEqual(reporter.observation, {})
+        self.assertEqual(observations, [{'y': 2}])
+
+
+class TestReportTime(unittest.TestCase):
+
+    def test_report_time(self):
+        reporter = chainer.Reporter()
+        observation = {}
+        with chainer.using_config('report_time', True):
+            with reporter.scope(observation):
+                with chainer.report_time('x'):
+                    pass
+
+        self.assertEqual(list(observation.keys()), ['time/x'])
+        self.assertGreaterEqual(observation['time/x'], 0)
+
+    def test_report_time_accumulate(self):
+        reporter = chainer.Reporter()
+        observation = {}
+        with chainer.using_config('report_time', True):
+            with reporter.scope(observation):
+                with chainer.report_time('x'):
+                    pass
+                first = observation['time/x']
+                with chainer.report_time('x'):
+                    pass
+
+        self.assertEqual(list(observation.keys()), ['time/x'])
+        self.assertGreaterEqual(observation['time/x'], first)
+
+    def test_report_time_disabled(self):
+        reporter = chainer.Reporter()
+        observation = {}
+        with reporter.scope(observation):
+            with chainer.report_time('x'):
+                pass
+
+        self.assertEqual(observation, {})
+
+    def test_report_time_without_reporter(self):
+        with chainer.using_config('report_time', True):
+            with chainer.report_time('x'):
+                pass
+
+    def test_report_time_with_exception(self):
+        reporter = chainer.Reporter()
+        observation = {}
+        with chainer.using_config('report_time', True):
+            with reporter.scope(observation):
+                with self.assertRaises(ValueError):
+                    with chainer.report_time('x'):
+                        raise ValueError
+
+        self.assertEqual(observation, {})
+
 
 class TestSummary(unittest.TestCase):
 
@@ -192,6 +276,22 @@ class TestSummary(unittest.TestCase):
         testing.assert_allclose(mean, numpy.array(-0.5, 'f'))
         testing.assert_allclose(std, numpy.array(1.5, 'f'))
 
+    def check_mutated_after_add(self, xp):
+        v = xp.array(1.)
+        self.summary.add(v)
+        v[...] = 5
+        self.summary.add(v)
+
+        mean = self.summary.compute_mean()
+        testing.assert_allclose(mean, 3.)
+
+    def test_mutated_after_add_cpu(self):
+        self.check_mutated_after_add(numpy)
+
+    @attr.gpu
+    def test_mutated_after_add_gpu(self):
+        self.check_mutated_after_add(cuda.cupy)
+
     def test_int(self):
         self.summary.add(1)
         self.summary.add(2)
@@ -216,5 +316,104 @@ class TestSummary(unittest.TestCase):
         testing.assert_allclose(mean, 2.)
         testing.assert_allclose(std, numpy.sqrt(2. / 3.))
 
+    def test_merge(self):
+        self.summary.add(numpy.array(1, 'f'))
+        other = chainer.reporter.Summary()
+        other.add(numpy.array(-2, 'f'))
+        other.add(numpy.array(4, 'f'))
+        self.summary.merge(other)
+
+        mean, std = self.summary.make_statistics()
+        testing.assert_allclose(mean, numpy.array(1, 'f'))
+        testing.assert_allclose(std, numpy.array(numpy.sqrt(6), 'f'))
+
+    def test_chunks(self):
+        summary = chainer.reporter.Summary(chunk_size=2)
+        values = [3., -1., 4., 1., -5.]
+        for i, v in enumerate(values):
+            summary.add(v)
+            # The values are buffered until a chunk is filled.
+            self.assertEqual(summary._n, (i + 1) // 2 * 2)
+
+        mean, std = summary.make_statistics()
+        testing.assert_allclose(mean, numpy.mean(values))
+        testing.assert_allclose(std, numpy.std(values))
+        self.assertEqual(summary.compute_min(), -5.)
+        self.assertEqual(summary.compute_max(), 4.)
+
+    def test_percentiles(self):
+        summary = chainer.reporter.Summary(chunk_size=3, keep_values=True)
+        values = numpy.random.uniform(-1, 1, 10).astype('f')
+        for v in values:
+            summary.add(v)
+        testing.assert_allclose(summary.compute_percentiles([10, 50, 90]),
+                                numpy.percentile(values, [10, 50, 90]))
+
+    def test_percentiles_without_values(self):
+        self.summary.add(1.)
+        with self.assertRaises(RuntimeError):
+            self.summary.compute_percentiles(50)
+
+    def test_merge_min_max(self):
+        self.summary.add(1.)
+        other = chainer.reporter.Summary()
+        other.add(-2.)
+        other.add(4.)
+        self.summary.merge(other)
+        self.assertEqual(self.summary.compute_min(), -2.)
+        self.assertEqual(self.summary.compute_max(), 4.)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            chainer.reporter.Summary(chunk_size=0)
+
+
+class TestDictSummary(unittest.TestCase):
+
+    def test_merge(self):
+        summary = chainer.reporter.DictSummary()
+        summary.add({'a': 1., 'b': 2.})
+        other = chainer.reporter.DictSummary()
+        other.add({'a': 3., 'c': 4.})
+        summary.merge(other)
+
+        self.assertEqual(summary.compute_mean(), {'a': 2., 'b': 2., 'c': 4.})
+
+    def test_mutated_after_add(self):
+        summary = chainer.reporter.DictSummary()
+        v = numpy.array(1.)
+        summary.add({'a': v})
+        v[...] = 5
+        summary.add({'a': v})
+
+        testing.assert_allclose(summary.compute_mean()['a'], 3.)
+
+    def test_make_statistics(self):
+        summary = chainer.reporter.DictSummary(
+            chunk_size=2, min_max=True, percentiles=(50,))
+        summary.add({'a': 1., 'b': numpy.array(2., 'f')})
+        summary.add({'a': chainer.Variable(numpy.array(5., 'f')),
+                     'b': numpy.zeros((2,), 'f')})
+        summary.add({'a': 3.})
+
+        stats = summary.make_statistics()
+        self.assertEqual(
+            set(stats),
+            {'a', 'a.std', 'a.min', 'a.max', 'a.p50',
+             'b', 'b.std', 'b.min', 'b.max', 'b.p50'})
+        testing.assert_allclose(stats['a'], 3.)
+        testing.assert_allclose(stats['a.std'], numpy.std([1., 5., 3.]))
+        testing.assert_allclose(stats['a.min'], 1.)
+        testing.assert_allclose(stats['a.max'], 5.)
+        testing.assert_allclose(stats['a.p50'], 3.)
+        testing.assert_allclose(stats['b'], 2.)
+
+    def test_pickle(self):
+        summary = chainer.reporter.DictSummary(chunk_size=4)
+        summary.add({'a': 1.})
+        summary = pickle.loads(pickle.dumps(summary))
+        summary.add({'a': 3.})
+        self.assertEqual(summary.compute_mean(), {'a': 2.})
+
 
 testing.run_module(__name__, __file__)
@@ -1469,6 +1469,72 @@ class TestVariableDoubleBackward(unittest.TestCase):
             x.grad_var.backward()
 
 
+class TestVariableBackwardReleaseGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.x_data = np.random.uniform(-1, 1, (3,)).astype(np.float32)
+
+    def forward(self, x):
+        # h is used by two function nodes of different ranks
+        h = F.exp(x)
+        return F.sum(h * h) + F.sum(F.exp(F.sin(h)))
+
+    def expected_grad(self):
+        h = np.exp(self.x_data)
+        return (2 * h + np.exp(np.sin(h)) * np.cos(h)) * h
+
+    def test_release(self):
+        x = chainer.Variable(self.x_data)
+        h = F.exp(x)
+        exp_node = h.creator_node
+        y = F.sum(h)
+        y.backward(retain_graph=False)
+        self.assertIsNone(y.creator_node)
+        self.assertIsNone(h.creator_node)
+        self.assertIsNone(exp_node.inputs)
+        self.assertIsNone(exp_node._retained_output_data)
+        testing.assert_allclose(x.grad, np.exp(self.x_data))
+
+    def test_grad_with_shared_input(self):
+        x = chainer.Variable(self.x_data)
+        self.forward(x).backward(retain_graph=False)
+        testing.assert_allclose(x.grad, self.expected_grad())
+
+    def test_retain_graph(self):
+        x = chainer.Variable(self.x_data)
+        y = self.forward(x)
+        y.backward()
+        self.assertIsNotNone(y.creator_node)
+        y.backward(retain_graph=False)
+        testing.assert_allclose(x.grad, 2 * self.expected_grad())
+        self.assertIsNone(y.creator_node)
+
+    def test_losses_sharing_graph(self):
+        # The graph is kept by default, so the gradients of the second loss
+        # reach the variables behind the shared part of the graph.
+        x = chainer.Variable(self.x_data)
+        h = F.exp(x)
+        y1 = F.sum(h)
+        y2 = F.sum(h * h)
+        y1.backward()
+        x.cleargrad()
+        y2.backward()
+        testing.assert_allclose(x.grad, 2 * np.exp(2 * self.x_data))
+
+    def test_keep_graph_on_report(self):
+        x = chainer.Variable(self.x_data)
+        y = self.forward(x)
+        with chainer.using_config('keep_graph_on_report', True):
+            y.backward(retain_graph=False)
+        self.assertIsNotNone(y.creator_node)
+
+    def test_double_backprop_keeps_graph(self):
+        x = chainer.Variable(self.x_data)
+        y = self.forward(x)
+        y.backward(enable_double_backprop=True, retain_graph=False)
+        self.assertIsNotNone(y.creator_node)
+
+
 class TestAsVariable(unittest.TestCase):
 
     def check_to_variable_from_array(self, x):
@@ -1,9 +1,13 @@
+import threading
 import unittest
 
+import mock
 import numpy
+import six
 
 import chainer
 from chainer import dataset
+from chainer import iterators
 from chainer import testing
 from chainer.training import extensions
 
@@ -215,4 +219,199 @@ class TestEvaluatorWithEvalFunc(unittest.TestCase):
                 self.target.args[i], self.batches[i])
 
 
+class SumModel(chainer.Link):
+
+    def __init__(self):
+        super(SumModel, self).__init__()
+        with self.init_scope():
+            self.w = chainer.Parameter(numpy.ones((), 'f'))
+
+    def __call__(self, x):
+        chainer.report({'sum': self.w * x.sum(), 'size': len(x)}, self)
+
+
+@testing.parameterize(*testing.product({
+    'n_processes': [1, 2, 3, 8],
+    'batch_size': [1, 3],
+}))
+class TestEvaluatorParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.data = numpy.random.uniform(-1, 1, (10, 2)).astype('f')
+        self.target = SumModel()
+        self.target.w.data[...] = 2
+
+    def evaluate(self, n_processes):
+        iterator = iterators.SerialIterator(
+            self.data, self.batch_size, repeat=False, shuffle=False)
+        evaluator = extensions.Evaluator(
+            iterator, self.target, n_processes=n_processes)
+        reporter = chainer.Reporter()
+        reporter.add_observer('target', self.target)
+        with reporter:
+            return evaluator()
+
+    def test_evaluate(self):
+        expect = self.evaluate(None)
+        result = self.evaluate(self.n_processes)
+        self.assertEqual(sorted(result.keys()), sorted(expect.keys()))
+        for key, value in six.iteritems(expect):
+            numpy.testing.assert_allclose(result[key], value, rtol=1e-5)
+
+
+class TestEvaluatorParallelError(unittest.TestCase):
+
+    def setUp(self):
+        self.iterator = iterators.SerialIterator(
+            numpy.zeros((4, 2), 'f'), 2, repeat=False, shuffle=False)
+        self.target = SumModel()
+
+    def test_error_in_worker(self):
+        evaluator = extensions.Evaluator(
+            self.iterator, self.target, eval_func=lambda x: 1 / 0,
+            n_processes=2)
+        with self.assertRaises(RuntimeError) as cm:
+            evaluator.evaluate()
+        self.assertIn('ZeroDivisionError', str(cm.exception))
+
+    def test_invalid_n_processes(self):
+        with self.assertRaises(ValueError):
+            extensions.Evaluator(self.iterator, self.target, n_processes=0)
+
+    def test_gpu(self):
+        with self.assertRaises(ValueError):
+            extensions.Evaluator(
+                self.iterator, self.target, device=0, n_processes=2)
+
+    def test_iterator_without_dataset(self):
+        evaluator = extensions.Evaluator(
+            DummyIterator([]), self.target, n_processes=2)
+        with self.assertRaises(ValueError):
+            evaluator.evaluate()
+
+
+class ValueModel(chainer.Link):
+
+    def __init__(self):
+        super(ValueModel, self).__init__()
+        with self.init_scope():
+            self.w = chainer.Parameter(numpy.zeros((), 'f'))
+
+    def __call__(self, x):
+        if chainer.config.train:
+            raise RuntimeError('evaluated in training mode')
+        chainer.report({'value': self.w + x.sum()}, self)
+
+
+@testing.parameterize(*testing.product({
+    'stop_trigger': [(4, 'iteration'), (10, 'iteration')],
+}))
+class TestAsyncEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.trainer = testing.get_trainer_with_mock_updater(
+            self.stop_trigger)
+        self.target = ValueModel()
+        self.iterator = iterators.SerialIterator(
+            numpy.zeros((4, 2), 'f'), 2, repeat=False, shuffle=False)
+        self.event = threading.Event()
+        self.evaluator = extensions.AsyncEvaluator(
+            self.iterator, self.target,
+            eval_hook=lambda _: self.event.wait(),
+            eval_trigger=(2, 'iteration'))
+        self.evaluator.name = 'validation'
+
+    def tearDown(self):
+        self.event.set()
+        self.evaluator.finalize()
+
+    def call(self, iteration):
+        self.trainer.updater.iteration = iteration
+        reporter = chainer.Reporter()
+        observation = {}
+        with reporter.scope(observation):
+            result = self.evaluator(self.trainer)
+        if result is None:
+            self.assertEqual(observation, {})
+        else:
+            self.assertEqual(observation, result)
+        return result
+
+    def test_async(self):
+        self.assertIsNone(self.call(1))
+        self.assertIsNone(self.call(2))
+        # The update after the evaluation started does not affect the result
+        self.target.w.data[...] = 5
+        self.assertIsNone(self.call(3))
+
+        self.event.set()
+        self.evaluator._thread.join()
+        result = self.call(4)
+        if self.stop_trigger[0] == 4:
+            # The evaluation started at the last iteration is reported at
+            # once after the previous one
+            self.assertEqual(result['validation/main/value'], 5)
+            self.assertEqual(result['validation/iteration'], 4)
+            self.assertIsNone(self.evaluator._thread)
+        else:
+            self.assertEqual(result['validation/main/value'], 0)
+            self.assertEqual(result['validation/iteration'], 2)
+            self.evaluator._thread.join()
+            result = self.call(5)
+            self.assertEqual(result['validation/main/value'], 5)
+            self.assertEqual(result['validation/iteration'], 4)
+
+    def test_wait_for_previous_evaluation(self):
+        self.call(2)
+        self.target.w.data[...] = 5
+        self.event.set()
+        reporter = chainer.Reporter()
+        observations = []
+        with reporter:
+            self.trainer.updater.iteration = 4
+            with mock.patch.object(
+                    chainer.reporter, 'report',
+                    side_effect=lambda values: observations.append(values)):
+                self.evaluator(self.trainer)
+        self.assertEqual(observations[0]['validation/main/value'], 0)
+        self.assertEqual(observations[0]['validation/iteration'], 2)
+
+    def test_error(self):
+        self.event.set()
+        self.evaluator.eval_func = lambda x: 1 / 0
+        self.call(2)
+        self.evaluator._thread.join()
+        self.trainer.updater.iteration = 3
+        with chainer.Reporter():
+            with self.assertRaises(ZeroDivisionError):
+                self.evaluator(self.trainer)
+
+
+class TestAsyncEvaluatorWithTrainer(unittest.TestCase):
+
+    def test_run(self):
+        trainer = testing.get_trainer_with_mock_updater((6, 'iteration'))
+        target = ValueModel()
+
+        def update():
+            target.w.data += 1
+        trainer.updater.update_core = update
+
+        iterator = iterators.SerialIterator(
+            numpy.zeros((4, 2), 'f'), 2, repeat=False, shuffle=False)
+        trainer.extend(extensions.AsyncEvaluator(
+            iterator, target, eval_trigger=(3, 'iteration')))
+        observations = []
+        trainer.extend(lambda trainer: observations.append(
+            dict(trainer.observation)))
+        trainer.run()
+
+        results = [(o['validation/iteration'], o['validation/main/value'])
+                   for o in observations if 'validation/iteration' in o]
+        self.assertEqual(results[-1], (6, 6))
+        for iteration, value in results:
+            self.assertEqual(iteration, value)
+        self.assertNotIn('main/value', observations[-1])
+
+
 testing.run_module(__name__, __file__)
@@ -1,6 +1,7 @@
 import time
 import unittest
 
+import chainer
 from chainer import testing
 from chainer import training
 
@@ -169,5 +170,32 @@ class TestTrainer(unittest.TestCase):
         self.trainer.run()
         self.assertEqual(self.called_order, [2, 1])
 
+    def test_report_time(self):
+        observations = []
+
+        @training.make_extension()
+        def dummy_extension(trainer):
+            pass
+
+        def observe(trainer):
+            observations.append(dict(trainer.observation))
+
+        self.trainer.extend(dummy_extension)
+        self.trainer.extend(observe, priority=training.PRIORITY_READER - 1)
+        with chainer.using_config('report_time', True):
+            self.trainer.run()
+        self.assertEqual(len(observations), 10)
+        for observation in observations:
+            self.assertIn('time/update', observation)
+            self.assertIn('time/extension/dummy_extension', observation)
+            # the time of an extension is reported after its invocation
+            self.assertNotIn('time/extension/observe', observation)
+
+    def test_report_time_disabled(self):
+        self.trainer.extend(lambda trainer: None, name='dummy')
+        self.trainer.run()
+        self.assertNotIn('time/update', self.trainer.observation)
+        self.assertNotIn('time/extension/dummy', self.trainer.observation)
+
 
 testing.run_module(__name__, __file__)
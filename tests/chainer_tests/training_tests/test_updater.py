@@ -89,6 +89,15 @@ class TestUpdater(unittest.TestCase):
         self.assertEqual(self.updater.iteration, 1)
         self.assertEqual(self.iterator.next_called, 1)
 
+    def test_update_report_time(self):
+        reporter = chainer.Reporter()
+        observation = {}
+        with chainer.using_config('report_time', True):
+            with reporter.scope(observation):
+                self.updater.update()
+        self.assertIn('time/iterator', observation)
+        self.assertIn('time/converter', observation)
+
     def test_finalizer(self):
         self.updater.finalize()
         self.assertEqual(self.iterator.finalize_called, 1)
@@ -176,4 +185,121 @@ class TestUpdaterUpdateArguments(unittest.TestCase):
         self.assertEqual(iterator.next_called, 1)
 
 
+class ParallelModel(chainer.Chain):
+
+    def __init__(self):
+        super(ParallelModel, self).__init__()
+        with self.init_scope():
+            self.l1 = chainer.links.Linear(3, 4)
+            self.l2 = chainer.links.Linear(4, 2)
+        self.train_flags = []
+
+    def __call__(self, x, t):
+        self.train_flags.append(chainer.config.train)
+        h = chainer.functions.relu(self.l1(x))
+        return chainer.functions.softmax_cross_entropy(self.l2(h), t)
+
+
+@testing.parameterize(*testing.product({
+    'use_threads': [False, True],
+    'n_models': [1, 2, 4],
+}))
+class TestParallelUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (8, 3)).astype(numpy.float32)
+        self.t = numpy.random.randint(0, 2, (8,)).astype(numpy.int32)
+        self.model = ParallelModel()
+        self.expected = ParallelModel()
+        self.expected.copyparams(self.model)
+
+        optimizer = chainer.optimizers.SGD(lr=0.1)
+        optimizer.setup(self.model)
+        devices = {'main': -1}
+        for i in range(1, self.n_models):
+            devices['sub%d' % i] = -1
+        iterator = chainer.iterators.SerialIterator(
+            chainer.datasets.TupleDataset(self.x, self.t), 8, shuffle=False)
+        self.updater = training.ParallelUpdater(
+            iterator, optimizer, devices=devices,
+            use_threads=self.use_threads)
+
+    def tearDown(self):
+        self.updater.finalize()
+
+    def expected_update(self):
+        n = self.n_models
+        self.expected.cleargrads()
+        for i in range(n):
+            self.expected(self.x[i::n], self.t[i::n]).backward()
+        for param in self.expected.params():
+            param.data -= 0.1 * param.grad
+
+    def check_params(self):
+        models = self.updater._models.values()
+        for model in models:
+            for (_, p), (_, q) in zip(sorted(model.namedparams()),
+                                      sorted(self.expected.namedparams())):
+                testing.assert_allclose(p.data, q.data, atol=1e-6, rtol=1e-5)
+
+    def test_update(self):
+        for _ in range(2):
+            self.updater.update()
+            self.expected_update()
+            self.check_params()
+
+    def test_update_after_replacing_params(self):
+        self.updater.update()
+        self.expected_update()
+        # Data arrays replaced out of place, e.g. by deserialization, are
+        # broadcast as well.
+        for (_, q) in self.expected.namedparams():
+            q.data = q.data * 2
+        for model in self.updater._models.values():
+            for (_, p), (_, q) in zip(sorted(model.namedparams()),
+                                      sorted(self.expected.namedparams())):
+                p.data = q.data.copy()
+        for _ in range(2):
+            self.updater.update()
+            self.expected_update()
+            self.check_params()
+
+    def test_update_inherits_config(self):
+        with chainer.using_config('train', False):
+            self.updater.update()
+        for model in self.updater._models.values():
+            self.assertEqual(model.train_flags, [False])
+
+
+class SharedGradModel(chainer.Link):
+
+    def __init__(self):
+        super(SharedGradModel, self).__init__()
+        with self.init_scope():
+            self.a = chainer.Parameter(numpy.zeros((3,), numpy.float32))
+            self.b = chainer.Parameter(numpy.zeros((3,), numpy.float32))
+
+    def __call__(self, x):
+        # The parameters receive the same read-only broadcast gradient.
+        F = chainer.functions
+        return F.sum(self.a + self.b) * F.sum(x)
+
+
+class TestParallelUpdaterSharedGrads(unittest.TestCase):
+
+    def test_update(self):
+        x = numpy.ones((4,), numpy.float32)
+        model = SharedGradModel()
+        optimizer = chainer.optimizers.SGD(lr=0.1)
+        optimizer.setup(model)
+        iterator = chainer.iterators.SerialIterator(x, 4, shuffle=False)
+        updater = training.ParallelUpdater(
+            iterator, optimizer, devices={'main': -1, 'sub': -1})
+        updater.update()
+        updater.finalize()
+        for m in updater._models.values():
+            numpy.testing.assert_allclose(m.a.data, [-0.4] * 3)
+            numpy.testing.assert_allclose(m.b.data, [-0.4] * 3)
+
+
 testing.run_module(__name__, __file__)
@@ -0,0 +1,203 @@
+import copy
+import multiprocessing
+import os
+import unittest
+
+import numpy
+
+import chainer
+from chainer import iterators
+from chainer import links
+from chainer import optimizers
+from chainer import serializers
+from chainer import testing
+from chainer import training
+
+
+class FinalizeCountingIterator(iterators.SerialIterator):
+
+    def __init__(self, *args, **kwargs):
+        super(FinalizeCountingIterator, self).__init__(*args, **kwargs)
+        # The counter is shared with the worker processes.
+        self.finalize_called = multiprocessing.Value('i', 0)
+
+    def finalize(self):
+        with self.finalize_called.get_lock():
+            self.finalize_called.value += 1
+
+
+class SimpleNet(chainer.Chain):
+
+    def __init__(self):
+        super(SimpleNet, self).__init__()
+        with self.init_scope():
+            self.fc = links.Linear(3, 2)
+
+    def __call__(self, x, t):
+        loss = chainer.functions.softmax_cross_entropy(self.fc(x), t)
+        chainer.report({'loss': loss}, self)
+        return loss
+
+
+@testing.parameterize(*testing.product({
+    'n_processes': [1, 2, 3],
+}))
+class TestSharedMemoryParallelUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.model = SimpleNet()
+        self.x = numpy.random.uniform(
+            -1, 1, (self.n_processes * 4, 3)).astype(numpy.float32)
+        self.t = numpy.random.randint(
+            0, 2, (self.n_processes * 4,)).astype(numpy.int32)
+        dataset = chainer.datasets.TupleDataset(self.x, self.t)
+        shards = chainer.datasets.split_dataset_n(dataset, self.n_processes)
+        self.iterators = [FinalizeCountingIterator(shard, 4, shuffle=False)
+                          for shard in shards]
+
+        self.optimizer = optimizers.SGD(lr=0.1)
+        self.optimizer.setup(self.model)
+        self.updater = training.updaters.SharedMemoryParallelUpdater(
+            self.iterators, self.optimizer)
+
+    def tearDown(self):
+        self.updater.finalize()
+
+    def expected_update(self, model):
+        model.cleargrads()
+        losses = []
+        for i in range(self.n_processes):
+            loss = model(self.x[i * 4:(i + 1) * 4], self.t[i * 4:(i + 1) * 4])
+            loss.backward()
+            losses.append(float(loss.data))
+        for param in model.params():
+            param.data -= 0.1 * param.grad
+        return numpy.mean(losses)
+
+    def test_update(self):
+        expected = copy.deepcopy(self.model)
+        reporter = chainer.Reporter()
+        reporter.add_observer('main', self.model)
+
+        for _ in range(2):
+            observation = {}
+            with reporter.scope(observation):
+                self.updater.update()
+            expected_loss = self.expected_update(expected)
+
+            testing.assert_allclose(
+                observation['main/loss'], expected_loss, rtol=1e-5)
+            testing.assert_allclose(self.model.fc.W.data, expected.fc.W.data,
+                                    atol=1e-6, rtol=1e-5)
+            testing.assert_allclose(self.model.fc.b.data, expected.fc.b.data,
+                                    atol=1e-6, rtol=1e-5)
+        self.assertEqual(self.updater.iteration, 2)
+
+    def test_update_without_reporter(self):
+        self.updater.update()
+        self.assertEqual(self.updater.iteration, 1)
+
+    def test_finalize(self):
+        self.updater.update()
+        self.updater.finalize()
+        for iterator in self.iterators:
+            self.assertEqual(iterator.finalize_called.value, 1)
+
+
+class TestSharedMemoryParallelUpdaterError(unittest.TestCase):
+
+    def setUp(self):
+        self.model = SimpleNet()
+        self.main_pid = os.getpid()
+        dataset = chainer.datasets.TupleDataset(
+            numpy.zeros((8, 3), numpy.float32), numpy.zeros(8, numpy.int32))
+        self.iterators = [iterators.SerialIterator(shard, 2)
+                          for shard in chainer.datasets.split_dataset_n(
+                              dataset, 3)]
+        self.optimizer = optimizers.SGD()
+        self.optimizer.setup(self.model)
+
+    def make_updater(self, fail_in_main):
+        def loss_func(x, t):
+            if (os.getpid() == self.main_pid) == fail_in_main:
+                raise ValueError('loss_func failed')
+            return self.model(x, t)
+
+        return training.updaters.SharedMemoryParallelUpdater(
+            self.iterators, self.optimizer, loss_func=loss_func, timeout=60)
+
+    def test_error_in_worker(self):
+        updater = self.make_updater(False)
+        with self.assertRaises(RuntimeError) as cm:
+            updater.update()
+        self.assertIn('loss_func failed', str(cm.exception))
+        self.assertEqual(updater._workers, [])
+
+    def test_error_in_main(self):
+        updater = self.make_updater(True)
+        with self.assertRaises(ValueError):
+            updater.update()
+        self.assertEqual(updater._workers, [])
+
+
+class TestSharedMemoryParallelUpdaterSerialize(unittest.TestCase):
+
+    def setUp(self):
+        dataset = chainer.datasets.TupleDataset(
+            numpy.random.uniform(-1, 1, (12, 3)).astype(numpy.float32),
+            numpy.random.randint(0, 2, (12,)).astype(numpy.int32))
+        self.shards = chainer.datasets.split_dataset_n(dataset, 2)
+
+    def make_updater(self):
+        model = SimpleNet()
+        optimizer = optimizers.SGD()
+        optimizer.setup(model)
+        its = [iterators.SerialIterator(shard, 2) for shard in self.shards]
+        return training.updaters.SharedMemoryParallelUpdater(its, optimizer)
+
+    def save(self, updater):
+        target = {}
+        updater.serialize(serializers.DictionarySerializer(target))
+        return target
+
+    def check_state(self, target, expected):
+        self.assertEqual(sorted(target.keys()), sorted(expected.keys()))
+        for key in target:
+            numpy.testing.assert_array_equal(target[key], expected[key])
+
+    def test_serialize(self):
+        updater = self.make_updater()
+        updater.update()
+        target = self.save(updater)
+        updater.finalize()
+        self.assertEqual(target['iterator:worker1/current_position'], 2)
+        self.assertIn('iterator:worker1/order', target)
+
+        # The state is loaded before and after the workers start.
+        for n_updates in (0, 1):
+            updater = self.make_updater()
+            for _ in range(n_updates):
+                updater.update()
+            updater.serialize(serializers.NpzDeserializer(target))
+            self.check_state(self.save(updater), target)
+            updater.update()
+            self.assertEqual(
+                self.save(updater)['iterator:worker1/current_position'], 4)
+            updater.finalize()
+
+
+class TestSharedMemoryParallelUpdaterUninitialized(unittest.TestCase):
+
+    def test_uninitialized_params(self):
+        model = links.Classifier(links.Linear(None, 2))
+        optimizer = optimizers.SGD()
+        optimizer.setup(model)
+        dataset = chainer.datasets.TupleDataset(
+            numpy.zeros((2, 3), numpy.float32), numpy.zeros(2, numpy.int32))
+        updater = training.updaters.SharedMemoryParallelUpdater(
+            [iterators.SerialIterator(dataset, 2)], optimizer)
+        with self.assertRaises(RuntimeError):
+            updater.update()
+
+
+testing.run_module(__name__, __file__)
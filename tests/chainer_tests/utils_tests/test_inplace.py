@@ -0,0 +1,180 @@
+import unittest
+
+import numpy
+
+import chainer
+from chainer import cuda
+from chainer import functions
+from chainer import gradient_check
+from chainer import testing
+from chainer.testing import attr
+from chainer.utils import inplace
+
+
+class TestCanOverwrite(unittest.TestCase):
+
+    def setUp(self):
+        self.x = chainer.Variable(numpy.ones((2, 3), numpy.float32))
+
+    def test_intermediate(self):
+        self.assertTrue(inplace.can_overwrite(self.x * 2))
+
+    def test_array(self):
+        self.assertFalse(inplace.can_overwrite(self.x.data))
+
+    def test_leaf(self):
+        self.assertFalse(inplace.can_overwrite(self.x))
+
+    def test_retained(self):
+        h = self.x * 2
+        y = functions.sin(h)  # NOQA
+        self.assertFalse(inplace.can_overwrite(h))
+
+    def test_referenced(self):
+        h = self.x * 2
+        view = h.data[0]  # NOQA
+        self.assertFalse(inplace.can_overwrite(h))
+
+    def test_view_of_parameter(self):
+        w = chainer.Parameter(numpy.ones((2, 3), numpy.float32))
+        self.assertFalse(inplace.can_overwrite(functions.reshape(w, (3, 2))))
+
+    def test_transposed(self):
+        h = self.x * 2
+        self.assertFalse(inplace.can_overwrite(functions.transpose(h)))
+
+    def test_broadcast(self):
+        h = self.x[0] * 2
+        self.assertFalse(
+            inplace.can_overwrite(functions.broadcast_to(h, (2, 3))))
+
+    def test_no_backprop(self):
+        with chainer.no_backprop_mode():
+            h = self.x * 2
+        self.assertFalse(inplace.can_overwrite(h))
+
+
+_activations = {
+    'relu': lambda x, inplace: functions.relu(x, inplace=inplace),
+    'leaky_relu': lambda x, inplace: functions.leaky_relu(
+        x, 0.2, inplace=inplace),
+    'elu': lambda x, inplace: functions.elu(x, 0.5, inplace=inplace),
+    'sigmoid': lambda x, inplace: functions.sigmoid(x, inplace=inplace),
+}
+
+
+@testing.parameterize(*testing.product({
+    'function': sorted(_activations),
+    'dtype': [numpy.float32, numpy.float64],
+}))
+@testing.fix_random()
+class TestInplaceActivation(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3, 2)).astype(self.dtype)
+        self.x[(-0.1 < self.x) & (self.x < 0.1)] = 0.5
+        self.gy = numpy.random.uniform(-1, 1, (3, 2)).astype(self.dtype)
+        self.ggx = numpy.random.uniform(-1, 1, (3, 2)).astype(self.dtype)
+
+    def f(self, x, inplace):
+        return _activations[self.function](x, inplace)
+
+    def check_forward(self, x_data):
+        # The input of the activation is an intermediate variable, whose data
+        # can be overwritten.
+        h = chainer.Variable(x_data) * 1
+        h_data_id = id(h.data)
+        y = self.f(h, False)
+        expected = y.data.copy()
+        self.assertNotEqual(id(y.data), h_data_id)
+
+        h = chainer.Variable(x_data) * 1
+        h_data_id = id(h.data)
+        y = self.f(h, True)
+        self.assertEqual(id(y.data), h_data_id)
+        testing.assert_allclose(expected, y.data)
+
+    def test_forward_cpu(self):
+        self.check_forward(self.x)
+
+    @attr.gpu
+    def test_forward_gpu(self):
+        self.check_forward(cuda.to_gpu(self.x))
+
+    def check_not_overwritten(self, x_data):
+        # The data of a leaf variable and the data retained by other
+        # functions are not overwritten.
+        x = chainer.Variable(x_data.copy())
+        self.assertIsNot(self.f(x, True).data, x.data)
+
+        h = chainer.Variable(x_data) * 1
+        functions.sin(h)
+        self.assertIsNot(self.f(h, True).data, h.data)
+        testing.assert_allclose(h.data, x_data)
+
+    def test_not_overwritten_cpu(self):
+        self.check_not_overwritten(self.x)
+
+    @attr.gpu
+    def test_not_overwritten_gpu(self):
+        self.check_not_overwritten(cuda.to_gpu(self.x))
+
+    def check_views_not_overwritten(self, x_data):
+        # Views share the memory with other arrays.
+        w = chainer.Parameter(x_data.copy())
+        y = self.f(functions.reshape(w, (2, 3)), True)
+        testing.assert_allclose(w.data, x_data)
+        testing.assert_allclose(
+            y.data, self.f(x_data.reshape(2, 3), False).data)
+
+        h = chainer.Variable(x_data) * 1
+        y = self.f(functions.transpose(h), True)
+        testing.assert_allclose(h.data, x_data)
+        testing.assert_allclose(y.data, self.f(x_data.T, False).data)
+
+        h = chainer.Variable(x_data[0]) * 1
+        y = self.f(functions.broadcast_to(h, (3, 2)), True)
+        testing.assert_allclose(h.data, x_data[0])
+        testing.assert_allclose(
+            y.data, self.f(x_data[[0, 0, 0]], False).data)
+
+    def test_views_not_overwritten_cpu(self):
+        self.check_views_not_overwritten(self.x)
+
+    @attr.gpu
+    def test_views_not_overwritten_gpu(self):
+        self.check_views_not_overwritten(cuda.to_gpu(self.x))
+
+    def check_backward(self, x_data, y_grad):
+        def f(x):
+            return self.f(x * 1, True)
+
+        gradient_check.check_backward(
+            f, x_data, y_grad, dtype=numpy.float64, atol=1e-3, rtol=1e-3)
+
+    def test_backward_cpu(self):
+        self.check_backward(self.x, self.gy)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.gy))
+
+    def check_double_backward(self, x_data, y_grad, x_grad_grad):
+        def f(x):
+            y = self.f(x * 1, True)
+            return y * y
+
+        gradient_check.check_double_backward(
+            f, x_data, y_grad, x_grad_grad, dtype=numpy.float64,
+            atol=1e-3, rtol=1e-3)
+
+    def test_double_backward_cpu(self):
+        self.check_double_backward(self.x, self.gy, self.ggx)
+
+    @attr.gpu
+    def test_double_backward_gpu(self):
+        self.check_double_backward(
+            cuda.to_gpu(self.x), cuda.to_gpu(self.gy), cuda.to_gpu(self.ggx))
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,85 @@
+import os
+import threading
+import unittest
+
+import chainer
+from chainer import testing
+from chainer.utils import thread_pool
+
+
+@testing.parameterize(*testing.product({
+    'cpu_threads': [1, 3],
+    'batch_size': [0, 1, 2, 10],
+}))
+class TestRunInChunks(unittest.TestCase):
+
+    def run_in_chunks(self, size):
+        chunks = []
+        threads = set()
+
+        def func(chunk):
+            chunks.append(chunk)
+            threads.add(threading.current_thread())
+
+        with chainer.using_config('cpu_threads', self.cpu_threads):
+            thread_pool.run_in_chunks(func, self.batch_size, size)
+        chunks.sort(key=lambda chunk: chunk.start)
+        return chunks, threads
+
+    def check_chunks(self, chunks):
+        self.assertEqual(chunks[0].start, 0)
+        self.assertEqual(chunks[-1].stop, self.batch_size)
+        for prev, chunk in zip(chunks, chunks[1:]):
+            self.assertEqual(prev.stop, chunk.start)
+            self.assertLess(chunk.start, chunk.stop)
+
+    def test_large_batch(self):
+        chunks, threads = self.run_in_chunks(1 << 20)
+        self.check_chunks(chunks)
+        n_chunks = max(1, min(self.cpu_threads, self.batch_size))
+        self.assertEqual(len(chunks), n_chunks)
+        self.assertEqual(len(threads) > 1, n_chunks > 1)
+        self.assertIn(threading.current_thread(), threads)
+
+    def test_small_batch(self):
+        chunks, threads = self.run_in_chunks(100)
+        self.assertEqual(chunks, [slice(0, self.batch_size)])
+        self.assertEqual(threads, {threading.current_thread()})
+
+
+@testing.parameterize(*testing.product({
+    'cpu_threads': [1, 3],
+}))
+class TestImap(unittest.TestCase):
+
+    def test_imap(self):
+        threads = set()
+
+        def func(x):
+            threads.add(threading.current_thread())
+            return x * 2
+
+        with chainer.using_config('cpu_threads', self.cpu_threads):
+            results = list(thread_pool.imap(func, range(10)))
+        self.assertEqual(results, [x * 2 for x in range(10)])
+        self.assertEqual(threading.current_thread() in threads,
+                         self.cpu_threads == 1)
+
+
+class TestGetNumThreads(unittest.TestCase):
+
+    @unittest.skipIf('CHAINER_CPU_THREADS' in os.environ,
+                     'the default is overridden by CHAINER_CPU_THREADS')
+    def test_default(self):
+        self.assertEqual(chainer.global_config.cpu_threads, 1)
+
+    def test_auto(self):
+        with chainer.using_config('cpu_threads', 0):
+            self.assertGreaterEqual(thread_pool.get_num_threads(), 1)
+
+    def test_config(self):
+        with chainer.using_config('cpu_threads', 3):
+            self.assertEqual(thread_pool.get_num_threads(), 3)
+
+
+testing.run_module(__name__, __file__)